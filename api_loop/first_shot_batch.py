@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""Generate iteration 1 for many prompts through provider batch APIs, then validate in bulk."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+import refine_sysml
+from refine_sysml import (
+    DEFAULT_ANTHROPIC_MODEL,
+    DEFAULT_OPENAI_MODEL,
+    ensure_dir,
+    iso_utc,
+    utc_now,
+)
+from validator_pool import ValidatorPool, physical_core_count
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BATCH_PROVIDERS = ("openai", "anthropic")
+OPENAI_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--provider", choices=BATCH_PROVIDERS, default="openai")
+    parser.add_argument("--model", default=DEFAULT_OPENAI_MODEL)
+    parser.add_argument("--temperature", type=float, default=None)
+    parser.add_argument("--anthropic-max-output-tokens", type=int, default=8192)
+    parser.add_argument(
+        "--prompts-root",
+        type=Path,
+        default=SCRIPT_DIR / "nl_prompts",
+        help="Root containing per-ID prompt folders with nl.txt.",
+    )
+    parser.add_argument("--ids", type=int, nargs="+", required=True)
+    parser.add_argument(
+        "--runs-root",
+        type=Path,
+        required=True,
+        help="Per-ID run directories are created as <runs-root>/<id>/<timestamp>.",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        required=True,
+        help="Directory for the batch request file, batch state and result manifest.",
+    )
+    parser.add_argument("--example", type=Path, default=None)
+    parser.add_argument("--venv", type=Path, required=True)
+    parser.add_argument("--syside-timeout-seconds", type=int, default=60)
+    parser.add_argument(
+        "--syside-validate-with",
+        choices=("format", "check"),
+        default="format",
+    )
+    parser.add_argument(
+        "--validate-workers",
+        type=int,
+        default=physical_core_count(),
+        help="Pre-forked syside validator processes for phase two (default: physical cores).",
+    )
+    parser.add_argument(
+        "--validator-mode",
+        choices=("warm", "cold"),
+        default="warm",
+        help="`warm` keeps syside loaded in long-lived workers; `cold` spawns per check.",
+    )
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=30.0,
+        help="Delay between batch status polls.",
+    )
+    parser.add_argument(
+        "--batch-timeout-seconds",
+        type=float,
+        default=24 * 3600.0,
+        help="Give up polling after this long; unfinished IDs fall back to the interactive loop.",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="Override the provider API base URL (e.g., a local batch stand-in).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Skip API and compiler calls and write placeholder candidates.",
+    )
+    args = parser.parse_args()
+    if args.provider == "anthropic" and args.model == DEFAULT_OPENAI_MODEL:
+        args.model = DEFAULT_ANTHROPIC_MODEL
+    if args.validate_workers <= 0:
+        raise SystemExit("--validate-workers must be > 0")
+    return args
+
+
+def custom_id_for(model_id: int) -> str:
+    return f"id-{model_id}"
+
+
+def model_id_from_custom_id(custom_id: str) -> Optional[int]:
+    if not custom_id.startswith("id-"):
+        return None
+    try:
+        return int(custom_id[len("id-") :])
+    except ValueError:
+        return None
+
+
+def render_prompts(args: argparse.Namespace) -> Dict[int, str]:
+    example_text = refine_sysml.load_example_snippet(args.example)
+    prompts: Dict[int, str] = {}
+    for model_id in args.ids:
+        spec_text = refine_sysml.load_user_input(args.prompts_root / str(model_id) / "nl.txt")
+        prompts[model_id] = refine_sysml.build_prompt(
+            spec_text=spec_text,
+            iteration=1,
+            previous_candidate=None,
+            compiler_feedback=None,
+            example_text=example_text,
+        )
+    return prompts
+
+
+def make_client(args: argparse.Namespace):
+    kwargs: Dict[str, object] = {}
+    if args.base_url:
+        kwargs["base_url"] = args.base_url
+    if args.provider == "openai":
+        if refine_sysml.OpenAI is None:
+            raise RuntimeError(
+                "OpenAI provider selected but `openai` package is not installed. "
+                "Install with `pip install openai`."
+            )
+        return refine_sysml.OpenAI(**kwargs)
+    if refine_sysml.Anthropic is None:
+        raise RuntimeError(
+            "Anthropic provider selected but `anthropic` package is not installed. "
+            "Install with `pip install anthropic`."
+        )
+    return refine_sysml.Anthropic(**kwargs)
+
+
+def to_payload(obj) -> Dict[str, object]:
+    if isinstance(obj, dict):
+        return obj
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    return {}
+
+
+def openai_body_text(body: Dict[str, object]) -> str:
+    """Responses API bodies in batch output are plain JSON, so `output_text` is not populated."""
+    maybe_text = body.get("output_text")
+    if isinstance(maybe_text, str) and maybe_text.strip():
+        return maybe_text.strip()
+    chunks: List[str] = []
+    for item in body.get("output") or []:
+        if not isinstance(item, dict):
+            continue
+        for content in item.get("content") or []:
+            if isinstance(content, dict) and isinstance(content.get("text"), str):
+                chunks.append(content["text"])
+    return "\n".join(chunks).strip()
+
+
+def usage_stats(usage: Dict[str, object]) -> Dict[str, int]:
+    input_tokens = int(usage.get("input_tokens") or usage.get("prompt_tokens") or 0)
+    output_tokens = int(usage.get("output_tokens") or usage.get("completion_tokens") or 0)
+    total_tokens = int(usage.get("total_tokens") or 0) or input_tokens + output_tokens
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": total_tokens,
+    }
+
+
+def load_state(state_path: Path) -> Dict[str, object]:
+    if not state_path.exists():
+        return {}
+    try:
+        return json.loads(state_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
+
+def save_state(state_path: Path, state: Dict[str, object]) -> None:
+    state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+
+def submit_openai_batch(client, args: argparse.Namespace, prompts: Dict[int, str]) -> str:
+    requests_path = args.work_dir / "batch_requests.jsonl"
+    with requests_path.open("w", encoding="utf-8") as f:
+        for model_id, prompt in prompts.items():
+            body: Dict[str, object] = {"model": args.model, "input": prompt}
+            if args.temperature is not None:
+                body["temperature"] = args.temperature
+            f.write(
+                json.dumps(
+                    {
+                        "custom_id": custom_id_for(model_id),
+                        "method": "POST",
+                        "url": "/v1/responses",
+                        "body": body,
+                    },
+                    ensure_ascii=False,
+                )
+                + "\n"
+            )
+    with requests_path.open("rb") as f:
+        uploaded = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=uploaded.id,
+        endpoint="/v1/responses",
+        completion_window="24h",
+    )
+    return str(batch.id)
+
+
+def submit_anthropic_batch(client, args: argparse.Namespace, prompts: Dict[int, str]) -> str:
+    requests: List[Dict[str, object]] = []
+    for model_id, prompt in prompts.items():
+        params: Dict[str, object] = {
+            "model": args.model,
+            "max_tokens": args.anthropic_max_output_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if args.temperature is not None:
+            params["temperature"] = args.temperature
+        requests.append({"custom_id": custom_id_for(model_id), "params": params})
+    (args.work_dir / "batch_requests.json").write_text(
+        json.dumps(requests, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    batch = client.messages.batches.create(requests=requests)
+    return str(batch.id)
+
+
+def poll_batch(client, args: argparse.Namespace, batch_id: str) -> Tuple[bool, object]:
+    """Poll until the batch reaches a terminal state; returns (finished, batch object)."""
+    deadline = perf_counter() + args.batch_timeout_seconds
+    while True:
+        if args.provider == "openai":
+            batch = client.batches.retrieve(batch_id)
+            status = str(batch.status)
+            counts = to_payload(getattr(batch, "request_counts", None) or {})
+            finished = status in OPENAI_TERMINAL_STATUSES
+        else:
+            batch = client.messages.batches.retrieve(batch_id)
+            status = str(batch.processing_status)
+            counts = to_payload(getattr(batch, "request_counts", None) or {})
+            finished = status == "ended"
+        print(f"[batch {batch_id}] status={status} counts={json.dumps(counts)}")
+        if finished:
+            return True, batch
+        if perf_counter() >= deadline:
+            return False, batch
+        time.sleep(args.poll_seconds)
+
+
+def fetch_openai_results(
+    client, batch
+) -> Dict[int, Tuple[Optional[str], Dict[str, int], Dict[str, object], Optional[str]]]:
+    results: Dict[int, Tuple[Optional[str], Dict[str, int], Dict[str, object], Optional[str]]] = {}
+    for file_id in (getattr(batch, "output_file_id", None), getattr(batch, "error_file_id", None)):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            model_id = model_id_from_custom_id(str(entry.get("custom_id", "")))
+            if model_id is None:
+                continue
+            response = entry.get("response") or {}
+            body = response.get("body") or {}
+            if entry.get("error") or int(response.get("status_code") or 0) != 200:
+                error = entry.get("error") or body.get("error") or f"status {response.get('status_code')}"
+                results[model_id] = (None, usage_stats({}), body, json.dumps(error))
+                continue
+            text = refine_sysml.sanitize_candidate_text(openai_body_text(body))
+            results[model_id] = (text, usage_stats(body.get("usage") or {}), body, None)
+    return results
+
+
+def fetch_anthropic_results(
+    client, batch_id: str
+) -> Dict[int, Tuple[Optional[str], Dict[str, int], Dict[str, object], Optional[str]]]:
+    results: Dict[int, Tuple[Optional[str], Dict[str, int], Dict[str, object], Optional[str]]] = {}
+    for entry in client.messages.batches.results(batch_id):
+        model_id = model_id_from_custom_id(str(entry.custom_id))
+        if model_id is None:
+            continue
+        result = entry.result
+        if getattr(result, "type", None) != "succeeded":
+            results[model_id] = (
+                None,
+                usage_stats({}),
+                to_payload(result),
+                f"batch result type {getattr(result, 'type', None)}",
+            )
+            continue
+        message = result.message
+        text = refine_sysml.sanitize_candidate_text(
+            refine_sysml.extract_text_from_anthropic_response(message)
+        )
+        results[model_id] = (
+            text,
+            usage_stats(to_payload(getattr(message, "usage", None) or {})),
+            to_payload(message),
+            None,
+        )
+    return results
+
+
+def validate_case(
+    args: argparse.Namespace,
+    pool: Optional[ValidatorPool],
+    model_id: int,
+    run_dir: Path,
+    tokens: Dict[str, int],
+    batch_id: str,
+) -> Dict[str, object]:
+    sysml_path = run_dir / "iteration_01.sysml"
+    iteration_start = utc_now()
+    wall_start = perf_counter()
+    compile_stdout = ""
+    compile_stderr = ""
+    return_code: Optional[int] = None
+    if args.dry_run or pool is None:
+        compile_stdout = "[dry-run] Skipping syside check."
+        success = True
+    else:
+        try:
+            result = pool.run(
+                [args.syside_validate_with, sysml_path.name],
+                run_dir,
+                args.syside_timeout_seconds,
+            )
+        except subprocess.TimeoutExpired as exc:
+            result = subprocess.CompletedProcess(
+                exc.cmd,
+                returncode=124,
+                stdout=exc.stdout or "",
+                stderr=(
+                    f"[timeout] syside {args.syside_validate_with} exceeded "
+                    f"{args.syside_timeout_seconds} seconds."
+                ),
+            )
+        compile_stdout = result.stdout.strip()
+        compile_stderr = result.stderr.strip()
+        return_code = result.returncode
+        success = result.returncode == 0
+        if not success and refine_sysml.is_infrastructure_compiler_failure(
+            compile_stdout, compile_stderr
+        ):
+            return {
+                "model_id": model_id,
+                "status": "error",
+                "reason": "infrastructure error while invoking syside",
+                "run_dir": str(run_dir),
+            }
+    run_log = [
+        {
+            "iteration": 1,
+            "iteration_start": iso_utc(iteration_start),
+            "iteration_end": iso_utc(utc_now()),
+            "iteration_duration_seconds": perf_counter() - wall_start,
+            "sysml_path": str(sysml_path),
+            "prompt_path": str(run_dir / "iteration_01_prompt.txt"),
+            "response_path": str(run_dir / "iteration_01_response.json"),
+            "success": success,
+            "compiler_stdout": compile_stdout,
+            "compiler_stderr": compile_stderr,
+            "return_code": return_code,
+            "tokens_used_this_iter": tokens,
+            "tokens_used_total": tokens.get("total_tokens", 0),
+            "provider": args.provider,
+            "model": args.model,
+            "generation_mode": "provider_batch",
+            "batch_id": batch_id,
+        }
+    ]
+    run_log_path = run_dir / "run_log.json"
+    run_log_path.write_text(json.dumps(run_log, indent=2), encoding="utf-8")
+    return {
+        "model_id": model_id,
+        "status": "ok",
+        "success": success,
+        "return_code": return_code,
+        "run_dir": str(run_dir),
+        "run_log_path": str(run_log_path),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    args.work_dir = args.work_dir.resolve()
+    ensure_dir(args.work_dir)
+    state_path = args.work_dir / "batch_state.json"
+    state = load_state(state_path)
+
+    prompts = render_prompts(args)
+    print(f"[phase 1] rendered {len(prompts)} first-iteration prompts")
+
+    client = None if args.dry_run else make_client(args)
+    batch_id = str(state.get("batch_id") or "")
+    submitted_utc = state.get("submitted_utc")
+    if args.dry_run:
+        batch_id = "dry-run"
+        submitted_utc = iso_utc(utc_now())
+    elif (
+        batch_id
+        and state.get("provider") == args.provider
+        and state.get("model") == args.model
+        and state.get("ids") == sorted(prompts)
+    ):
+        print(f"[phase 1] resuming existing batch {batch_id} from {state_path}")
+    else:
+        submit = submit_openai_batch if args.provider == "openai" else submit_anthropic_batch
+        batch_id = submit(client, args, prompts)
+        submitted_utc = iso_utc(utc_now())
+        state = {
+            "provider": args.provider,
+            "model": args.model,
+            "batch_id": batch_id,
+            "submitted_utc": submitted_utc,
+            "ids": sorted(prompts),
+        }
+        save_state(state_path, state)
+        print(f"[phase 1] submitted batch {batch_id} ({len(prompts)} requests)")
+
+    results: Dict[int, Tuple[Optional[str], Dict[str, int], Dict[str, object], Optional[str]]] = {}
+    finished = True
+    if args.dry_run:
+        for model_id in prompts:
+            results[model_id] = (
+                "# Dry run placeholder SysMLv2 model",
+                usage_stats({}),
+                {},
+                None,
+            )
+    else:
+        finished, batch = poll_batch(client, args, batch_id)
+        if args.provider == "openai":
+            results = fetch_openai_results(client, batch)
+        elif finished:
+            results = fetch_anthropic_results(client, batch_id)
+    ingested_utc = iso_utc(utc_now())
+    print(f"[phase 1] ingested {len(results)}/{len(prompts)} results (finished={finished})")
+
+    pool: Optional[ValidatorPool] = None
+    if not args.dry_run:
+        python_exe = refine_sysml.resolve_python_executable(args.venv)
+        refine_sysml.assert_syside_available(python_exe, args.venv, args.syside_timeout_seconds)
+        pool = ValidatorPool(
+            python_exe,
+            refine_sysml.resolve_syside_command(python_exe, args.venv),
+            size=args.validate_workers,
+            mode=args.validator_mode,
+        )
+        pool.start()
+
+    # Candidates are queued for validation as soon as they are written; the pool
+    # bounds CPU use while the dispatch threads only wait on results.
+    cases: Dict[int, Dict[str, object]] = {}
+    futures = {}
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    print(f"[phase 2] validating with {args.validate_workers} {args.validator_mode} worker(s)")
+    executor = ThreadPoolExecutor(max_workers=max(1, args.validate_workers * 2))
+    try:
+        for model_id, prompt in sorted(prompts.items()):
+            text, tokens, payload, error = results.get(
+                model_id, (None, usage_stats({}), {}, "no result returned by batch")
+            )
+            if text is None:
+                cases[model_id] = {"model_id": model_id, "status": "error", "reason": error}
+                continue
+            run_dir = args.runs_root.resolve() / str(model_id) / f"{stamp}-batch"
+            ensure_dir(run_dir)
+            (run_dir / "iteration_01_prompt.txt").write_text(prompt, encoding="utf-8")
+            (run_dir / "iteration_01.sysml").write_text(text, encoding="utf-8")
+            (run_dir / "iteration_01_response.json").write_text(
+                json.dumps(payload, indent=2, default=str), encoding="utf-8"
+            )
+            (run_dir / "run_meta.json").write_text(
+                json.dumps(
+                    {
+                        "run_start": submitted_utc,
+                        "run_end": ingested_utc,
+                        "iterations_completed": 1,
+                        "tokens_used_total": tokens.get("total_tokens", 0),
+                        "provider": args.provider,
+                        "model": args.model,
+                        "generation_mode": "provider_batch",
+                        "batch_id": batch_id,
+                    },
+                    indent=2,
+                ),
+                encoding="utf-8",
+            )
+            futures[
+                executor.submit(validate_case, args, pool, model_id, run_dir, tokens, batch_id)
+            ] = model_id
+        for future in as_completed(futures):
+            model_id = futures[future]
+            try:
+                cases[model_id] = future.result()
+            except Exception as exc:
+                cases[model_id] = {
+                    "model_id": model_id,
+                    "status": "error",
+                    "reason": f"validation exception: {exc}",
+                }
+    finally:
+        executor.shutdown(wait=True)
+        if pool is not None:
+            pool.close()
+
+    passed = sum(1 for c in cases.values() if c.get("success"))
+    manifest = {
+        "provider": args.provider,
+        "model": args.model,
+        "batch_id": batch_id,
+        "submitted_utc": submitted_utc,
+        "ingested_utc": ingested_utc,
+        "finished": finished,
+        "total": len(prompts),
+        "passed": passed,
+        "cases": [cases[model_id] for model_id in sorted(cases)],
+    }
+    manifest_path = args.work_dir / "first_shot_manifest.json"
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    print(f"[done] first-shot passed={passed}/{len(prompts)}; manifest: {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from time import perf_counter, sleep
 
+from validator_pool import validator_slot
+
 try:
     from openai import OpenAI
 except Exception:  # pragma: no cover - optional dependency for provider selection
@@ -178,6 +180,29 @@ def parse_args() -> argparse.Namespace:
             "If 0, --max-iters is used as the additional count."
         ),
     )
+    parser.add_argument(
+        "--validator-slots-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Optional directory of lock files shared by concurrent runs; each syside "
+            "call holds one of --validator-slots so validation stays within the CPU budget."
+        ),
+    )
+    parser.add_argument(
+        "--validator-slots",
+        type=int,
+        default=0,
+        help="Number of concurrent syside calls allowed across runs sharing --validator-slots-dir.",
+    )
+    parser.add_argument(
+        "--carry-resume-log",
+        action="store_true",
+        help=(
+            "When resuming, copy iterations <= --resume-from-iteration and their "
+            "run_log entries into the new run so it reads as one continuous run."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -569,6 +594,8 @@ def run_syside_check(
     model_path: Path,
     timeout_seconds: int,
     validate_with: str,
+    slots_dir: Optional[Path] = None,
+    slots: int = 0,
 ) -> subprocess.CompletedProcess:
     relative_target = model_path.name
     if validate_with == "check":
@@ -577,15 +604,16 @@ def run_syside_check(
         subcmd = ["format", relative_target]
     cmd = resolve_syside_command(python_path, venv_root.resolve()) + subcmd
     try:
-        return subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            cwd=model_path.parent,
-            check=False,
-            timeout=timeout_seconds,
-        )
+        with validator_slot(slots_dir, slots):
+            return subprocess.run(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=model_path.parent,
+                check=False,
+                timeout=timeout_seconds,
+            )
     except subprocess.TimeoutExpired as exc:
         stdout = exc.stdout or ""
         stderr = (exc.stderr or "").rstrip()
@@ -633,6 +661,40 @@ def assert_syside_available(python_path: Path, venv_root: Path, timeout_seconds:
         )
 
 
+def carry_resume_log(
+    source_dir: Path,
+    resume_iter: int,
+    timestamp_dir: Path,
+) -> List[Dict[str, object]]:
+    """Copy iterations <= resume_iter from source_dir and return their rewritten log steps."""
+    source_log_path = source_dir / "run_log.json"
+    if not source_log_path.exists():
+        print(f"[resume] no run_log.json in {source_dir}; nothing to carry over")
+        return []
+    source_log = json.loads(source_log_path.read_text(encoding="utf-8"))
+    if not isinstance(source_log, list):
+        return []
+    carried: List[Dict[str, object]] = []
+    for step in source_log:
+        if not isinstance(step, dict) or int(step.get("iteration", 0)) > resume_iter:
+            continue
+        step = dict(step)
+        for key in ("sysml_path", "prompt_path", "response_path"):
+            src = Path(str(step.get(key) or ""))
+            if not src.name:
+                continue
+            if not src.exists():
+                src = source_dir / src.name
+            if src.exists():
+                dest = timestamp_dir / src.name
+                dest.write_bytes(src.read_bytes())
+                step[key] = str(dest)
+        carried.append(step)
+    carried.sort(key=lambda s: int(s.get("iteration", 0)))
+    print(f"[resume] carried {len(carried)} iteration(s) from {source_log_path}")
+    return carried
+
+
 def main() -> None:
     args = parse_args()
     ensure_dir(args.output_dir)
@@ -749,13 +811,32 @@ def main() -> None:
             f"resume_from={resume_iter} additional={additional} "
             f"target_end_iteration={end_iteration}"
         )
-        if not args.dry_run and python_exe is not None:
+        carried_step: Optional[Dict[str, object]] = None
+        if args.carry_resume_log:
+            run_log = carry_resume_log(source_dir, resume_iter, timestamp_dir)
+            if run_log:
+                tokens_consumed = int(run_log[-1].get("tokens_used_total", 0) or 0)
+                if int(run_log[-1].get("iteration", 0)) == resume_iter:
+                    carried_step = run_log[-1]
+        if carried_step is not None and carried_step.get("return_code") is not None:
+            # The carried step already holds the validator output for this candidate.
+            compiler_feedback = compact_compiler_feedback(
+                str(carried_step.get("compiler_stdout") or ""),
+                str(carried_step.get("compiler_stderr") or ""),
+            )
+            print(
+                f"[resume] seeded compiler feedback from carried run_log entry "
+                f"(return code {carried_step.get('return_code')})"
+            )
+        elif not args.dry_run and python_exe is not None:
             seed_result = run_syside_check(
                 python_exe,
                 args.venv,
                 source_sysml,
                 args.syside_timeout_seconds,
                 args.syside_validate_with,
+                args.validator_slots_dir,
+                args.validator_slots,
             )
             seed_stdout = seed_result.stdout.strip()
             seed_stderr = seed_result.stderr.strip()
@@ -837,6 +918,8 @@ def main() -> None:
                 sysml_path,
                 args.syside_timeout_seconds,
                 args.syside_validate_with,
+                args.validator_slots_dir,
+                args.validator_slots,
             )
             compile_stdout = result.stdout.strip()
             compile_stderr = result.stderr.strip()
@@ -5,20 +5,27 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
 import json
 import os
 import re
 import shutil
 import subprocess
+import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 from time import perf_counter
 from typing import Dict, List, Optional, Sequence
 
+from validator_pool import physical_core_count
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 UPSTREAM_ROOT = SCRIPT_DIR.parent / "sysmbench_original_upstream"
+sys.path.insert(0, str(SCRIPT_DIR.parent / "evaluation_scripts"))
+
+from dataset_index import load_dataset_index  # noqa: E402
+
 DONE_LOG_RE = re.compile(r"\[done\] run details saved to (.+run_log\.json)")
 DEFAULT_OPENAI_MODEL = "gpt-5-mini"
 DEFAULT_ANTHROPIC_MODEL = "claude-sonnet-4-6"
@@ -26,6 +33,7 @@ DEFAULT_DEEPSEEK_REASONER_MODEL = "deepseek-reasoner"
 DEFAULT_DEEPSEEK_BASE_URL = "https://api.deepseek.com/v1"
 DEFAULT_MISTRAL_LARGE_MODEL = "mistral-large-latest"
 DEFAULT_MISTRAL_BASE_URL = "https://api.mistral.ai/v1"
+FIRST_SHOT_BATCH_PROVIDERS = ("openai", "anthropic")
 
 
 def utc_now() -> datetime:
@@ -84,11 +92,38 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--end-id", type=int, default=151)
     parser.add_argument("--skip", type=int, nargs="*", default=[])
     parser.add_argument("--batch-size", type=int, default=30)
+    parser.add_argument(
+        "--schedule",
+        choices=("id", "longest-first"),
+        default="id",
+        help=(
+            "Order in which selected IDs are dispatched. longest-first uses the dataset "
+            "metadata sidecar (ground-truth line count, then NL length) so the slowest "
+            "cases start first and do not straggle at the end of a batch."
+        ),
+    )
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        default=UPSTREAM_ROOT / "dataset" / "sysml" / "dataset.json",
+        help="SysMBench dataset.json whose metadata sidecar feeds --schedule longest-first.",
+    )
     parser.add_argument(
         "--parallelism",
         type=int,
         default=1,
-        help="How many IDs to process concurrently inside each batch.",
+        help=(
+            "How many IDs (API-bound refine loops) to process concurrently inside each batch."
+        ),
+    )
+    parser.add_argument(
+        "--validator-workers",
+        type=int,
+        default=physical_core_count(),
+        help=(
+            "Concurrent syside validations across all IDs, independent of --parallelism "
+            "(default: physical cores)."
+        ),
     )
     parser.add_argument(
         "--id-retries",
@@ -159,15 +194,62 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Forward dry-run to refine_sysml.py and skip API/compiler calls.",
     )
+    parser.add_argument(
+        "--first-shot-batch",
+        action="store_true",
+        help=(
+            "Generate iteration 1 for all selected IDs through the provider batch API, "
+            "validate in bulk, and run the compile-fix loop only for failures."
+        ),
+    )
+    parser.add_argument(
+        "--first-shot-script",
+        type=Path,
+        default=SCRIPT_DIR / "first_shot_batch.py",
+        help="Path to first_shot_batch.py.",
+    )
+    parser.add_argument(
+        "--first-shot-batch-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Work dir for first_shot_batch.py (batch_state.json, manifest, log). Default: "
+            "<output-root>/_first_shot_batches/<key>, keyed on provider, model, generation "
+            "settings and the pending IDs' prompts, so a re-run resumes the same provider batch."
+        ),
+    )
+    parser.add_argument(
+        "--batch-poll-seconds",
+        type=float,
+        default=30.0,
+        help="Delay between provider batch status polls.",
+    )
+    parser.add_argument(
+        "--batch-timeout-seconds",
+        type=float,
+        default=24 * 3600.0,
+        help="Stop waiting for the provider batch after this long.",
+    )
+    parser.add_argument(
+        "--batch-base-url",
+        default=None,
+        help="Override the batch API base URL (e.g., a local stand-in server).",
+    )
     args = parser.parse_args()
     if args.batch_size <= 0:
         raise SystemExit("--batch-size must be > 0")
     if args.parallelism <= 0:
         raise SystemExit("--parallelism must be > 0")
+    if args.validator_workers <= 0:
+        raise SystemExit("--validator-workers must be > 0")
     if args.id_retries < 0:
         raise SystemExit("--id-retries must be >= 0")
     if args.start_id > args.end_id:
         raise SystemExit("--start-id must be <= --end-id")
+    if args.first_shot_batch and args.provider not in FIRST_SHOT_BATCH_PROVIDERS:
+        raise SystemExit(
+            "--first-shot-batch supports providers: " + ", ".join(FIRST_SHOT_BATCH_PROVIDERS)
+        )
     return args
 
 
@@ -234,6 +316,19 @@ def select_ids(all_ids: Sequence[int], start_id: int, end_id: int, skip_ids: Seq
     return [i for i in all_ids if start_id <= i <= end_id and i not in skip_set]
 
 
+def order_ids_by_cost(selected_ids: Sequence[int], dataset_path: Path) -> List[int]:
+    """Longest-first order from dataset metadata; IDs without metadata go last."""
+    records = load_dataset_index(dataset_path)
+
+    def cost(model_id: int) -> tuple:
+        record = records.get(model_id)
+        if record is None:
+            return (1, 0, 0, model_id)
+        return (0, -int(record["line_count"]), -int(record["nl_length"]), model_id)
+
+    return sorted(selected_ids, key=cost)
+
+
 def copy_groundtruth(samples_root: Path, model_id: int, case_dir: Path) -> Optional[Path]:
     candidates = [
         samples_root / f"{model_id:02d}" / "design.sysml",
@@ -286,6 +381,7 @@ def run_refine_for_id(
     args: argparse.Namespace,
     model_id: int,
     base_env: Dict[str, str],
+    first_shot: Optional[Dict[str, object]] = None,
 ) -> Dict[str, object]:
     prompt_path = args.prompts_root / str(model_id) / "nl.txt"
     case_dir = args.output_root / str(model_id)
@@ -306,6 +402,36 @@ def run_refine_for_id(
             "groundtruth_path": str(groundtruth_path) if groundtruth_path else None,
         }
 
+    stdout_path = case_dir / f"{model_id}_refine_stdout.log"
+    stderr_path = case_dir / f"{model_id}_refine_stderr.log"
+    first_shot_dir: Optional[Path] = None
+    if first_shot and first_shot.get("status") == "ok" and first_shot.get("run_dir"):
+        first_shot_dir = Path(str(first_shot["run_dir"]))
+    if first_shot_dir is not None and (first_shot.get("success") or args.max_iters <= 1):
+        # The batch first shot is final: either it validated or there is no budget to refine.
+        run_log_path = first_shot_dir / "run_log.json"
+        stdout_path.write_text(
+            f"[first-shot-batch] iteration 1 validated with return code "
+            f"{first_shot.get('return_code')}\n"
+            f"[done] run details saved to {run_log_path}\n",
+            encoding="utf-8",
+        )
+        stderr_path.write_text("", encoding="utf-8")
+        now = utc_now()
+        return finalize_refine_run(
+            model_id=model_id,
+            prompt_path=prompt_path,
+            case_dir=case_dir,
+            groundtruth_path=groundtruth_path,
+            run_dir=first_shot_dir,
+            run_log_path=run_log_path,
+            stdout_path=stdout_path,
+            stderr_path=stderr_path,
+            loop_start_utc=now,
+            loop_end_utc=now,
+            loop_duration_seconds=0.0,
+        )
+
     before_dirs = [p.name for p in raw_runs_dir.iterdir() if p.is_dir()]
     runner_python = resolve_venv_python(args.venv)
 
@@ -344,6 +470,10 @@ def run_refine_for_id(
         str(args.deepseek_base_url),
         "--mistral-base-url",
         str(args.mistral_base_url),
+        "--validator-slots-dir",
+        str(args.refine_runs_root / "_validator_slots"),
+        "--validator-slots",
+        str(args.validator_workers),
     ]
     if args.temperature is not None:
         cmd.extend(["--temperature", str(args.temperature)])
@@ -351,6 +481,18 @@ def run_refine_for_id(
         cmd.extend(["--example", str(args.example)])
     if args.dry_run:
         cmd.append("--dry-run")
+    if first_shot_dir is not None:
+        cmd.extend(
+            [
+                "--resume-source-dir",
+                str(first_shot_dir),
+                "--resume-from-iteration",
+                "1",
+                "--max-additional-prompts",
+                str(args.max_iters - 1),
+                "--carry-resume-log",
+            ]
+        )
 
     loop_start_utc = utc_now()
     loop_start_wall = perf_counter()
@@ -365,8 +507,6 @@ def run_refine_for_id(
         check=False,
     )
 
-    stdout_path = case_dir / f"{model_id}_refine_stdout.log"
-    stderr_path = case_dir / f"{model_id}_refine_stderr.log"
     stdout_path.write_text(proc.stdout, encoding="utf-8")
     stderr_path.write_text(proc.stderr, encoding="utf-8")
     loop_end_utc = utc_now()
@@ -390,6 +530,36 @@ def run_refine_for_id(
             "loop_duration_seconds": loop_duration_seconds,
         }
 
+    return finalize_refine_run(
+        model_id=model_id,
+        prompt_path=prompt_path,
+        case_dir=case_dir,
+        groundtruth_path=groundtruth_path,
+        run_dir=run_dir,
+        run_log_path=run_log_path,
+        stdout_path=stdout_path,
+        stderr_path=stderr_path,
+        loop_start_utc=loop_start_utc,
+        loop_end_utc=loop_end_utc,
+        loop_duration_seconds=loop_duration_seconds,
+    )
+
+
+def finalize_refine_run(
+    model_id: int,
+    prompt_path: Path,
+    case_dir: Path,
+    groundtruth_path: Optional[Path],
+    run_dir: Optional[Path],
+    run_log_path: Optional[Path],
+    stdout_path: Path,
+    stderr_path: Path,
+    loop_start_utc: datetime,
+    loop_end_utc: datetime,
+    loop_duration_seconds: float,
+) -> Dict[str, object]:
+    """Copy the final candidate out of a finished run directory and write the case manifest."""
+    final_sysml_path = case_dir / f"{model_id}.sysml"
     if not run_log_path or not run_log_path.exists():
         return {
             "model_id": model_id,
@@ -529,10 +699,11 @@ def run_refine_for_id_with_retries(
     args: argparse.Namespace,
     model_id: int,
     base_env: Dict[str, str],
+    first_shot: Optional[Dict[str, object]] = None,
 ) -> Dict[str, object]:
     last_result: Optional[Dict[str, object]] = None
     for attempt in range(1, args.id_retries + 2):
-        result = run_refine_for_id(args, model_id, base_env)
+        result = run_refine_for_id(args, model_id, base_env, first_shot)
         result["attempt"] = attempt
         if result.get("status") != "failed":
             result["attempts_used"] = attempt
@@ -547,6 +718,114 @@ def run_refine_for_id_with_retries(
     return last_result
 
 
+def first_shot_batch_key(args: argparse.Namespace, pending_ids: Sequence[int]) -> str:
+    """Hash of everything that shapes the first-shot batch requests."""
+    h = hashlib.sha256()
+    settings = [args.provider, args.model, args.temperature, args.anthropic_max_output_tokens, args.batch_base_url]
+    h.update(json.dumps(settings).encode("utf-8") + b"\0")
+    if args.example is not None and args.example.exists():
+        h.update(args.example.read_bytes())
+    h.update(b"\0")
+    for model_id in sorted(pending_ids):
+        nl_path = args.prompts_root / str(model_id) / "nl.txt"
+        h.update(f"{model_id}\0".encode("utf-8"))
+        if nl_path.exists():
+            h.update(nl_path.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def run_first_shot_batch(
+    args: argparse.Namespace,
+    selected_ids: Sequence[int],
+    base_env: Dict[str, str],
+) -> Dict[int, Dict[str, object]]:
+    """Run first_shot_batch.py for IDs that still need generation; return its cases by ID."""
+    pending_ids = [
+        model_id
+        for model_id in selected_ids
+        if args.overwrite
+        or not (args.output_root / str(model_id) / f"{model_id}.sysml").exists()
+        or not has_success_manifest(args.output_root / str(model_id), model_id)
+    ]
+    if not pending_ids:
+        print("[first-shot] all selected IDs already have successful manifests")
+        return {}
+    # A stable work dir lets first_shot_batch.py resume a submitted batch from its
+    # batch_state.json after an interrupted run instead of paying for a new one.
+    work_dir = args.first_shot_batch_dir
+    if work_dir is None:
+        key = first_shot_batch_key(args, pending_ids)
+        work_dir = args.output_root / "_first_shot_batches" / f"{args.provider}_{key[:16]}"
+    ensure_dir(work_dir)
+    cmd: List[str] = [
+        str(resolve_venv_python(args.venv)),
+        str(args.first_shot_script),
+        "--provider",
+        str(args.provider),
+        "--model",
+        str(args.model),
+        "--anthropic-max-output-tokens",
+        str(args.anthropic_max_output_tokens),
+        "--prompts-root",
+        str(args.prompts_root),
+        "--runs-root",
+        str(args.refine_runs_root),
+        "--work-dir",
+        str(work_dir),
+        "--venv",
+        str(args.venv),
+        "--syside-timeout-seconds",
+        str(args.syside_timeout_seconds),
+        "--syside-validate-with",
+        str(args.syside_validate_with),
+        "--poll-seconds",
+        str(args.batch_poll_seconds),
+        "--batch-timeout-seconds",
+        str(args.batch_timeout_seconds),
+        "--validate-workers",
+        str(args.validator_workers),
+        "--ids",
+        *[str(model_id) for model_id in pending_ids],
+    ]
+    if args.temperature is not None:
+        cmd.extend(["--temperature", str(args.temperature)])
+    if args.example is not None:
+        cmd.extend(["--example", str(args.example)])
+    if args.batch_base_url:
+        cmd.extend(["--base-url", str(args.batch_base_url)])
+    if args.dry_run:
+        cmd.append("--dry-run")
+
+    print(f"[first-shot] submitting {len(pending_ids)} IDs through the {args.provider} batch API")
+    print(f"[first-shot] work dir: {work_dir}")
+    log_path = work_dir / "first_shot_batch.log"
+    with log_path.open("a", encoding="utf-8") as log_file:
+        proc = subprocess.run(
+            cmd,
+            cwd=SCRIPT_DIR,
+            env=base_env,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            text=True,
+            check=False,
+        )
+    manifest_path = work_dir / "first_shot_manifest.json"
+    if proc.returncode != 0 or not manifest_path.exists():
+        print(
+            f"[first-shot] batch phase failed (exit {proc.returncode}); "
+            f"falling back to the full loop for all IDs. Log: {log_path}"
+        )
+        return {}
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    cases = {int(case["model_id"]): case for case in manifest.get("cases", [])}
+    print(
+        f"[first-shot] passed {manifest.get('passed')}/{manifest.get('total')}; "
+        f"failures continue in the compile-fix loop. Manifest: {manifest_path}"
+    )
+    return cases
+
+
 def write_timing_csvs(
     session_output_dir: Path,
     session_id: str,
@@ -635,7 +914,9 @@ def write_session_manifest(
         "provider": args.provider,
         "model": args.model,
         "batch_size": args.batch_size,
+        "schedule": args.schedule,
         "parallelism": args.parallelism,
+        "validator_workers": args.validator_workers,
         "id_retries": args.id_retries,
         "start_id": args.start_id,
         "end_id": args.end_id,
@@ -651,6 +932,7 @@ def write_session_manifest(
         "anthropic_max_output_tokens": args.anthropic_max_output_tokens,
         "deepseek_base_url": args.deepseek_base_url,
         "mistral_base_url": args.mistral_base_url,
+        "first_shot_batch": args.first_shot_batch,
         "prompts_root": str(args.prompts_root),
         "output_root": str(args.output_root),
         "refine_runs_root": str(args.refine_runs_root),
@@ -688,10 +970,14 @@ def main() -> None:
     args.output_root = (SCRIPT_DIR / args.output_root).resolve()
     args.refine_runs_root = (SCRIPT_DIR / args.refine_runs_root).resolve()
     args.refine_script = (SCRIPT_DIR / args.refine_script).resolve()
+    args.first_shot_script = (SCRIPT_DIR / args.first_shot_script).resolve()
     args.venv = (SCRIPT_DIR / args.venv).resolve()
     if args.example is not None:
         args.example = (SCRIPT_DIR / args.example).resolve()
+    if args.first_shot_batch_dir is not None:
+        args.first_shot_batch_dir = (SCRIPT_DIR / args.first_shot_batch_dir).resolve()
     args.env_file = (SCRIPT_DIR / args.env_file).resolve()
+    args.dataset = (SCRIPT_DIR / args.dataset).resolve()
 
     if not args.prompts_root.exists():
         raise SystemExit(f"Prompts root does not exist: {args.prompts_root}")
@@ -704,6 +990,11 @@ def main() -> None:
     selected_ids = select_ids(all_ids, args.start_id, args.end_id, args.skip)
     if not selected_ids:
         raise SystemExit("No prompt IDs matched selection.")
+    if args.schedule == "longest-first":
+        if not args.dataset.exists():
+            raise SystemExit(f"dataset.json not found for --schedule longest-first: {args.dataset}")
+        selected_ids = order_ids_by_cost(selected_ids, args.dataset)
+        print(f"[schedule] longest-first: {' '.join(str(i) for i in selected_ids[:10])} ...")
 
     ensure_dir(args.output_root)
     ensure_dir(args.refine_runs_root)
@@ -714,14 +1005,17 @@ def main() -> None:
     session_id = utc_now().strftime("%Y%m%d-%H%M%S")
     session_output_dir = args.output_root / "_refine_sessions" / session_id
     ensure_dir(session_output_dir)
+    first_shot_cases: Dict[int, Dict[str, object]] = {}
+    if args.first_shot_batch:
+        first_shot_cases = run_first_shot_batch(args, selected_ids, base_env)
     results: List[Dict[str, object]] = []
     total = len(selected_ids)
     batches = [selected_ids[i : i + args.batch_size] for i in range(0, total, args.batch_size)]
 
-    print(f"[start] selected {total} IDs from {selected_ids[0]} to {selected_ids[-1]}")
+    print(f"[start] selected {total} IDs from {min(selected_ids)} to {max(selected_ids)}")
     print(
         f"[start] running in {len(batches)} batch(es) with batch size {args.batch_size} "
-        f"and parallelism {args.parallelism}"
+        f"and parallelism {args.parallelism} (validator workers {args.validator_workers})"
     )
     for batch_index, batch_ids in enumerate(batches, start=1):
         print(
@@ -735,7 +1029,9 @@ def main() -> None:
                     f"[batch {batch_index}/{len(batches)}] "
                     f"{index_in_batch}/{len(batch_ids)} model {model_id}"
                 )
-                result = run_refine_for_id_with_retries(args, model_id, base_env)
+                result = run_refine_for_id_with_retries(
+                    args, model_id, base_env, first_shot_cases.get(model_id)
+                )
                 result["batch_index"] = batch_index
                 results.append(result)
                 manifest_path = write_session_manifest(
@@ -755,7 +1051,11 @@ def main() -> None:
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 future_to_model = {
                     executor.submit(
-                        run_refine_for_id_with_retries, args, model_id, base_env
+                        run_refine_for_id_with_retries,
+                        args,
+                        model_id,
+                        base_env,
+                        first_shot_cases.get(model_id),
                     ): model_id
                     for model_id in batch_ids
                 }
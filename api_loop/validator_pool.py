@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""Pre-forked syside validator workers sized to CPU cores, plus a cross-process slot limiter."""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import queue
+import select
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Runs inside the venv interpreter that owns syside. Each request executes
+# `python -m syside <args>` in-process, so the syside import and its standard
+# library stay warm across checks. fds 0/1/2 are detached from the protocol
+# pipes so native output cannot corrupt the JSON channel.
+WARM_WORKER_SOURCE = r"""
+import io, json, os, runpy, sys, tempfile, traceback
+requests = os.fdopen(os.dup(0), "r")
+proto = os.fdopen(os.dup(1), "w", buffering=1)
+devnull = os.open(os.devnull, os.O_RDWR)
+os.dup2(devnull, 0)
+saved_out, saved_err = os.dup(1), os.dup(2)
+os.dup2(devnull, 1)
+try:
+    import syside  # noqa: F401
+except BaseException as exc:
+    proto.write(json.dumps({"ready": False, "error": repr(exc)}) + "\n")
+    raise SystemExit(1)
+proto.write(json.dumps({"ready": True}) + "\n")
+
+def run(args, cwd):
+    out_f, err_f = tempfile.TemporaryFile(), tempfile.TemporaryFile()
+    os.dup2(out_f.fileno(), 1)
+    os.dup2(err_f.fileno(), 2)
+    sys.stdout = io.TextIOWrapper(os.fdopen(os.dup(1), "wb"), write_through=True)
+    sys.stderr = io.TextIOWrapper(os.fdopen(os.dup(2), "wb"), write_through=True)
+    code, crashed = 0, False
+    try:
+        os.chdir(cwd)
+        sys.argv = ["syside"] + list(args)
+        runpy.run_module("syside", run_name="__main__", alter_sys=True)
+    except SystemExit as exc:
+        if exc.code is None:
+            code = 0
+        elif isinstance(exc.code, int):
+            code = exc.code
+        else:
+            print(exc.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code, crashed = 1, True
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdout.close()
+        sys.stderr.close()
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+        os.dup2(devnull, 1)
+        os.dup2(saved_err, 2)
+    out_f.seek(0)
+    err_f.seek(0)
+    stdout = out_f.read().decode("utf-8", "replace")
+    stderr = err_f.read().decode("utf-8", "replace")
+    out_f.close()
+    err_f.close()
+    return code, stdout, stderr, crashed
+
+for line in requests:
+    if not line.strip():
+        continue
+    request = json.loads(line)
+    code, stdout, stderr, crashed = run(request["args"], request["cwd"])
+    proto.write(json.dumps(
+        {"returncode": code, "stdout": stdout, "stderr": stderr, "crashed": crashed}
+    ) + "\n")
+"""
+
+
+def physical_core_count() -> int:
+    """Best-effort physical core count (falls back to logical CPUs)."""
+    logical = os.cpu_count() or 1
+    system = platform.system()
+    try:
+        if system == "Linux":
+            cores = set()
+            physical_id = core_id = None
+            for line in Path("/proc/cpuinfo").read_text(encoding="utf-8").splitlines() + [""]:
+                if line.startswith("physical id"):
+                    physical_id = line.split(":", 1)[1].strip()
+                elif line.startswith("core id"):
+                    core_id = line.split(":", 1)[1].strip()
+                elif not line.strip():
+                    if core_id is not None:
+                        cores.add((physical_id, core_id))
+                    physical_id = core_id = None
+            if cores:
+                return max(1, min(len(cores), logical))
+        elif system == "Darwin":
+            out = subprocess.run(
+                ["sysctl", "-n", "hw.physicalcpu"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                check=False,
+            ).stdout.strip()
+            if out.isdigit():
+                return max(1, int(out))
+    except OSError:
+        pass
+    return logical
+
+
+class WarmSysideWorker:
+    """One long-lived interpreter that runs syside CLI requests in-process."""
+
+    def __init__(self, python_path: Path, startup_timeout_seconds: float, max_jobs: int) -> None:
+        self.python_path = python_path
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.max_jobs = max_jobs
+        self.proc: Optional[subprocess.Popen] = None
+        self.jobs_done = 0
+
+    def start(self) -> None:
+        self.proc = subprocess.Popen(
+            [str(self.python_path), "-c", WARM_WORKER_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self.jobs_done = 0
+        reply = self._read_reply(self.startup_timeout_seconds)
+        if not reply or not reply.get("ready"):
+            self.stop()
+            detail = reply.get("error") if reply else "no handshake"
+            raise RuntimeError(f"warm syside worker failed to start ({detail})")
+
+    def stop(self) -> None:
+        if self.proc is None:
+            return
+        try:
+            if self.proc.stdin:
+                self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+    def _read_reply(self, timeout_seconds: float) -> Optional[Dict[str, object]]:
+        assert self.proc is not None and self.proc.stdout is not None
+        ready, _, _ = select.select([self.proc.stdout], [], [], max(0.0, timeout_seconds))
+        if not ready:
+            return None
+        line = self.proc.stdout.readline()
+        if not line:
+            return None
+        return json.loads(line)
+
+    def run(self, args: Sequence[str], cwd: Path, timeout_seconds: float) -> subprocess.CompletedProcess:
+        if self.proc is None or self.proc.poll() is not None or self.jobs_done >= self.max_jobs:
+            self.stop()
+            self.start()
+        assert self.proc is not None and self.proc.stdin is not None
+        cmd = ["syside", *args]
+        try:
+            self.proc.stdin.write(json.dumps({"args": list(args), "cwd": str(cwd)}) + "\n")
+            self.proc.stdin.flush()
+            reply = self._read_reply(timeout_seconds)
+        except (OSError, ValueError):
+            reply = None
+        if reply is None:
+            # Hung or dead worker: kill it so the next job gets a fresh process.
+            alive = self.proc.poll() is None
+            self.stop()
+            if alive:
+                raise subprocess.TimeoutExpired(cmd, timeout_seconds, output="", stderr="")
+            raise RuntimeError("warm syside worker exited unexpectedly")
+        self.jobs_done += 1
+        if reply.get("crashed"):
+            self.stop()
+        return subprocess.CompletedProcess(
+            cmd,
+            returncode=int(reply.get("returncode") or 0),
+            stdout=str(reply.get("stdout") or ""),
+            stderr=str(reply.get("stderr") or ""),
+        )
+
+
+class ValidatorPool:
+    """Fixed-size pool of syside validators fed from one job queue.
+
+    `mode="warm"` pre-forks one `WarmSysideWorker` per slot; `mode="cold"` runs
+    `syside_prefix + args` as a fresh subprocess per job. Either way at most
+    `size` validations run at once, independent of how many callers submit.
+    """
+
+    def __init__(
+        self,
+        python_path: Path,
+        syside_prefix: Sequence[str],
+        size: Optional[int] = None,
+        mode: str = "warm",
+        startup_timeout_seconds: float = 120.0,
+        max_jobs_per_worker: int = 500,
+    ) -> None:
+        self.python_path = python_path
+        self.syside_prefix = list(syside_prefix)
+        self.size = size or physical_core_count()
+        self.mode = mode
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.jobs: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self.threads: List[threading.Thread] = []
+        self.workers: List[Optional[WarmSysideWorker]] = []
+
+    def __enter__(self) -> "ValidatorPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> None:
+        if self.mode == "warm":
+            try:
+                self.workers = self._prefork()
+            except RuntimeError as exc:
+                print(f"[validator-pool] {exc}; falling back to cold subprocess checks")
+                self.mode = "cold"
+        if self.mode == "cold":
+            self.workers = [None] * self.size
+        for index in range(self.size):
+            thread = threading.Thread(target=self._serve, args=(index,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        print(f"[validator-pool] {self.size} {self.mode} validator worker(s) ready")
+
+    def _prefork(self) -> List[Optional[WarmSysideWorker]]:
+        workers: List[Optional[WarmSysideWorker]] = [
+            WarmSysideWorker(self.python_path, self.startup_timeout_seconds, self.max_jobs_per_worker)
+            for _ in range(self.size)
+        ]
+        errors: List[Exception] = []
+
+        def boot(worker: WarmSysideWorker) -> None:
+            try:
+                worker.start()
+            except Exception as exc:
+                errors.append(exc)
+
+        boot_threads = [threading.Thread(target=boot, args=(w,)) for w in workers if w]
+        for thread in boot_threads:
+            thread.start()
+        for thread in boot_threads:
+            thread.join()
+        if errors:
+            for worker in workers:
+                if worker:
+                    worker.stop()
+            raise RuntimeError(str(errors[0]))
+        return workers
+
+    def _serve(self, index: int) -> None:
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            future, args, cwd, timeout_seconds = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                worker = self.workers[index]
+                if worker is not None:
+                    try:
+                        result = worker.run(args, cwd, timeout_seconds)
+                    except RuntimeError:
+                        result = self._run_cold(args, cwd, timeout_seconds)
+                else:
+                    result = self._run_cold(args, cwd, timeout_seconds)
+                future.set_result(result)
+            except BaseException as exc:
+                future.set_exception(exc)
+
+    def _run_cold(self, args: Sequence[str], cwd: Path, timeout_seconds: float) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            self.syside_prefix + list(args),
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False,
+            timeout=timeout_seconds,
+        )
+
+    def submit(self, args: Sequence[str], cwd: Path, timeout_seconds: float) -> Future:
+        future: Future = Future()
+        self.jobs.put((future, list(args), Path(cwd), timeout_seconds))
+        return future
+
+    def run(self, args: Sequence[str], cwd: Path, timeout_seconds: float) -> subprocess.CompletedProcess:
+        """Blocking helper with `subprocess.run` semantics (raises TimeoutExpired)."""
+        return self.submit(args, cwd, timeout_seconds).result()
+
+    def close(self) -> None:
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        for worker in self.workers:
+            if worker is not None:
+                worker.stop()
+        self.workers = []
+
+
+@contextmanager
+def validator_slot(slots_dir: Optional[Path], slots: int, poll_seconds: float = 0.05) -> Iterator[None]:
+    """Hold one of `slots` flock-based slots in `slots_dir` (no-op when unset or without fcntl).
+
+    Lets independent refine_sysml.py processes share one CPU budget for syside.
+    """
+    if slots_dir is None or slots <= 0 or fcntl is None:
+        yield
+        return
+    slots_dir.mkdir(parents=True, exist_ok=True)
+    while True:
+        for index in range(slots):
+            handle = open(slots_dir / f"slot_{index:03d}.lock", "a+")
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                continue
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                handle.close()
+            return
+        time.sleep(poll_seconds)
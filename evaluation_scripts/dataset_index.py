@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Compact metadata sidecar for SysMBench dataset.json.
+
+dataset.json carries every NL prompt and design text, but the metric scripts
+only need a few derived fields per sample. This module builds (once) and loads
+a small sidecar next to the dataset:
+
+    {"source": {path, mtime_ns, size, sha256},
+     "difficulty_edges": [30, 60, 90, 120],
+     "records": {"<id>": {grammar, domain, line_count, difficulty, nl_length, design_sha256}}}
+
+The sidecar is reused while dataset.json keeps the same mtime/size, revalidated
+by sha256 when they change, and rebuilt only when the content hash differs.
+
+Usage:
+    python evaluation_scripts/dataset_index.py [--dataset ...] [--rebuild]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+
+DEFAULT_DATASET_PATH = REPO_ROOT / "sysmbench_original_upstream" / "dataset" / "sysml" / "dataset.json"
+SIDECAR_NAME = "dataset_index.json"
+SIDECAR_VERSION = 1
+# Upper line-count bounds of difficulty buckets 1..4; anything longer is bucket 5.
+DIFFICULTY_EDGES = [30, 60, 90, 120]
+
+
+def count_lines(code: str) -> int:
+    if not code:
+        return 0
+    if "\n" not in code and "\\n" in code:
+        code = code.replace("\\r\\n", "\n").replace("\\n", "\n").replace("\\r", "\n")
+    code = code.replace("\r\n", "\n").replace("\r", "\n")
+    return len(code.split("\n")) if code else 0
+
+
+def difficulty_bucket(line_count: int) -> str:
+    for bucket, edge in enumerate(DIFFICULTY_EDGES, start=1):
+        if line_count < edge:
+            return str(bucket)
+    return str(len(DIFFICULTY_EDGES) + 1)
+
+
+def default_sidecar_path(dataset_path: Path) -> Path:
+    return dataset_path.with_name(SIDECAR_NAME)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def build_index(dataset_path: Path, raw: Optional[bytes] = None) -> Dict[str, object]:
+    if raw is None:
+        raw = dataset_path.read_bytes()
+    stat = dataset_path.stat()
+    data = json.loads(raw.decode("utf-8"))
+    records: Dict[str, Dict[str, object]] = {}
+    for idx, sample in enumerate(data, start=1):
+        design = sample.get("design") or ""
+        line_count = count_lines(design)
+        records[str(idx)] = {
+            "grammar": sample.get("grammar"),
+            "domain": sample.get("domain"),
+            "line_count": line_count,
+            "difficulty": difficulty_bucket(line_count),
+            "nl_length": len(sample.get("nl") or ""),
+            "design_sha256": _sha256(design.encode("utf-8")),
+        }
+    return {
+        "version": SIDECAR_VERSION,
+        "source": {
+            "path": str(dataset_path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": _sha256(raw),
+        },
+        "difficulty_edges": DIFFICULTY_EDGES,
+        "records": records,
+    }
+
+
+def _write_sidecar(path: Path, index: Dict[str, object]) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def load_dataset_index(
+    dataset_path: Path = DEFAULT_DATASET_PATH,
+    sidecar_path: Optional[Path] = None,
+    rebuild: bool = False,
+) -> Dict[int, Dict[str, object]]:
+    """Return {id: metadata}, (re)building the sidecar only when dataset.json changed."""
+    dataset_path = Path(dataset_path).resolve()
+    sidecar_path = sidecar_path or default_sidecar_path(dataset_path)
+    stat = dataset_path.stat()
+    index: Optional[Dict[str, object]] = None
+    if not rebuild and sidecar_path.exists():
+        try:
+            index = json.loads(sidecar_path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            index = None
+    if index is not None and (
+        index.get("version") != SIDECAR_VERSION or index.get("difficulty_edges") != DIFFICULTY_EDGES
+    ):
+        index = None
+
+    if index is not None:
+        source = index["source"]
+        if source.get("mtime_ns") != stat.st_mtime_ns or source.get("size") != stat.st_size:
+            raw = dataset_path.read_bytes()
+            if source.get("sha256") == _sha256(raw):
+                source.update({"mtime_ns": stat.st_mtime_ns, "size": stat.st_size})
+                _write_sidecar(sidecar_path, index)
+            else:
+                index = build_index(dataset_path, raw)
+                _write_sidecar(sidecar_path, index)
+    else:
+        index = build_index(dataset_path)
+        _write_sidecar(sidecar_path, index)
+
+    return {int(key): value for key, value in index["records"].items()}
+
+
+def group_ids(records: Dict[int, Dict[str, object]], field: str) -> Dict[str, List[int]]:
+    """{field value: [ids]} in id order (first-seen key order)."""
+    result: Dict[str, List[int]] = {}
+    for model_id in sorted(records):
+        result.setdefault(str(records[model_id][field]), []).append(model_id)
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build/refresh the dataset.json metadata sidecar.")
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        default=DEFAULT_DATASET_PATH,
+        help="Path to SysMBench dataset.json (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--sidecar",
+        type=Path,
+        default=None,
+        help=f"Sidecar output path (default: <dataset-dir>/{SIDECAR_NAME}).",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild even if the sidecar is current.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    records = load_dataset_index(args.dataset, args.sidecar, rebuild=args.rebuild)
+    sidecar = args.sidecar or default_sidecar_path(args.dataset.resolve())
+    buckets = group_ids(records, "difficulty")
+    distribution = ", ".join(f"{key}:{len(buckets[key])}" for key in sorted(buckets))
+    print(f"[dataset-index] {len(records)} samples -> {sidecar} (difficulty {distribution})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Grouped precision/recall/F1 breakdowns over any combination of dimensions.
+
+Scores come from the score index (score_index.py) and per-sample metadata from
+the dataset sidecar (dataset_index.py); both are loaded once into one SQLite
+connection and every breakdown is a single GROUP BY over their join.
+
+Dimensions: root, provider, grammar, domain, difficulty.
+
+Examples:
+    # provider x difficulty across every API-loop root
+    python evaluation_scripts/get_breakdown_metrics.py \\
+        --scores-root api_loop/Generated_from_Prompts_API_LOOP_* --by provider difficulty
+
+    # the classic grammar/domain/difficult_result.json files for each root
+    python evaluation_scripts/get_breakdown_metrics.py \\
+        --scores-root ai_agent/Generated_from_Prompts_AI_AGENT --compat
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+
+from dataset_index import DEFAULT_DATASET_PATH, load_dataset_index  # noqa: E402
+from score_index import (  # noqa: E402
+    DEFAULT_INDEX_PATH,
+    PRECISION_SUFFIX,
+    RECALL_SUFFIX,
+    SCORES_QUERY,
+    ScoreIndex,
+)
+
+DIMENSIONS = ("root", "provider", "grammar", "domain", "difficulty")
+# Legacy single-dimension outputs written by --compat, per root.
+COMPAT_OUTPUTS = {
+    "grammar": "grammar_result.json",
+    "domain": "domain_result.json",
+    "difficulty": "difficult_result.json",
+}
+
+
+def detect_default_scores_root() -> Path:
+    candidates = [
+        REPO_ROOT / "ai_agent" / "Generated_from_Prompts_AI_AGENT",
+        REPO_ROOT / "api_loop" / "Generated_from_Prompts_API_LOOP_OPENAI",
+    ]
+    for path in candidates:
+        if path.exists():
+            return path
+    return candidates[0]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compute grouped judge metrics.")
+    parser.add_argument(
+        "--scores-root",
+        type=Path,
+        nargs="+",
+        default=[detect_default_scores_root()],
+        help="Generated outputs roots containing per-id score JSON files.",
+    )
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        default=DEFAULT_DATASET_PATH,
+        help="Path to SysMBench dataset.json (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=DEFAULT_INDEX_PATH,
+        help="Score index path (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--precision-suffix",
+        default=PRECISION_SUFFIX,
+        help="Filename suffix for precision results (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--recall-suffix",
+        default=RECALL_SUFFIX,
+        help="Filename suffix for recall results (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--by",
+        nargs="+",
+        choices=DIMENSIONS,
+        default=["provider"],
+        help="Dimensions to group by (default: provider).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write the grouped rows to this .json or .csv file.",
+    )
+    parser.add_argument(
+        "--compat",
+        action="store_true",
+        help=(
+            "Also write grammar_result.json, domain_result.json and difficult_result.json "
+            "to <scores-root-parent>/analysis/ for every root."
+        ),
+    )
+    args = parser.parse_args()
+    if len(set(args.by)) != len(args.by):
+        raise SystemExit("--by dimensions must be unique")
+    return args
+
+
+def load_tables(
+    index: ScoreIndex,
+    dataset_path: Path,
+    precision_suffix: str = PRECISION_SUFFIX,
+    recall_suffix: str = RECALL_SUFFIX,
+) -> None:
+    """Materialise `metadata` and `id_scores` temp tables on the index connection."""
+    records = load_dataset_index(dataset_path)
+    conn = index.conn
+    conn.execute("DROP TABLE IF EXISTS temp.metadata")
+    conn.execute(
+        "CREATE TEMP TABLE metadata ("
+        "model_id INTEGER PRIMARY KEY, grammar TEXT, domain TEXT, difficulty TEXT, line_count INTEGER)"
+    )
+    conn.executemany(
+        "INSERT INTO metadata VALUES (?, ?, ?, ?, ?)",
+        [
+            (model_id, meta["grammar"], meta["domain"], meta["difficulty"], meta["line_count"])
+            for model_id, meta in records.items()
+        ],
+    )
+    conn.execute("DROP TABLE IF EXISTS temp.id_scores")
+    conn.execute(f"CREATE TEMP TABLE id_scores AS {SCORES_QUERY}", (recall_suffix, precision_suffix))
+
+
+def breakdown(index: ScoreIndex, roots: Sequence[Path], dims: Sequence[str]) -> List[Dict[str, object]]:
+    """One GROUP BY over scores x metadata.
+
+    Groups are ordered like the legacy scripts: by the first dataset id carrying
+    the group's metadata values, taken over every metadata row rather than the
+    scored ids only, then by the first scored id.
+    """
+    columns = [f"s.{dim}" if dim in ("root", "provider") else f"m.{dim}" for dim in dims]
+    select_dims = "".join(f"{col} AS {dim}, " for col, dim in zip(columns, dims))
+    group_by = f"GROUP BY {', '.join(columns)}" if columns else ""
+    meta_dims = [dim for dim in dims if dim not in ("root", "provider")]
+    first_join = ""
+    first_meta = "NULL"
+    if meta_dims:
+        first_join = (
+            f"JOIN (SELECT {', '.join(meta_dims)}, MIN(model_id) AS first_id "
+            f"FROM metadata GROUP BY {', '.join(meta_dims)}) f ON "
+            + " AND ".join(f"f.{dim} IS m.{dim}" for dim in meta_dims)
+            + " "
+        )
+        first_meta = "MIN(f.first_id)"
+    root_list = [str(Path(root).resolve()) for root in roots]
+    sql = (
+        f"SELECT {select_dims}"
+        "SUM(s.precision) / COUNT(*) AS precision, "
+        "SUM(s.recall) / COUNT(*) AS recall, "
+        "AVG(s.f1) AS f1, "
+        "COUNT(*) AS count, "
+        f"{first_meta} AS first_meta_id, "
+        "MIN(s.model_id) AS first_id "
+        "FROM id_scores s JOIN metadata m ON m.model_id = s.model_id "
+        f"{first_join}"
+        f"WHERE s.root IN ({', '.join('?' for _ in root_list)}) "
+        f"{group_by} ORDER BY first_meta_id, first_id"
+    )
+    rows = [dict(row) for row in index.conn.execute(sql, root_list)]
+    for row in rows:
+        row.pop("first_meta_id")
+        row.pop("first_id")
+    if "difficulty" in dims:
+        rows.sort(key=lambda row: str(row["difficulty"]))
+    return rows
+
+
+def write_compat(index: ScoreIndex, root: Path, shared_parent: bool) -> None:
+    # Roots that share a parent (e.g. several API-loop providers) get their own subdirectory.
+    analysis_dir = root.parent / "analysis"
+    if shared_parent:
+        analysis_dir = analysis_dir / root.name
+    analysis_dir.mkdir(parents=True, exist_ok=True)
+    for dim, filename in COMPAT_OUTPUTS.items():
+        result = {
+            str(row[dim]): {"precision": row["precision"], "recall": row["recall"], "count": row["count"]}
+            for row in breakdown(index, [root], [dim])
+        }
+        result_path = analysis_dir / filename
+        result_path.write_text(json.dumps(result, ensure_ascii=False, indent=4), encoding="utf-8")
+        print(f"[compat] {dim} metrics saved to {result_path}")
+
+
+def write_rows(path: Path, rows: List[Dict[str, object]], dims: Sequence[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == ".csv":
+        with path.open("w", encoding="utf-8", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=[*dims, "precision", "recall", "f1", "count"])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        path.write_text(json.dumps(rows, ensure_ascii=False, indent=4), encoding="utf-8")
+
+
+def print_rows(rows: List[Dict[str, object]], dims: Sequence[str]) -> None:
+    widths = {dim: max([len(dim)] + [len(str(row[dim])) for row in rows]) for dim in dims}
+    header = "  ".join(dim.ljust(widths[dim]) for dim in dims)
+    print(f"{header}  precision  recall  f1      count")
+    for row in rows:
+        keys = "  ".join(str(row[dim]).ljust(widths[dim]) for dim in dims)
+        f1 = "nan" if row["f1"] is None else f"{row['f1']:.4f}"
+        print(f"{keys}  {row['precision']:.4f}     {row['recall']:.4f}  {f1:<6}  {row['count']}")
+
+
+def main() -> None:
+    args = parse_args()
+    roots = [root.resolve() for root in args.scores_root]
+    with ScoreIndex(args.index) as index:
+        index.refresh(roots, args.precision_suffix, args.recall_suffix)
+        load_tables(index, args.dataset, args.precision_suffix, args.recall_suffix)
+        rows = breakdown(index, roots, args.by)
+        if args.compat:
+            parents = [root.parent for root in roots]
+            for root in roots:
+                write_compat(index, root, parents.count(root.parent) > 1)
+    print_rows(rows, args.by)
+    if args.output is not None:
+        write_rows(args.output, rows, args.by)
+        print(f"Breakdown saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
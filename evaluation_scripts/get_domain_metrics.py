@@ -1,17 +1,14 @@
 #!/usr/bin/env python3
 import argparse
 import json
-import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent
 
-SCORE_RE = re.compile(
-    r"Score:\s*[*_\s]*\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)\s*[*_\s]*",
-    re.IGNORECASE | re.DOTALL,
-)
+from dataset_index import group_ids, load_dataset_index  # noqa: E402
+from score_index import DEFAULT_INDEX_PATH, PRECISION_SUFFIX, RECALL_SUFFIX, load_score_pairs  # noqa: E402
 
 
 def detect_default_dataset_path() -> Path:
@@ -51,6 +48,22 @@ def parse_args() -> argparse.Namespace:
         default=default_scores,
         help="Generated outputs root containing per-id score JSON files (default: %(default)s).",
     )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=DEFAULT_INDEX_PATH,
+        help="Score index path (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--precision-suffix",
+        default=PRECISION_SUFFIX,
+        help="Filename suffix for precision results (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--recall-suffix",
+        default=RECALL_SUFFIX,
+        help="Filename suffix for recall results (default: %(default)s).",
+    )
     parser.add_argument(
         "--output",
         type=Path,
@@ -62,53 +75,19 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def extract_score(payload: Dict) -> Optional[Tuple[float, float, float]]:
-    response = payload.get("response") or {}
-    text = response.get("response_text") or ""
-    text = text.replace("**\n", "** ").replace("**  ", "** ")
-    match = SCORE_RE.search(text)
-    if not match:
-        return None
-    num = float(match.group(1))
-    denom = float(match.group(2))
-    if denom == 0:
-        return None
-    return num / denom, num, denom
-
-
-def load_scores_for_id(root: Path, model_id: int) -> Optional[Tuple[float, float]]:
-    model_dir = root / str(model_id)
-    p_path = model_dir / f"{model_id}_precision_gpt41.json"
-    r_path = model_dir / f"{model_id}_recall_gpt41.json"
-    if not (p_path.exists() and r_path.exists()):
-        return None
-    try:
-        p_score = extract_score(json.loads(p_path.read_text(encoding="utf-8")))
-        r_score = extract_score(json.loads(r_path.read_text(encoding="utf-8")))
-    except json.JSONDecodeError:
-        return None
-    if not p_score or not r_score:
-        return None
-    return p_score[0], r_score[0]
-
-
 def get_domain_id(dataset_path: Path) -> Dict[str, List[int]]:
-    with dataset_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    result: Dict[str, List[int]] = {}
-    for idx, sample in enumerate(data, start=1):
-        domain = sample["domain"]
-        result.setdefault(domain, []).append(idx)
-    return result
+    return group_ids(load_dataset_index(dataset_path), "domain")
 
 
-def get_metrics_various_domain(domain2sampleid: Dict[str, List[int]], scores_root: Path) -> Dict:
+def get_metrics_various_domain(
+    domain2sampleid: Dict[str, List[int]], scores: Dict[int, Tuple[float, float]]
+) -> Dict:
     domain_result = {}
     for domain, sample_id_list in domain2sampleid.items():
         totals = {"precision": 0.0, "recall": 0.0}
         count = 0
         for sample_id in sample_id_list:
-            pair = load_scores_for_id(scores_root, sample_id)
+            pair = scores.get(sample_id)
             if pair is None:
                 continue
             prec, rec = pair
@@ -135,7 +114,7 @@ def main() -> None:
         result_path = args.output.resolve()
 
     domain2sampleid = get_domain_id(dataset_path)
-    result = get_metrics_various_domain(domain2sampleid, scores_root)
+    result = get_metrics_various_domain(domain2sampleid, load_score_pairs(scores_root, args.index, args.precision_suffix, args.recall_suffix))
     result_path.parent.mkdir(parents=True, exist_ok=True)
     result_path.write_text(json.dumps(result, ensure_ascii=False, indent=4), encoding="utf-8")
     print(f"Domain metrics saved to {result_path} (from {scores_root})")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Persistent on-disk cache for LLM-judge responses.
+
+Entries are keyed on (judge model, temperature, template hash, reference hash,
+generated hash) plus an optional variant tag, and stored one JSON file per key
+under <cache-root>/<key[:2]>/<key>.json. Payloads always carry `response_text`
+so any judge front-end can reuse an entry written by another.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_ROOT = SCRIPT_DIR / ".judge_cache"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class JudgeCache:
+    def __init__(self, root: Path = DEFAULT_CACHE_ROOT, enabled: bool = True) -> None:
+        self.root = Path(root)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: Optional[float],
+        template_text: str,
+        reference_text: str,
+        generated_text: str,
+        variant: str = "",
+    ) -> Dict[str, object]:
+        fields: Dict[str, object] = {
+            "model": model,
+            "temperature": temperature,
+            "template_sha256": text_hash(template_text),
+            "reference_sha256": text_hash(reference_text),
+            "generated_sha256": text_hash(generated_text),
+        }
+        if variant:
+            fields["variant"] = variant
+        fields["key"] = text_hash(json.dumps(fields, sort_keys=True))
+        return fields
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key_fields: Dict[str, object]) -> Optional[Dict[str, object]]:
+        if not self.enabled:
+            return None
+        path = self._path(str(key_fields["key"]))
+        payload: Optional[Dict[str, object]] = None
+        if path.exists():
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+                if isinstance(entry.get("payload"), dict):
+                    payload = entry["payload"]
+            except (json.JSONDecodeError, OSError):
+                payload = None
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return payload
+
+    def put(self, key_fields: Dict[str, object], payload: Dict[str, object]) -> None:
+        if not self.enabled:
+            return
+        path = self._path(str(key_fields["key"]))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"key_fields": key_fields, "payload": payload}, indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.writes += 1
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100.0) if lookups else 0.0
+        state = "" if self.enabled else " (disabled)"
+        return (
+            f"[cache] hits={self.hits} misses={self.misses} writes={self.writes} "
+            f"hit_rate={rate:.1f}% root={self.root}{state}"
+        )
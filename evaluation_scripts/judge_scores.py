@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Shared parsing/validation of LLM-judge precision/recall scores.
+
+Two reply formats are understood:
+  * structured JSON (judge format `json`): matched/unmatched element lists plus
+    numerator/denominator, requested with a strict JSON schema;
+  * free text (judge format `text`): the `Score: X/Y` line, tolerant of
+    markdown bold/italics around the numbers.
+
+`extract_score` tries the structured form first, then the text form, so every
+summary script reads old and new judge outputs alike.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+SCORE_RE = re.compile(
+    r"Score:\s*[*_\s]*\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)\s*[*_\s]*",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Strict pattern of the original summarize_gpt41_scores.py: no markdown between
+# `Score:` and the fraction. Kept so its published summaries regenerate unchanged.
+LEGACY_SCORE_RE = re.compile(r"Score:\s*(\d+(?:\.\d+)?)/(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+JUDGE_FORMATS = ("text", "json")
+
+JUDGE_SCORE_SCHEMA: Dict[str, object] = {
+    "type": "object",
+    "properties": {
+        "matched_elements": {"type": "array", "items": {"type": "string"}},
+        "unmatched_elements": {"type": "array", "items": {"type": "string"}},
+        "numerator": {"type": "integer"},
+        "denominator": {"type": "integer"},
+    },
+    "required": ["matched_elements", "unmatched_elements", "numerator", "denominator"],
+    "additionalProperties": False,
+}
+
+STRUCTURED_OUTPUT_INSTRUCTIONS = """
+
+Instead of the `Score:` line, reply with a single JSON object:
+  matched_elements: the atomic claims/elements judged as matched (one short string each)
+  unmatched_elements: the remaining atomic claims/elements
+  numerator: number of matched elements (= len(matched_elements))
+  denominator: total number of elements (= numerator + len(unmatched_elements))
+"""
+
+
+def openai_text_format() -> Dict[str, object]:
+    """`text=` argument for the OpenAI Responses API in structured mode."""
+    return {
+        "format": {
+            "type": "json_schema",
+            "name": "judge_score",
+            "schema": JUDGE_SCORE_SCHEMA,
+            "strict": True,
+        }
+    }
+
+
+def _strip_code_fence(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def validate_structured(data: object) -> Optional[Dict[str, object]]:
+    """Return a normalised structured score, or None if it is inconsistent."""
+    if not isinstance(data, dict):
+        return None
+    matched = data.get("matched_elements")
+    unmatched = data.get("unmatched_elements", [])
+    numerator = data.get("numerator")
+    denominator = data.get("denominator")
+    if not isinstance(matched, list) or not isinstance(unmatched, list):
+        return None
+    if isinstance(numerator, bool) or isinstance(denominator, bool):
+        return None
+    if not isinstance(numerator, int) or not isinstance(denominator, int):
+        return None
+    if denominator <= 0 or not 0 <= numerator <= denominator:
+        return None
+    if len(matched) != numerator or len(matched) + len(unmatched) != denominator:
+        return None
+    return {
+        "matched_elements": [str(item) for item in matched],
+        "unmatched_elements": [str(item) for item in unmatched],
+        "numerator": numerator,
+        "denominator": denominator,
+    }
+
+
+def parse_structured_text(text: str) -> Optional[Dict[str, object]]:
+    try:
+        data = json.loads(_strip_code_fence(text))
+    except (json.JSONDecodeError, ValueError):
+        return None
+    return validate_structured(data)
+
+
+def parse_score_text(text: str, legacy: bool = False) -> Optional[Tuple[float, float]]:
+    if legacy:
+        match = LEGACY_SCORE_RE.search(text)
+    else:
+        text = text.replace("**\n", "** ").replace("**  ", "** ")
+        match = SCORE_RE.search(text)
+    if not match:
+        return None
+    num = float(match.group(1))
+    denom = float(match.group(2))
+    if denom == 0:
+        return None
+    return num, denom
+
+
+def parse_response_text(
+    text: str, judge_format: str = "text", legacy: bool = False
+) -> Optional[Dict[str, object]]:
+    """Parse a raw judge reply; returns {numerator, denominator, ...} or None."""
+    structured = parse_structured_text(text)
+    if structured is not None:
+        return structured
+    if judge_format == "json":
+        return None
+    parsed = parse_score_text(text, legacy=legacy)
+    if parsed is None:
+        return None
+    return {"numerator": parsed[0], "denominator": parsed[1]}
+
+
+def extract_score(payload: Dict, legacy: bool = False) -> Optional[Tuple[float, float, float]]:
+    """
+    Return (score, numerator, denominator) for a judge output record, or None.
+
+    With `legacy`, text replies are matched with LEGACY_SCORE_RE only.
+    """
+    response = payload.get("response") or {}
+    structured = validate_structured(response.get("structured"))
+    if structured is None:
+        structured = parse_response_text(str(response.get("response_text") or ""), legacy=legacy)
+    if structured is None:
+        return None
+    num = float(structured["numerator"])
+    denom = float(structured["denominator"])
+    return num / denom, num, denom
+
+
+def matched_elements(payload: Dict) -> Optional[List[str]]:
+    """Matched element list from a structured judge record (None for text replies)."""
+    response = payload.get("response") or {}
+    structured = validate_structured(response.get("structured"))
+    if structured is None:
+        structured = parse_structured_text(str(response.get("response_text") or ""))
+    return None if structured is None else list(structured["matched_elements"])
@@ -6,31 +6,66 @@ For every model directory (default: Generated_from_Prompts/1..75) we:
   * Load the generated SysML file (e.g., 12/12.sysml)
   * Load the reference SysML file (e.g., 12/12_groundtruth.sysml or from samples)
   * Format the precision/recall prompts from sysm-eval-p.txt and sysm-eval-r.txt
-  * Call GPT-4.1 with each prompt
+  * Call GPT-4.1 with each prompt (bounded concurrency, transient errors retried
+    with backoff + jitter)
   * Save the prompt + raw response JSON alongside the models
 
+Outputs that already hold a judge response are skipped unless --force is set,
+so an interrupted run can simply be restarted. Judge responses are also kept in
+a persistent cache (judge_cache.py) keyed on model, temperature and the
+template/reference/generated text hashes, so unchanged pairs are never re-paid.
+
+Several --generated-root values can be swept in one run: jobs from all roots
+are pooled, identical (template, reference, candidate) pairs are judged once,
+and the result is written to every root that needs it.
+
+Every reply is validated locally (judge_scores.py); unparsable replies are
+re-asked up to --max-reasks times. `--judge-format json` requests
+schema-constrained JSON (matched/unmatched elements, numerator, denominator)
+instead of the free-text `Score: X/Y` line.
+
 Usage example:
     OPENAI_API_KEY=... python run_sysml_gpt41_eval.py \\
         --generated-root ai_agent/Generated_from_Prompts_AI_AGENT \\
         --reference-root ai_agent/Generated_from_Prompts_AI_AGENT \\
         --precision-prompt evaluation_scripts/Evaluation_Prompts/sysm-eval-p.txt \\
         --recall-prompt evaluation_scripts/Evaluation_Prompts/sysm-eval-r.txt \\
-        --start-id 1 --end-id 75 --skip 7 13
+        --start-id 1 --end-id 75 --skip 7 13 --concurrency 8
+
+Sweep example (each root is its own reference root):
+    OPENAI_API_KEY=... python run_sysml_gpt41_eval.py \\
+        --generated-root api_loop/Generated_from_Prompts_API_LOOP_* \\
+            ai_agent/Generated_from_Prompts_AI_AGENT \\
+        --start-id 1 --end-id 151
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
+import random
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent
 
+from judge_cache import DEFAULT_CACHE_ROOT, JudgeCache  # noqa: E402
+from judge_scores import (  # noqa: E402
+    JUDGE_FORMATS,
+    STRUCTURED_OUTPUT_INSTRUCTIONS,
+    extract_score,
+    openai_text_format,
+    parse_response_text,
+)
+
 try:
-    from openai import OpenAI
+    from openai import APIConnectionError, OpenAI
 except ImportError as exc:  # pragma: no cover - make the error explicit for the user
     raise SystemExit(
         "The openai package is required. Install it via `pip install openai`."
@@ -43,14 +78,21 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--generated-root",
         type=Path,
-        default=default_generated,
-        help="Directory containing generated model subdirectories (default: %(default)s).",
+        nargs="+",
+        default=[default_generated],
+        help=(
+            "One or more directories containing generated model subdirectories "
+            f"(default: {default_generated})."
+        ),
     )
     parser.add_argument(
         "--reference-root",
         type=Path,
-        default=default_generated,
-        help="Directory containing reference/ground-truth subdirectories (default: %(default)s).",
+        default=None,
+        help=(
+            "Directory containing reference/ground-truth subdirectories "
+            "(default: each generated root is its own reference root)."
+        ),
     )
     parser.add_argument(
         "--precision-prompt",
@@ -99,7 +141,88 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="If set, do not call GPT-4.1. Prompts are still rendered and saved.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Concurrent judge calls across (ID x precision/recall) jobs (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-evaluate even if the output JSON already holds a judge response.",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=6,
+        help="Retries per judge call after a failed request (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--retry-backoff-seconds",
+        type=float,
+        default=2.0,
+        help="Base delay before retrying a failed call (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--retry-max-backoff-seconds",
+        type=float,
+        default=60.0,
+        help="Maximum retry delay (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--request-timeout-seconds",
+        type=float,
+        default=120.0,
+        help="Per-request timeout for judge calls (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--judge-format",
+        choices=JUDGE_FORMATS,
+        default="text",
+        help=(
+            "Judge reply format: free-text `Score: X/Y` or schema-constrained JSON "
+            "(default: %(default)s)."
+        ),
+    )
+    parser.add_argument(
+        "--max-reasks",
+        type=int,
+        default=2,
+        help="Re-ask the judge this many times when a reply cannot be parsed (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_ROOT,
+        help="Persistent judge cache directory (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neither read nor write the judge cache.",
+    )
+    args = parser.parse_args()
+    if args.concurrency <= 0:
+        raise SystemExit("--concurrency must be > 0")
+    if args.max_retries < 0:
+        raise SystemExit("--max-retries must be >= 0")
+    if args.max_reasks < 0:
+        raise SystemExit("--max-reasks must be >= 0")
+    return args
+
+
+@dataclass(frozen=True)
+class EvalJob:
+    root: Path
+    model_id: int
+    label: str
+    prompt_file: Path
+    prompt: str
+    reference_path: Path
+    generated_path: Path
+    output_path: Path
+    cache_key: Dict[str, object]
 
 
 def detect_default_generated_root() -> Path:
@@ -161,92 +284,301 @@ def extract_text_from_response(response) -> str:
     return "\n".join(text_chunks).strip()
 
 
+def usage_from_payload(payload: Dict[str, object]) -> Dict[str, int]:
+    usage = payload.get("usage") or {}
+    if not isinstance(usage, dict):
+        usage = {}
+    input_tokens = int(usage.get("input_tokens") or 0)
+    output_tokens = int(usage.get("output_tokens") or 0)
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": int(usage.get("total_tokens") or 0) or input_tokens + output_tokens,
+    }
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Connection errors, timeouts, 408/409/429 and 5xx; other errors (auth, bad request) fail at once."""
+    if isinstance(exc, (APIConnectionError, ConnectionError, TimeoutError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status in (408, 409, 429) or status >= 500)
+
+
 def call_model(
     client: Optional[OpenAI],
     prompt: str,
     model: str,
     temperature: float,
     dry_run: bool,
+    max_retries: int = 0,
+    retry_backoff_seconds: float = 2.0,
+    retry_max_backoff_seconds: float = 60.0,
+    timeout_seconds: Optional[float] = None,
+    label: str = "",
+    text_format: Optional[Dict[str, object]] = None,
 ) -> Dict[str, object]:
     if dry_run:
         return {
             "dry_run": True,
             "response_text": "",
         }
-    response = client.responses.create(
-        model=model,
-        input=prompt,
-        temperature=temperature,
-    )
+    request_kwargs: Dict[str, object] = {
+        "model": model,
+        "input": prompt,
+        "temperature": temperature,
+    }
+    if timeout_seconds is not None:
+        request_kwargs["timeout"] = timeout_seconds
+    if text_format is not None:
+        request_kwargs["text"] = text_format
+    for attempt in range(1, max_retries + 2):
+        try:
+            response = client.responses.create(**request_kwargs)
+            break
+        except Exception as exc:
+            if attempt > max_retries or not is_retryable(exc):
+                raise
+            backoff = min(retry_max_backoff_seconds, retry_backoff_seconds * (2 ** (attempt - 1)))
+            delay = backoff + random.uniform(0.0, backoff / 2)
+            print(
+                f"[retry] {label} attempt {attempt}/{max_retries + 1} failed ({exc}); "
+                f"retrying in {delay:.2f}s"
+            )
+            time.sleep(delay)
     response_dict = response.model_dump()
     response_dict["response_text"] = extract_text_from_response(response)
     return response_dict
 
 
 def write_json(path: Path, payload: Dict[str, object]) -> None:
-    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False))
+    # Write-then-rename so an interrupted run never leaves a truncated output behind.
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False))
+    os.replace(tmp_path, path)
+
+
+def has_judge_output(path: Path) -> bool:
+    """True when `path` holds a completed (non dry-run) judge response with a parsable score."""
+    if not path.exists():
+        return False
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        return False
+    response = payload.get("response")
+    if not isinstance(response, dict) or response.get("dry_run"):
+        return False
+    return extract_score(payload) is not None
 
 
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def main() -> None:
-    args = parse_args()
+def build_jobs(args: argparse.Namespace) -> List[EvalJob]:
     precision_template = load_text(args.precision_prompt)
     recall_template = load_text(args.recall_prompt)
-
-    client = None if args.dry_run else OpenAI()
+    if args.judge_format == "json":
+        precision_template += STRUCTURED_OUTPUT_INSTRUCTIONS
+        recall_template += STRUCTURED_OUTPUT_INSTRUCTIONS
+    cache_variant = "" if args.judge_format == "text" else args.judge_format
     skip_set = set(args.skip)
+    jobs: List[EvalJob] = []
+
+    for generated_root in args.generated_root:
+        reference_root = args.reference_root or generated_root
+        for model_id in range(args.start_id, args.end_id + 1):
+            if model_id in skip_set:
+                continue
+
+            generated_dir = generated_root / str(model_id)
+            if not generated_dir.exists():
+                print(f"[warn] Generated dir missing for model {model_id}: {generated_dir}")
+                continue
+
+            try:
+                generated_path = find_generated_file(generated_dir, model_id)
+                reference_path = find_reference_file(reference_root, model_id)
+            except FileNotFoundError as exc:
+                print(f"[warn] {exc}")
+                continue
+
+            generated_text = load_text(generated_path)
+            reference_text = load_text(reference_path)
+
+            for label, template, prompt_file, output_path in (
+                (
+                    "precision",
+                    precision_template,
+                    args.precision_prompt,
+                    generated_dir / f"{model_id}_precision_gpt41.json",
+                ),
+                (
+                    "recall",
+                    recall_template,
+                    args.recall_prompt,
+                    generated_dir / f"{model_id}_recall_gpt41.json",
+                ),
+            ):
+                jobs.append(
+                    EvalJob(
+                        root=generated_root,
+                        model_id=model_id,
+                        label=label,
+                        prompt_file=prompt_file,
+                        prompt=template.format(
+                            reference_model=reference_text, generated_model=generated_text
+                        ),
+                        reference_path=reference_path,
+                        generated_path=generated_path,
+                        output_path=output_path,
+                        cache_key=JudgeCache.make_key(
+                            args.model,
+                            args.temperature,
+                            template,
+                            reference_text,
+                            generated_text,
+                            variant=cache_variant,
+                        ),
+                    )
+                )
+    return jobs
+
+
+def group_jobs(jobs: Iterable[EvalJob]) -> List[List[EvalJob]]:
+    """Collapse jobs with identical (template, reference, candidate) into one judge call."""
+    groups: Dict[str, List[EvalJob]] = {}
+    for job in jobs:
+        groups.setdefault(str(job.cache_key["key"]), []).append(job)
+    return list(groups.values())
+
+
+def job_label(job: EvalJob) -> str:
+    return f"{job.root.name}/{job.model_id} {job.label}"
+
+
+def run_group(
+    client: Optional[OpenAI],
+    args: argparse.Namespace,
+    group: List[EvalJob],
+    cache: JudgeCache,
+) -> Dict[str, int]:
+    """Judge one unique pair and write it to every job in the group.
+
+    Returns the tokens actually spent (zero on a cache hit).
+    """
+    lead = group[0]
+    fanout = f" (+{len(group) - 1} duplicate(s))" if len(group) > 1 else ""
+    spent = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+    response_payload = None if args.dry_run else cache.get(lead.cache_key)
+    parsed = None
+    if response_payload is not None:
+        parsed = parse_response_text(str(response_payload.get("response_text") or ""), args.judge_format)
+        if parsed is not None:
+            print(f"[cache] {job_label(lead)}{fanout}")
+    text_format = openai_text_format() if args.judge_format == "json" else None
+    attempt = 0
+    while parsed is None:
+        if attempt == 0:
+            print(f"[run] {job_label(lead)}{fanout}")
+        else:
+            print(f"[reask] {job_label(lead)} reply {attempt}/{args.max_reasks + 1} was unparsable")
+        response_payload = call_model(
+            client=client,
+            prompt=lead.prompt,
+            model=args.model,
+            temperature=args.temperature,
+            dry_run=args.dry_run,
+            max_retries=args.max_retries,
+            retry_backoff_seconds=args.retry_backoff_seconds,
+            retry_max_backoff_seconds=args.retry_max_backoff_seconds,
+            timeout_seconds=args.request_timeout_seconds,
+            label=job_label(lead),
+            text_format=text_format,
+        )
+        for key, value in usage_from_payload(response_payload).items():
+            spent[key] += value
+        attempt += 1
+        if args.dry_run:
+            break
+        parsed = parse_response_text(str(response_payload.get("response_text") or ""), args.judge_format)
+        if parsed is None and attempt > args.max_reasks:
+            break
+    if parsed is not None:
+        if "matched_elements" in parsed:
+            response_payload["structured"] = parsed
+        if attempt:
+            cache.put(lead.cache_key, response_payload)
+    usage = usage_from_payload(response_payload)
+    for job in group:
+        ensure_dir(job.output_path.parent)
+        record = {
+            "model_id": job.model_id,
+            "evaluation": job.label,
+            "model": args.model,
+            "temperature": args.temperature,
+            "judge_format": args.judge_format,
+            "prompt_file": str(job.prompt_file),
+            "prompt": job.prompt,
+            "reference_path": str(job.reference_path),
+            "generated_path": str(job.generated_path),
+            "usage": usage,
+            "response": response_payload,
+        }
+        write_json(job.output_path, record)
+    if parsed is None and not args.dry_run:
+        raise ValueError(f"judge reply still unparsable after {attempt} attempt(s); raw reply saved")
+    return spent
 
-    for model_id in range(args.start_id, args.end_id + 1):
-        if model_id in skip_set:
-            print(f"[skip] model {model_id}")
-            continue
 
-        generated_dir = args.generated_root / str(model_id)
-        if not generated_dir.exists():
-            print(f"[warn] Generated dir missing for model {model_id}: {generated_dir}")
-            continue
+def main() -> None:
+    args = parse_args()
+    client = None if args.dry_run else OpenAI()
+    cache = JudgeCache(args.cache_dir, enabled=not args.no_cache)
+
+    jobs = build_jobs(args)
+    pending = [job for job in jobs if args.force or not has_judge_output(job.output_path)]
+    groups = group_jobs(pending)
+    print(
+        f"[plan] {len(jobs)} judge jobs across {len(args.generated_root)} root(s); "
+        f"{len(jobs) - len(pending)} already complete; {len(pending)} pending -> "
+        f"{len(groups)} unique judge call(s) with concurrency {args.concurrency}"
+    )
 
-        try:
-            generated_path = find_generated_file(generated_dir, model_id)
-            reference_path = find_reference_file(args.reference_root, model_id)
-        except FileNotFoundError as exc:
-            print(f"[warn] {exc}")
-            continue
-
-        generated_text = load_text(generated_path)
-        reference_text = load_text(reference_path)
-
-        jobs = [
-            ("precision", precision_template, generated_dir / f"{model_id}_precision_gpt41.json"),
-            ("recall", recall_template, generated_dir / f"{model_id}_recall_gpt41.json"),
-        ]
-
-        for label, template, output_path in jobs:
-            ensure_dir(output_path.parent)
-            prompt = template.format(reference_model=reference_text, generated_model=generated_text)
-            print(f"[run] model {model_id} {label} -> {output_path}")
-            response_payload = call_model(
-                client=client,
-                prompt=prompt,
-                model=args.model,
-                temperature=args.temperature,
-                dry_run=args.dry_run,
+    totals = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+    failures: List[str] = []
+    completed = 0
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        future_to_group = {
+            executor.submit(run_group, client, args, group, cache): group for group in groups
+        }
+        for future in as_completed(future_to_group):
+            group = future_to_group[future]
+            completed += 1
+            try:
+                usage = future.result()
+            except Exception as exc:
+                failures.extend(job_label(job).replace(" ", ":") for job in group)
+                print(f"[fail] {completed}/{len(groups)} {job_label(group[0])}: {exc}")
+                continue
+            for key in totals:
+                totals[key] += usage.get(key, 0)
+            print(
+                f"[done] {completed}/{len(groups)} {job_label(group[0])} "
+                f"-> {len(group)} output(s) tokens={usage['total_tokens']}"
             )
-            record = {
-                "model_id": model_id,
-                "evaluation": label,
-                "model": args.model,
-                "temperature": args.temperature,
-                "prompt_file": str(args.precision_prompt if label == "precision" else args.recall_prompt),
-                "prompt": prompt,
-                "reference_path": str(reference_path),
-                "generated_path": str(generated_path),
-                "response": response_payload,
-            }
-            write_json(output_path, record)
+
+    print(
+        f"[summary] written={len(pending) - len(failures)} failed={len(failures)} "
+        f"skipped_existing={len(jobs) - len(pending)} "
+        f"input_tokens={totals['input_tokens']} output_tokens={totals['output_tokens']} "
+        f"total_tokens={totals['total_tokens']}"
+    )
+    print(cache.summary())
+    if failures:
+        print(f"[summary] failed jobs (re-run to retry): {' '.join(failures)}")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
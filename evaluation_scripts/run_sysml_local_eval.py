@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Deterministic local precision/recall scorer: a free alternative to the GPT-4.1 judge.
+
+For every model directory we parse the reference (`<id>_groundtruth.sysml`) and
+the generated (`<id>.sysml`) model into named/typed elements and align them
+one-to-one (sysml_elements.py):
+
+    precision = matched generated elements / generated elements
+    recall    = matched reference elements / reference elements
+
+Each score is written as `<id>_{precision,recall}_local.json` in the judge's
+structured record shape (`response.structured` with matched/unmatched elements,
+numerator, denominator), so summarize_gpt41_scores.py, score_index.py,
+get_breakdown_metrics.py and the get_{grammar,domain,difficult}_metrics.py
+scripts read them with `--precision-suffix _precision_local.json
+--recall-suffix _recall_local.json`. Files are only rewritten when their content
+changes, so the score index does not re-parse unchanged scores.
+
+After scoring, local and GPT-4.1 scores are joined through the score index and
+their Spearman rank correlation is reported per provider and overall.
+
+Usage:
+    python evaluation_scripts/run_sysml_local_eval.py \\
+        --generated-root api_loop/Generated_from_Prompts_API_LOOP_* ai_agent/Generated_from_Prompts_AI_AGENT \\
+        --report evaluation_scripts/local_vs_gpt41.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+
+from score_index import DEFAULT_INDEX_PATH, PRECISION_SUFFIX, RECALL_SUFFIX, ScoreIndex  # noqa: E402
+from sysml_elements import DEFAULT_THRESHOLD, Alignment, Element, align, extract_elements, spearman  # noqa: E402
+
+LOCAL_MODEL = "local-align-v1"
+LOCAL_PRECISION_SUFFIX = "_precision_local.json"
+LOCAL_RECALL_SUFFIX = "_recall_local.json"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Score SysML precision/recall locally by element alignment.")
+    parser.add_argument(
+        "--generated-root",
+        type=Path,
+        nargs="+",
+        default=default_generated_roots(),
+        help="Roots containing <id>/<id>.sysml (default: every API-loop and AI-agent root).",
+    )
+    parser.add_argument(
+        "--reference-root",
+        type=Path,
+        default=None,
+        help="Root holding <id>/<id>_groundtruth.sysml (default: each generated root is its own reference root).",
+    )
+    parser.add_argument("--start-id", type=int, default=1, help="Smallest model id (default: %(default)s).")
+    parser.add_argument("--end-id", type=int, default=151, help="Largest model id (default: %(default)s).")
+    parser.add_argument("--skip", type=int, nargs="*", default=[], help="Model ids to skip entirely.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Minimum pair similarity counted as a match (default: %(default)s).",
+    )
+    parser.add_argument("--precision-suffix", default=LOCAL_PRECISION_SUFFIX)
+    parser.add_argument("--recall-suffix", default=LOCAL_RECALL_SUFFIX)
+    parser.add_argument(
+        "--judge-precision-suffix",
+        default=PRECISION_SUFFIX,
+        help="Judge precision files to correlate against (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--judge-recall-suffix",
+        default=RECALL_SUFFIX,
+        help="Judge recall files to correlate against (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=DEFAULT_INDEX_PATH,
+        help="Score index path (default: %(default)s).",
+    )
+    parser.add_argument("--report", type=Path, default=None, help="Optional JSON path for the correlation report.")
+    parser.add_argument("--no-correlation", action="store_true", help="Only write the local score files.")
+    return parser.parse_args()
+
+
+def default_generated_roots() -> List[Path]:
+    roots = sorted((REPO_ROOT / "api_loop").glob("Generated_from_Prompts_API_LOOP_*"))
+    roots += sorted((REPO_ROOT / "ai_agent").glob("Generated_from_Prompts_AI_AGENT*"))
+    return [root for root in roots if root.is_dir()]
+
+
+def find_generated_file(model_dir: Path, model_id: int) -> Optional[Path]:
+    preferred = model_dir / f"{model_id}.sysml"
+    if preferred.exists():
+        return preferred
+    for candidate in sorted(model_dir.glob("*.sysml")):
+        if "groundtruth" not in candidate.name.lower():
+            return candidate
+    return None
+
+
+def find_reference_file(reference_root: Path, model_id: int) -> Optional[Path]:
+    candidates = [
+        reference_root / str(model_id) / f"{model_id}_groundtruth.sysml",
+        reference_root / str(model_id) / "design.sysml",
+        reference_root / f"{model_id:02d}" / f"{model_id}_groundtruth.sysml",
+        reference_root / f"{model_id:02d}" / "design.sysml",
+    ]
+    return next((c for c in candidates if c.exists()), None)
+
+
+class ElementCache:
+    """Parsed elements per file content, so shared references are parsed once."""
+
+    def __init__(self) -> None:
+        self._by_sha: Dict[str, List[Element]] = {}
+
+    def get(self, path: Path) -> List[Element]:
+        raw = path.read_bytes()
+        sha = hashlib.sha256(raw).hexdigest()
+        if sha not in self._by_sha:
+            self._by_sha[sha] = extract_elements(raw.decode("utf-8", errors="replace"))
+        return self._by_sha[sha]
+
+
+def structured_score(elements: List[Element], matched: List[int]) -> Optional[Dict[str, object]]:
+    """Judge-shaped structured score; None when there is nothing to score."""
+    if not elements:
+        return None
+    hit = set(matched)
+    return {
+        "matched_elements": [elements[i].describe() for i in sorted(hit)],
+        "unmatched_elements": [e.describe() for i, e in enumerate(elements) if i not in hit],
+        "numerator": len(hit),
+        "denominator": len(elements),
+    }
+
+
+def build_record(
+    model_id: int,
+    evaluation: str,
+    structured: Optional[Dict[str, object]],
+    alignment: Alignment,
+    threshold: float,
+    reference_path: Path,
+    generated_path: Path,
+) -> Dict[str, object]:
+    return {
+        "model_id": model_id,
+        "evaluation": evaluation,
+        "model": LOCAL_MODEL,
+        "judge_format": "json",
+        "threshold": threshold,
+        "reference_path": str(reference_path),
+        "generated_path": str(generated_path),
+        "reference_elements": len(alignment.reference),
+        "generated_elements": len(alignment.generated),
+        "response": {
+            "response_text": json.dumps(structured) if structured is not None else "",
+            "structured": structured,
+        },
+    }
+
+
+def write_if_changed(path: Path, payload: Dict[str, object]) -> bool:
+    text = json.dumps(payload, indent=2, ensure_ascii=False) + "\n"
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except OSError:
+        pass
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+    return True
+
+
+def score_root(
+    root: Path,
+    reference_root: Path,
+    args: argparse.Namespace,
+    cache: ElementCache,
+    stats: Dict[str, int],
+) -> None:
+    skip = set(args.skip)
+    for model_id in range(args.start_id, args.end_id + 1):
+        model_dir = root / str(model_id)
+        if model_id in skip or not model_dir.is_dir():
+            continue
+        generated_path = find_generated_file(model_dir, model_id)
+        reference_path = find_reference_file(reference_root, model_id)
+        if generated_path is None or reference_path is None:
+            stats["missing"] += 1
+            continue
+        alignment = align(cache.get(reference_path), cache.get(generated_path), args.threshold)
+        for evaluation, suffix, elements, matched in (
+            ("precision", args.precision_suffix, alignment.generated, alignment.matched_generated),
+            ("recall", args.recall_suffix, alignment.reference, alignment.matched_reference),
+        ):
+            record = build_record(
+                model_id,
+                evaluation,
+                structured_score(elements, matched),
+                alignment,
+                args.threshold,
+                reference_path,
+                generated_path,
+            )
+            stats["written" if write_if_changed(model_dir / f"{model_id}{suffix}", record) else "unchanged"] += 1
+        stats["pairs"] += 1
+
+
+def correlate(
+    roots: List[Path],
+    args: argparse.Namespace,
+) -> Dict[str, Dict[str, object]]:
+    """Spearman correlation of local vs judge precision/recall/F1, per provider and overall."""
+    with ScoreIndex(args.index) as index:
+        index.refresh(roots, args.precision_suffix, args.recall_suffix)
+        index.refresh(roots, args.judge_precision_suffix, args.judge_recall_suffix)
+        local = {(r["root"], r["model_id"]): r for r in index.scores(roots, args.precision_suffix, args.recall_suffix)}
+        judge = {
+            (r["root"], r["model_id"]): r
+            for r in index.scores(roots, args.judge_precision_suffix, args.judge_recall_suffix)
+        }
+    groups: Dict[str, List[Tuple[object, object]]] = {}
+    for key in sorted(set(local) & set(judge)):
+        pair = (local[key], judge[key])
+        groups.setdefault(local[key]["provider"], []).append(pair)
+        groups.setdefault("ALL", []).append(pair)
+
+    report: Dict[str, Dict[str, object]] = {}
+    for group, pairs in groups.items():
+        entry: Dict[str, object] = {"n": len(pairs)}
+        for metric in ("precision", "recall", "f1"):
+            both = [(lo[metric], ju[metric]) for lo, ju in pairs if lo[metric] is not None and ju[metric] is not None]
+            entry[f"spearman_{metric}"] = spearman([b[0] for b in both], [b[1] for b in both])
+            entry[f"local_mean_{metric}"] = sum(b[0] for b in both) / len(both) if both else float("nan")
+            entry[f"judge_mean_{metric}"] = sum(b[1] for b in both) / len(both) if both else float("nan")
+        report[group] = entry
+    return report
+
+
+def main() -> None:
+    args = parse_args()
+    roots = [root.resolve() for root in args.generated_root]
+    if not roots:
+        raise SystemExit("No generated roots found")
+
+    started = time.perf_counter()
+    cache = ElementCache()
+    stats = {"pairs": 0, "written": 0, "unchanged": 0, "missing": 0}
+    for root in roots:
+        score_root(root, (args.reference_root or root).resolve(), args, cache, stats)
+    elapsed = time.perf_counter() - started
+    print(
+        f"[local] pairs={stats['pairs']} written={stats['written']} unchanged={stats['unchanged']} "
+        f"missing={stats['missing']} elapsed={elapsed:.2f}s"
+    )
+    if args.no_correlation:
+        return
+
+    report = correlate(roots, args)
+    if not report:
+        print("[corr] no ids with both local and judge scores")
+        return
+    print(f"{'group':<20} {'n':>4} {'rho_P':>7} {'rho_R':>7} {'rho_F1':>7}")
+    for group in sorted(report, key=lambda g: (g == "ALL", g)):
+        entry = report[group]
+        print(
+            f"{group:<20} {entry['n']:>4} {entry['spearman_precision']:>7.3f} "
+            f"{entry['spearman_recall']:>7.3f} {entry['spearman_f1']:>7.3f}"
+        )
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "model": LOCAL_MODEL,
+            "threshold": args.threshold,
+            "local_suffixes": [args.precision_suffix, args.recall_suffix],
+            "judge_suffixes": [args.judge_precision_suffix, args.judge_recall_suffix],
+            "groups": report,
+        }
+        args.report.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"[corr] wrote {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Incremental SQLite index of LLM-judge precision/recall scores.
+
+Every generated root is scanned once; each `<id>/<id>_{precision,recall}_gpt41.json`
+is parsed with judge_scores.extract_score and stored in a typed table together
+with its mtime/size/sha256. Later refreshes only re-read files whose mtime or
+size changed and only re-parse files whose hash changed, so the summary and
+breakdown scripts become queries over one precision/recall join (`scores`):
+
+    root, provider, model_id, precision_num, precision_denom, precision,
+    recall_num, recall_denom, recall, f1, judge_model,
+    precision_sha256, recall_sha256
+
+Usage:
+    python evaluation_scripts/score_index.py \\
+        --root api_loop/Generated_from_Prompts_API_LOOP_OPENAI ai_agent/Generated_from_Prompts_AI_AGENT
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+
+from judge_scores import extract_score  # noqa: E402
+
+DEFAULT_INDEX_PATH = SCRIPT_DIR / ".score_index.sqlite"
+PRECISION_SUFFIX = "_precision_gpt41.json"
+RECALL_SUFFIX = "_recall_gpt41.json"
+ROOT_PREFIX = "Generated_from_Prompts_"
+
+TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS judge_files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model_id INTEGER NOT NULL,
+    evaluation TEXT NOT NULL,
+    suffix TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    status TEXT NOT NULL,
+    judge_model TEXT,
+    numerator REAL,
+    denominator REAL,
+    score REAL,
+    legacy_numerator REAL,
+    legacy_denominator REAL,
+    legacy_score REAL
+);
+CREATE INDEX IF NOT EXISTS judge_files_root ON judge_files (root, suffix, model_id);
+"""
+
+# Parameterised by (recall suffix, precision suffix); only ids with both scores parsed.
+SCORES_QUERY = """
+SELECT
+    p.root AS root,
+    p.provider AS provider,
+    p.model_id AS model_id,
+    p.numerator AS precision_num,
+    p.denominator AS precision_denom,
+    p.score AS precision,
+    r.numerator AS recall_num,
+    r.denominator AS recall_denom,
+    r.score AS recall,
+    CASE WHEN p.score + r.score > 0
+        THEN 2 * p.score * r.score / (p.score + r.score) ELSE NULL END AS f1,
+    COALESCE(p.judge_model, r.judge_model) AS judge_model,
+    p.sha256 AS precision_sha256,
+    r.sha256 AS recall_sha256
+FROM judge_files p
+JOIN judge_files r
+    ON r.root = p.root AND r.model_id = p.model_id
+    AND r.evaluation = 'recall' AND r.suffix = ?
+WHERE p.evaluation = 'precision' AND p.suffix = ?
+    AND p.status = 'ok' AND r.status = 'ok'
+"""
+
+
+def provider_from_root(root: Path) -> str:
+    """`.../Generated_from_Prompts_API_LOOP_OPENAI` -> `OPENAI`, `..._AI_AGENT` -> `AI_AGENT`."""
+    name = root.name
+    if name.startswith(ROOT_PREFIX):
+        name = name[len(ROOT_PREFIX):]
+    if name.startswith("API_LOOP_"):
+        name = name[len("API_LOOP_"):]
+    return name or root.name
+
+
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class ScoreIndex:
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(judge_files)")}
+        if columns and "legacy_score" not in columns:
+            # Index from before the legacy-score columns: it is only a cache, so rebuild it.
+            self.conn.execute("DROP TABLE judge_files")
+        self.conn.executescript(TABLE_SCHEMA)
+        self.stats = {"scanned": 0, "unchanged": 0, "touched": 0, "parsed": 0, "removed": 0}
+
+    def __enter__(self) -> "ScoreIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def refresh(
+        self,
+        roots: Iterable[Path],
+        precision_suffix: str = PRECISION_SUFFIX,
+        recall_suffix: str = RECALL_SUFFIX,
+    ) -> Dict[str, int]:
+        """Bring the index up to date for `roots`; returns per-refresh counters."""
+        for root in roots:
+            self._refresh_root(Path(root).resolve(), (("precision", precision_suffix), ("recall", recall_suffix)))
+        self.conn.commit()
+        return dict(self.stats)
+
+    def _refresh_root(self, root: Path, evaluations: Sequence[Tuple[str, str]]) -> None:
+        provider = provider_from_root(root)
+        suffixes = [suffix for _, suffix in evaluations]
+        known = {
+            row["path"]: row
+            for row in self.conn.execute(
+                "SELECT path, mtime_ns, size, sha256 FROM judge_files "
+                f"WHERE root = ? AND suffix IN ({', '.join('?' for _ in suffixes)})",
+                (str(root), *suffixes),
+            )
+        }
+        seen = set()
+        model_dirs = [d for d in root.iterdir() if d.is_dir() and d.name.isdigit()] if root.is_dir() else []
+        for model_dir in model_dirs:
+            model_id = int(model_dir.name)
+            for evaluation, suffix in evaluations:
+                path = model_dir / f"{model_dir.name}{suffix}"
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                key = str(path)
+                seen.add(key)
+                self.stats["scanned"] += 1
+                row = known.get(key)
+                if row is not None and row["mtime_ns"] == stat.st_mtime_ns and row["size"] == stat.st_size:
+                    self.stats["unchanged"] += 1
+                    continue
+                sha256 = file_sha256(path)
+                if row is not None and row["sha256"] == sha256:
+                    self.conn.execute(
+                        "UPDATE judge_files SET mtime_ns = ?, size = ? WHERE path = ?",
+                        (stat.st_mtime_ns, stat.st_size, key),
+                    )
+                    self.stats["touched"] += 1
+                    continue
+                status, judge_model, parsed, legacy = parse_judge_file(path)
+                num, denom, score = (None, None, None) if parsed is None else (parsed[1], parsed[2], parsed[0])
+                legacy_num, legacy_denom, legacy_score = (
+                    (None, None, None) if legacy is None else (legacy[1], legacy[2], legacy[0])
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO judge_files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key, str(root), provider, model_id, evaluation, suffix,
+                        stat.st_mtime_ns, stat.st_size, sha256, status, judge_model, num, denom, score,
+                        legacy_num, legacy_denom, legacy_score,
+                    ),
+                )
+                self.stats["parsed"] += 1
+        stale = [path for path in known if path not in seen]
+        for path in stale:
+            self.conn.execute("DELETE FROM judge_files WHERE path = ?", (path,))
+        self.stats["removed"] += len(stale)
+
+    def files(self, root: Path, suffix: str) -> Dict[int, sqlite3.Row]:
+        """Per-file rows (any status) for one root/suffix, keyed by model id."""
+        rows = self.conn.execute(
+            "SELECT * FROM judge_files WHERE root = ? AND suffix = ?",
+            (str(Path(root).resolve()), suffix),
+        )
+        return {row["model_id"]: row for row in rows}
+
+    def scores(
+        self,
+        roots: Optional[Iterable[Path]] = None,
+        precision_suffix: str = PRECISION_SUFFIX,
+        recall_suffix: str = RECALL_SUFFIX,
+    ) -> List[sqlite3.Row]:
+        """Joined precision/recall rows (both scores parsed), optionally limited to `roots`."""
+        sql = f"SELECT * FROM ({SCORES_QUERY})"
+        params: List[object] = [recall_suffix, precision_suffix]
+        if roots is not None:
+            root_list = [str(Path(root).resolve()) for root in roots]
+            sql += f" WHERE root IN ({', '.join('?' for _ in root_list)})"
+            params.extend(root_list)
+        sql += " ORDER BY root, model_id"
+        return list(self.conn.execute(sql, params))
+
+
+def parse_judge_file(
+    path: Path,
+) -> Tuple[str, Optional[str], Optional[Tuple[float, float, float]], Optional[Tuple[float, float, float]]]:
+    """Return (status, judge model, (score, num, denom), legacy (score, num, denom)) for one judge output file.
+
+    The legacy triple uses the strict `Score: X/Y` pattern of the original
+    summarize_gpt41_scores.py for text replies (judge_scores.LEGACY_SCORE_RE).
+    """
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return "invalid_json", None, None, None
+    if not isinstance(payload, dict):
+        return "unparsable", None, None, None
+    judge_model = payload.get("model")
+    parsed = extract_score(payload)
+    legacy = extract_score(payload, legacy=True)
+    return ("ok" if parsed else "unparsable"), judge_model, parsed, legacy
+
+
+def load_score_pairs(
+    root: Path,
+    index_path: Path = DEFAULT_INDEX_PATH,
+    precision_suffix: str = PRECISION_SUFFIX,
+    recall_suffix: str = RECALL_SUFFIX,
+) -> Dict[int, Tuple[float, float]]:
+    """Refresh the index for `root` and return {model_id: (precision, recall)}."""
+    with ScoreIndex(index_path) as index:
+        index.refresh([root], precision_suffix, recall_suffix)
+        return {
+            row["model_id"]: (row["precision"], row["recall"])
+            for row in index.scores([root], precision_suffix, recall_suffix)
+        }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build/refresh the judge score index.")
+    parser.add_argument(
+        "--root",
+        type=Path,
+        nargs="+",
+        required=True,
+        help="Generated roots containing <id>/<id>_{precision,recall}_gpt41.json files.",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=DEFAULT_INDEX_PATH,
+        help="SQLite index path (default: %(default)s).",
+    )
+    parser.add_argument("--precision-suffix", default=PRECISION_SUFFIX)
+    parser.add_argument("--recall-suffix", default=RECALL_SUFFIX)
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Drop existing rows for the given roots and re-parse everything.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    with ScoreIndex(args.index) as index:
+        if args.rebuild:
+            for root in args.root:
+                index.conn.execute("DELETE FROM judge_files WHERE root = ?", (str(root.resolve()),))
+        stats = index.refresh(args.root, args.precision_suffix, args.recall_suffix)
+        rows = index.scores(args.root, args.precision_suffix, args.recall_suffix)
+    print(
+        f"[index] scanned={stats['scanned']} unchanged={stats['unchanged']} "
+        f"touched={stats['touched']} parsed={stats['parsed']} removed={stats['removed']} "
+        f"scored_ids={len(rows)} index={args.index}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,23 +3,24 @@
 Aggregate GPT-4.1 evaluation outputs.
 
 This script scans JSON files produced by run_sysml_gpt41_eval.py, extracts the
-precision/recall scores (looking for the `Score: X/Y` line), and reports
-average precision, average recall, and average F1 across the selected models.
+precision/recall scores (structured JSON replies, or the `Score: X/Y` line matched
+with the original strict pattern, see judge_scores.LEGACY_SCORE_RE), and reports average precision, average recall, and average F1
+across the selected models. Scores are read through the incremental score
+index (score_index.py), so only judge files changed since the last run are
+re-parsed.
 """
 
 from __future__ import annotations
 
 import argparse
-import json
-import re
 import statistics
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import List
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent
 
-SCORE_RE = re.compile(r"Score:\s*(\d+(?:\.\d+)?)/(\d+(?:\.\d+)?)", re.IGNORECASE)
+from score_index import DEFAULT_INDEX_PATH, ScoreIndex  # noqa: E402
 
 
 def parse_args() -> argparse.Namespace:
@@ -60,6 +61,12 @@ def parse_args() -> argparse.Namespace:
         default=[],
         help="Model ids to skip entirely.",
     )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=DEFAULT_INDEX_PATH,
+        help="Score index path (default: %(default)s).",
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -79,28 +86,6 @@ def detect_default_generated_root() -> Path:
     return candidates[0]
 
 
-def extract_score(payload: Dict) -> Optional[Tuple[float, float, float]]:
-    """
-    Return (score, numerator, denominator) if a Score line is present.
-    """
-    response = payload.get("response") or {}
-    text = response.get("response_text") or ""
-    match = SCORE_RE.search(text)
-    if not match:
-        return None
-    num = float(match.group(1))
-    denom = float(match.group(2))
-    if denom == 0:
-        return None
-    return num / denom, num, denom
-
-
-def load_json(path: Path) -> Dict:
-    if not path.exists():
-        raise FileNotFoundError(path)
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def mean_or_nan(values: List[float]) -> float:
     return float("nan") if not values else statistics.fmean(values)
 
@@ -112,6 +97,10 @@ def main() -> None:
     f1_scores: List[float] = []
 
     skip = set(args.skip)
+    with ScoreIndex(args.index) as index:
+        index.refresh([args.root], args.precision_suffix, args.recall_suffix)
+        precision_rows = index.files(args.root, args.precision_suffix)
+        recall_rows = index.files(args.root, args.recall_suffix)
 
     for model_id in range(args.start_id, args.end_id + 1):
         if model_id in skip:
@@ -123,35 +112,40 @@ def main() -> None:
         precision_path = model_dir / f"{model_id}{args.precision_suffix}"
         recall_path = model_dir / f"{model_id}{args.recall_suffix}"
 
-        try:
-            precision_data = extract_score(load_json(precision_path))
-        except FileNotFoundError:
+        precision_row = precision_rows.get(model_id)
+        recall_row = recall_rows.get(model_id)
+        if precision_row is None:
             if not args.quiet:
                 print(f"[warn] Missing precision file: {precision_path}")
             continue
-        except json.JSONDecodeError as exc:
-            print(f"[warn] Invalid JSON in {precision_path}: {exc}")
+        if precision_row["status"] == "invalid_json":
+            print(f"[warn] Invalid JSON in {precision_path}")
             continue
-
-        try:
-            recall_data = extract_score(load_json(recall_path))
-        except FileNotFoundError:
+        if recall_row is None:
             if not args.quiet:
                 print(f"[warn] Missing recall file: {recall_path}")
             continue
-        except json.JSONDecodeError as exc:
-            print(f"[warn] Invalid JSON in {recall_path}: {exc}")
+        if recall_row["status"] == "invalid_json":
+            print(f"[warn] Invalid JSON in {recall_path}")
             continue
 
-        if not precision_data:
+        # Text replies are scored with the original strict `Score: X/Y` pattern
+        # (legacy_* columns) so published summaries regenerate unchanged.
+        if precision_row["legacy_score"] is None:
             if not args.quiet:
                 print(f"[warn] Could not parse precision score in {precision_path}")
             continue
-        if not recall_data:
+        if recall_row["legacy_score"] is None:
             if not args.quiet:
                 print(f"[warn] Could not parse recall score in {recall_path}")
             continue
 
+        precision_data = (
+            precision_row["legacy_score"],
+            precision_row["legacy_numerator"],
+            precision_row["legacy_denominator"],
+        )
+        recall_data = (recall_row["legacy_score"], recall_row["legacy_numerator"], recall_row["legacy_denominator"])
         p_score, p_num, p_denom = precision_data
         r_score, r_num, r_denom = recall_data
 
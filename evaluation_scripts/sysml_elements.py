@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Named/typed element extraction from SysML v2 text and optimal element alignment.
+
+`extract_elements` tokenises the textual notation (comments, quoted names and
+strings handled) and turns each declaration into an `Element`:
+
+    kind   normalised declaration kind, e.g. part_def, part, attribute, port, enum_value,
+           connection, import
+    name   declared (or redefined) name; `a->b` for connect/bind/flow ends
+    type   first `:` / `defined by` / `:>` target, if any
+    owner  name of the enclosing declaration ("" at top level)
+
+`extract_element_tree` also returns each element's parent index, i.e. the
+containment tree the tree-edit-distance metric (sysml_ted.py) compares.
+
+`align` scores every reference/generated pair on kind, name, type and owner
+similarity (character-trigram cosine, computed as one matrix product per
+field), then solves the optimal one-to-one assignment. Pairs scoring at least
+`threshold` count as matched. `scipy.optimize.linear_sum_assignment` is used
+when available, else a NumPy Hungarian implementation.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # pragma: no cover - SciPy is optional
+    linear_sum_assignment = None
+
+DEFAULT_THRESHOLD = 0.5
+# Field weights of the pair score; multiplied by the kind similarity.
+NAME_WEIGHT, TYPE_WEIGHT, OWNER_WEIGHT = 0.6, 0.25, 0.15
+
+TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+  | (?P<line_comment>//[^\n]*)
+  | (?P<block_comment>/\*.*?\*/)
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<quoted>'(?:[^'\\]|\\.)*')
+  | (?P<op>:>>|::>|:>|::|->|\.\.|[{};:\[\]=,().*\#@~<>+\-/!?|&^%])
+  | (?P<word>[A-Za-z_$][A-Za-z0-9_$]*)
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<other>.)
+    """,
+    re.S | re.X,
+)
+
+MODIFIERS = {
+    "public", "private", "protected", "abstract", "variation", "individual", "readonly", "derived",
+    "end", "ref", "in", "out", "inout", "nonunique", "ordered", "default", "composite", "portion",
+    "snapshot", "timeslice", "library", "standard", "then", "parallel", "const", "var",
+}
+# Keywords declaring a definition (`<kw> def`) or a usage (`<kw>`) of that kind.
+DECLARATION_KEYWORDS = {
+    "part", "attribute", "port", "item", "enum", "connection", "interface", "flow", "action",
+    "state", "requirement", "constraint", "calc", "occurrence", "allocation", "analysis",
+    "verification", "view", "viewpoint", "rendering", "metadata", "concern", "case", "message",
+    "event", "transition", "succession", "binding",
+}
+DIRECTIONS = {"in", "out", "inout"}
+# Usage kinds that may be declared by their ends (`connect a to b`, `flow of T from a to b`).
+RELATIONAL_USAGES = {"connection", "interface", "flow", "message", "succession", "binding", "allocation"}
+# Words that follow a declaration keyword but are not the declared name.
+NAME_STOPWORDS = {"of", "from", "to", "first", "then", "accept", "connect", "bind", "allocate", "if", "when", "via", "by", "all", "about"}
+# Prefix keywords that declare a usage of a fixed kind (`perform x;`, `exhibit state s;`).
+PREFIX_KINDS = {
+    "perform": "action",
+    "exhibit": "state",
+    "satisfy": "satisfy",
+    "include": "use_case",
+    "assert": "constraint",
+    "assume": "constraint",
+    "require": "constraint",
+    "subject": "subject",
+    "actor": "actor",
+    "stakeholder": "stakeholder",
+    "objective": "requirement",
+    "entry": "action",
+    "do": "action",
+    "exit": "action",
+    "accept": "accept",
+    "send": "send",
+}
+RELATION_KINDS = {"connect": "connection", "bind": "binding", "allocate": "allocation"}
+
+KIND_GROUPS = {
+    "structure": {"part", "item", "occurrence", "port", "subject", "actor", "stakeholder", "event"},
+    "feature": {"attribute", "enum_value", "parameter", "redefinition"},
+    "relation": {"connection", "binding", "interface", "flow", "message", "succession", "allocation", "satisfy"},
+    "behavior": {"action", "state", "transition", "calc", "use_case", "accept", "send", "analysis", "verification"},
+    "namespace": {"package", "import", "alias"},
+    "rule": {"constraint", "requirement", "concern"},
+}
+_GROUP_OF = {kind: group for group, kinds in KIND_GROUPS.items() for kind in kinds}
+
+
+@dataclass(frozen=True)
+class Element:
+    kind: str
+    name: str
+    type: str = ""
+    owner: str = ""
+
+    def describe(self) -> str:
+        label = f"{self.kind.replace('_', ' ')} {self.name}".strip()
+        if self.type:
+            label += f" : {self.type}"
+        return f"{label} (in {self.owner})" if self.owner else label
+
+
+def kind_group(kind: str) -> str:
+    if kind.endswith("_def"):
+        return "definition"
+    return _GROUP_OF.get(kind, kind)
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    for match in TOKEN_RE.finditer(text):
+        kind = match.lastgroup or "other"
+        if kind in ("ws", "line_comment"):
+            continue
+        tokens.append((kind, match.group()))
+    return tokens
+
+
+def _unquote(value: str) -> str:
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == "'" else value
+
+
+def _qualified_name(tokens: Sequence[Tuple[str, str]], start: int) -> Tuple[str, int]:
+    """Read `a::b.c` / `a::*` (quoted parts allowed) from `start`; returns (name, next index)."""
+    parts: List[str] = []
+    i = start
+    while i < len(tokens) and tokens[i][0] in ("word", "quoted"):
+        parts.append(_unquote(tokens[i][1]))
+        i += 1
+        if i + 1 < len(tokens) and tokens[i][1] in ("::", ".") and (
+            tokens[i + 1][0] in ("word", "quoted") or tokens[i + 1][1] == "*"
+        ):
+            parts.append(tokens[i][1])
+            i += 1
+            if tokens[i][1] == "*":
+                parts.append("*")
+                i += 1
+                break
+            continue
+        break
+    return "".join(parts), i
+
+
+def _find(tokens: Sequence[Tuple[str, str]], values: Sequence[str], start: int = 0) -> int:
+    for i in range(start, len(tokens)):
+        if tokens[i][1] in values:
+            return i
+    return -1
+
+
+def _type_of(tokens: Sequence[Tuple[str, str]], start: int) -> str:
+    for i in range(start, len(tokens)):
+        value = tokens[i][1]
+        if value == "=":
+            break
+        if value in (":", ":>", "::>"):
+            # `port p : ~FuelPort` types p by the conjugate of FuelPort.
+            return _qualified_name(tokens, i + 2 if i + 1 < len(tokens) and tokens[i + 1][1] == "~" else i + 1)[0]
+        if value == "defined" and i + 1 < len(tokens) and tokens[i + 1][1] == "by":
+            return _qualified_name(tokens, i + 2)[0]
+        if value in ("specializes", "subsets") and i + 1 < len(tokens):
+            return _qualified_name(tokens, i + 1)[0]
+    return ""
+
+
+def _relation_name(tokens: Sequence[Tuple[str, str]], start: int) -> str:
+    """`connect a.b to c.d` / `bind a = b` / `flow from a to b` -> `a.b->c.d`."""
+    i = start
+    if i < len(tokens) and tokens[i][1] in ("from", "("):
+        i += 1
+    source, i = _qualified_name(tokens, i)
+    sep = _find(tokens, ("to", "=", ","), i)
+    target = _qualified_name(tokens, sep + 1)[0] if sep >= 0 else ""
+    return f"{source}->{target}" if source or target else ""
+
+
+def parse_statement(tokens: Sequence[Tuple[str, str]], owner: Optional[Element]) -> Optional[Element]:
+    """One declaration (tokens up to `;` or `{`) -> Element, or None if it declares nothing."""
+    i = 0
+    direction = False
+    while i < len(tokens) and (tokens[i][1] in MODIFIERS or tokens[i][1] in ("#", "@")):
+        direction = direction or tokens[i][1] in DIRECTIONS
+        i += 2 if tokens[i][1] in ("#", "@") else 1
+    if i >= len(tokens):
+        return None
+    owner_name = owner.name if owner is not None else ""
+    if tokens[i][1] == ":>>":
+        # `:>> mass = 5;` redefines an inherited feature.
+        name, nxt = _qualified_name(tokens, i + 1)
+        return Element("redefinition", name, _type_of(tokens, nxt), owner_name)
+    if tokens[i][0] == "quoted" or (tokens[i][0] == "word" and tokens[i][1] not in DECLARATION_KEYWORDS):
+        bare = tokens[i][0] == "quoted" or tokens[i][1] not in PREFIX_KINDS and tokens[i][1] not in RELATION_KINDS
+        if bare and direction:
+            # `in x : Real;` declares a directed parameter.
+            name, nxt = _qualified_name(tokens, i)
+            return Element("parameter", name, _type_of(tokens, nxt), owner_name)
+        if bare and owner is not None and owner.kind == "enum_def" and len(tokens) - i <= 3:
+            # Bare `Name;` inside an enum def is an enumerated value.
+            return Element("enum_value", _unquote(tokens[i][1]), owner=owner.name)
+    if tokens[i][0] != "word":
+        return None
+    word = tokens[i][1]
+
+    if word == "package":
+        name, _ = _qualified_name(tokens, i + 1)
+        return Element("package", name, owner=owner_name)
+    if word in ("import", "alias"):
+        name, _ = _qualified_name(tokens, i + 1)
+        return Element(word, name, owner=owner_name)
+    if word in RELATION_KINDS:
+        return Element(RELATION_KINDS[word], _relation_name(tokens, i + 1), owner=owner_name)
+    if word == "use" and i + 1 < len(tokens) and tokens[i + 1][1] == "case":
+        word, i = "use_case", i + 1
+    elif word in PREFIX_KINDS:
+        kind = PREFIX_KINDS[word]
+        if i + 1 < len(tokens) and tokens[i + 1][1] in DECLARATION_KEYWORDS:
+            i += 1
+            word = tokens[i][1]
+        else:
+            name, nxt = _qualified_name(tokens, i + 1)
+            return Element(kind, name, _type_of(tokens, nxt), owner_name) if name else None
+    elif word not in DECLARATION_KEYWORDS and word not in ("package", "import", "alias"):
+        return None
+
+    kind = word
+    j = i + 1
+    if j < len(tokens) and tokens[j][1] == "def":
+        kind, j = f"{word}_def", j + 1
+    elif word == "enum":
+        kind = "enum_value"
+    if kind in RELATIONAL_USAGES:
+        rel = _find(tokens, ("connect", "from", "bind", "allocate"), j)
+        if rel >= 0:
+            named = j < rel and tokens[j][0] in ("word", "quoted") and tokens[j][1] not in NAME_STOPWORDS
+            if not named:
+                return Element(kind, _relation_name(tokens, rel + 1), owner=owner_name)
+            return Element(kind, _unquote(tokens[j][1]), _type_of(tokens[:rel], j + 1), owner_name)
+    if j < len(tokens) and tokens[j][1] in (":>>", "redefines"):
+        j += 1
+    if j >= len(tokens) or tokens[j][0] not in ("word", "quoted") or tokens[j][1] in NAME_STOPWORDS:
+        return Element(kind, "", owner=owner_name)
+    name, nxt = _qualified_name(tokens, j)
+    return Element(kind, name, _type_of(tokens, nxt), owner_name)
+
+
+def extract_element_tree(text: str) -> Tuple[List[Element], List[int]]:
+    """All declared elements in source order, plus each one's parent index (-1 at top level)."""
+    elements: List[Element] = []
+    parents: List[int] = []
+    # Index of the element owning each open scope (-1 for top level or anonymous roots).
+    stack: List[int] = []
+    statement: List[Tuple[str, str]] = []
+
+    def flush() -> int:
+        owner = elements[stack[-1]] if stack and stack[-1] >= 0 else None
+        element = parse_statement(statement, owner) if statement else None
+        statement.clear()
+        if element is not None and element.name:
+            elements.append(element)
+            parents.append(stack[-1] if stack else -1)
+            return len(elements) - 1
+        return -1
+
+    for kind, value in tokenize(text):
+        if kind == "block_comment":
+            # `doc /* ... */` and `comment ... /* ... */` end at their body.
+            if statement and statement[0][1] in ("doc", "comment"):
+                statement.clear()
+            continue
+        if value == ";":
+            flush()
+        elif value == "{":
+            index = flush()
+            # Anonymous scopes keep the enclosing owner.
+            stack.append(index if index >= 0 else (stack[-1] if stack else -1))
+        elif value == "}":
+            flush()
+            if stack:
+                stack.pop()
+        else:
+            statement.append((kind, value))
+    flush()
+    return elements, parents
+
+
+def extract_elements(text: str) -> List[Element]:
+    """All declared elements of a SysML text, in source order."""
+    return extract_element_tree(text)[0]
+
+
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def normalize_name(name: str) -> str:
+    """`'Vehicle Status'`, `vehicleStatus`, `Pkg::vehicle_status` -> `vehicle status`."""
+    if not name.endswith("*"):
+        name = name.rsplit("::", 1)[-1]
+    return " ".join(tok.lower() for tok in _CAMEL_RE.findall(name))
+
+
+def _trigram_matrix(values: Sequence[str], vocab: Dict[str, int]) -> np.ndarray:
+    mat = np.zeros((len(values), len(vocab)), dtype=np.float64)
+    for row, value in enumerate(values):
+        padded = f"  {value} "
+        for k in range(len(padded) - 2):
+            col = vocab.get(padded[k : k + 3])
+            if col is not None:
+                mat[row, col] += 1.0
+    return mat
+
+
+def string_similarity(a: Sequence[str], b: Sequence[str], empty_pair: float = 1.0, one_empty: float = 0.0) -> np.ndarray:
+    """Trigram cosine similarity matrix (len(a) x len(b)) of normalised strings."""
+    a_norm = [normalize_name(v) for v in a]
+    b_norm = [normalize_name(v) for v in b]
+    grams = {
+        f"  {v} "[k : k + 3]
+        for v in (*a_norm, *b_norm)
+        for k in range(len(v) + 1)
+    }
+    vocab = {g: idx for idx, g in enumerate(sorted(grams))}
+    ma, mb = _trigram_matrix(a_norm, vocab), _trigram_matrix(b_norm, vocab)
+    na = np.linalg.norm(ma, axis=1, keepdims=True)
+    nb = np.linalg.norm(mb, axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sim = (ma @ mb.T) / (na * nb.T)
+    empty_a = np.array([not v for v in a_norm], dtype=bool)[:, None]
+    empty_b = np.array([not v for v in b_norm], dtype=bool)[None, :]
+    sim = np.where(empty_a & empty_b, empty_pair, np.where(empty_a | empty_b, one_empty, sim))
+    return np.nan_to_num(sim, nan=0.0)
+
+
+def kind_similarity(a: Sequence[str], b: Sequence[str]) -> np.ndarray:
+    """1 for the same kind, 0.5 for the same kind group, else 0."""
+    ka, kb = np.array(a, dtype=object)[:, None], np.array(b, dtype=object)[None, :]
+    ga = np.array([kind_group(k) for k in a], dtype=object)[:, None]
+    gb = np.array([kind_group(k) for k in b], dtype=object)[None, :]
+    return np.where(ka == kb, 1.0, np.where(ga == gb, 0.5, 0.0))
+
+
+def pair_scores(reference: Sequence[Element], generated: Sequence[Element]) -> np.ndarray:
+    """Similarity matrix (len(reference) x len(generated)) in [0, 1]."""
+    if not reference or not generated:
+        return np.zeros((len(reference), len(generated)))
+    kind = kind_similarity([e.kind for e in reference], [e.kind for e in generated])
+    name = string_similarity([e.name for e in reference], [e.name for e in generated], empty_pair=1.0)
+    typ = string_similarity([e.type for e in reference], [e.type for e in generated], empty_pair=1.0, one_empty=0.5)
+    owner = string_similarity([e.owner for e in reference], [e.owner for e in generated], empty_pair=1.0)
+    return kind * (NAME_WEIGHT * name + TYPE_WEIGHT * typ + OWNER_WEIGHT * owner)
+
+
+def _hungarian(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum-cost assignment for an n x m matrix with n <= m (rows, cols)."""
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)  # p[j]: row (1-based) assigned to column j, 0 = free
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+            used_cols = np.nonzero(used)[0]
+            u[p[used_cols]] += delta
+            v[used_cols] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    cols = np.nonzero(p[1:])[0]
+    rows = p[1:][cols] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def assign(scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Maximum-total one-to-one assignment (row indices, column indices)."""
+    if scores.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(scores, maximize=True)
+        return np.asarray(rows), np.asarray(cols)
+    if scores.shape[0] <= scores.shape[1]:
+        return _hungarian(-scores)
+    cols, rows = _hungarian(-scores.T)
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+@dataclass
+class Alignment:
+    reference: List[Element]
+    generated: List[Element]
+    pairs: List[Tuple[int, int, float]]
+
+    @property
+    def matched_reference(self) -> List[int]:
+        return sorted(r for r, _, _ in self.pairs)
+
+    @property
+    def matched_generated(self) -> List[int]:
+        return sorted(g for _, g, _ in self.pairs)
+
+
+def align(
+    reference: Sequence[Element],
+    generated: Sequence[Element],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Alignment:
+    """Optimal one-to-one alignment keeping pairs that score at least `threshold`."""
+    scores = pair_scores(reference, generated)
+    # Sub-threshold pairs are worth nothing, so they never displace a real match.
+    rows, cols = assign(np.where(scores >= threshold, scores, 0.0))
+    pairs = [(int(r), int(c), float(scores[r, c])) for r, c in zip(rows, cols) if scores[r, c] >= threshold]
+    return Alignment(list(reference), list(generated), pairs)
+
+
+def average_ranks(values: Sequence[float]) -> np.ndarray:
+    """1-based ranks with ties sharing their average rank."""
+    x = np.asarray(values, dtype=np.float64)
+    order = np.argsort(x, kind="mergesort")
+    _, first, counts = np.unique(x[order], return_index=True, return_counts=True)
+    ranks = np.empty(len(x))
+    ranks[order] = np.repeat(first + (counts - 1) / 2.0 + 1.0, counts)
+    return ranks
+
+
+def spearman(a: Sequence[float], b: Sequence[float]) -> float:
+    """Spearman rank correlation (NaN below three pairs or for a constant input)."""
+    if len(a) != len(b) or len(a) < 3:
+        return float("nan")
+    ra, rb = average_ranks(a), average_ranks(b)
+    ra -= ra.mean()
+    rb -= rb.mean()
+    denom = float(np.sqrt((ra * ra).sum() * (rb * rb).sum()))
+    return float((ra * rb).sum() / denom) if denom > 0 else float("nan")
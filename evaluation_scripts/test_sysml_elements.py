@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for the element extractor, the NumPy assignment fallback and Spearman in sysml_elements.py."""
+
+import math
+
+import numpy as np
+import pytest
+
+import sysml_elements
+from sysml_elements import assign, extract_element_tree, extract_elements, spearman
+
+SAMPLE = """package P {
+  enum def Color { red; green; enum blue; }
+  part def Car { part engine : Engine; part wheel : Wheel; }
+  part car : Car {
+    attribute :>> mass = 5;
+    :>> speed = 3;
+    connect engine to wheel;
+    connection link : Link connect engine to wheel;
+  }
+}
+"""
+
+
+def elements_by_name():
+    return {element.name: element for element in extract_elements(SAMPLE)}
+
+
+def test_enum_values() -> None:
+    elements = elements_by_name()
+    assert elements["Color"].kind == "enum_def"
+    for name in ("red", "green", "blue"):
+        assert (elements[name].kind, elements[name].owner) == ("enum_value", "Color")
+
+
+def test_connect_statements() -> None:
+    elements = elements_by_name()
+    assert (elements["engine->wheel"].kind, elements["engine->wheel"].owner) == ("connection", "car")
+    assert (elements["link"].kind, elements["link"].type) == ("connection", "Link")
+
+
+def test_redefinitions() -> None:
+    elements = elements_by_name()
+    assert (elements["mass"].kind, elements["mass"].owner) == ("attribute", "car")
+    assert (elements["speed"].kind, elements["speed"].owner) == ("redefinition", "car")
+
+
+def test_element_tree_parents() -> None:
+    elements, parents = extract_element_tree(SAMPLE)
+    names = [element.name for element in elements]
+    assert parents[names.index("P")] == -1
+    assert names[parents[names.index("engine")]] == "Car"
+    assert names[parents[names.index("speed")]] == "car"
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (4, 4), (3, 7), (7, 3), (12, 12), (9, 15)])
+def test_hungarian_fallback_matches_scipy(monkeypatch, shape) -> None:
+    optimize = pytest.importorskip("scipy.optimize")
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(50):
+        scores = rng.random(shape)
+        rows, cols = optimize.linear_sum_assignment(scores, maximize=True)
+        monkeypatch.setattr(sysml_elements, "linear_sum_assignment", None)
+        fb_rows, fb_cols = assign(scores)
+        monkeypatch.undo()
+        assert len(fb_rows) == len(rows) == min(shape)
+        assert len(set(fb_rows.tolist())) == len(fb_rows) and len(set(fb_cols.tolist())) == len(fb_cols)
+        assert scores[fb_rows, fb_cols].sum() == pytest.approx(scores[rows, cols].sum())
+
+
+def test_spearman_with_ties() -> None:
+    # Average ranks (1.5, 1.5, 3) vs (1, 2, 3): 1.5 / sqrt(1.5 * 2)
+    assert spearman([1, 1, 2], [1, 2, 3]) == pytest.approx(1.5 / math.sqrt(3.0))
+    assert spearman([3, 1, 2, 2], [30, 10, 20, 20]) == pytest.approx(1.0)
+    assert math.isnan(spearman([1, 1, 1], [1, 2, 3]))
+    assert math.isnan(spearman([1, 2], [1, 2]))
+
+
+def test_spearman_matches_scipy_with_ties() -> None:
+    stats = pytest.importorskip("scipy.stats")
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        a = rng.integers(0, 5, size=30).astype(float)
+        b = a + rng.integers(0, 3, size=30)
+        assert spearman(a.tolist(), b.tolist()) == pytest.approx(stats.spearmanr(a, b)[0])
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Tests for the Zhang-Shasha tree edit distance in sysml_ted.py."""
+
+import random
+import time
+from functools import lru_cache
+
+import pytest
+
+from sysml_ted import PairTimeout, build_tree, relabel_costs, score_pair, tree_edit_distance
+
+
+def children(tree, node):
+    """Children of a postorder node, left to right."""
+    result = []
+    child = node - 1
+    while child >= tree.leftmost[node]:
+        result.append(child)
+        child = tree.leftmost[child] - 1
+    return tuple(reversed(result))
+
+
+def brute_force_distance(a, b):
+    """The textbook forest recursion, memoised on (forest, forest)."""
+    cost = relabel_costs(a, b)
+
+    @lru_cache(maxsize=None)
+    def size(tree, node):
+        return 1 + sum(size(tree, child) for child in children(tree, node))
+
+    @lru_cache(maxsize=None)
+    def forest(fa, fb):
+        if not fa:
+            return float(sum(size(b, node) for node in fb))
+        if not fb:
+            return float(sum(size(a, node) for node in fa))
+        v, w = fa[-1], fb[-1]
+        return min(
+            forest(fa[:-1] + children(a, v), fb) + 1.0,
+            forest(fa, fb[:-1] + children(b, w)) + 1.0,
+            forest(children(a, v), children(b, w)) + cost[v][w] + forest(fa[:-1], fb[:-1]),
+        )
+
+    return forest((len(a.kinds) - 1,), (len(b.kinds) - 1,))
+
+
+def random_sysml(rng, budget):
+    """A random nested package body with `budget` elements."""
+    lines = []
+
+    def emit(depth, remaining):
+        while remaining > 0:
+            kind = rng.choice(["part", "port", "attribute"])
+            name = rng.choice(["engine", "engines", "wheel", "brake", "mass", "speed"])
+            inner = rng.randint(0, remaining - 1) if kind != "attribute" else 0
+            if inner:
+                lines.append(f"{'  ' * depth}{kind} {name} {{")
+                emit(depth + 1, inner)
+                lines.append(f"{'  ' * depth}}}")
+            else:
+                lines.append(f"{'  ' * depth}{kind} {name};")
+            remaining -= inner + 1
+
+    emit(1, budget)
+    return "package P {\n" + "\n".join(lines) + "\n}\n"
+
+
+def test_identical_trees() -> None:
+    result = score_pair("package P { part a; part b; }", "package P { part a; part b; }")
+    assert result.distance == pytest.approx(0.0, abs=1e-9)
+    assert result.ted_similarity == pytest.approx(1.0)
+
+
+def test_hand_computed_example() -> None:
+    # P{a, b} vs P{a}: delete b. 3 + 2 element nodes, so similarity 1 - 1/5.
+    result = score_pair("package P { part a; part b; }", "package P { part a; }")
+    assert (result.reference_nodes, result.generated_nodes) == (3, 2)
+    assert result.distance == pytest.approx(1.0)
+    assert result.ted_similarity == pytest.approx(0.8)
+    # P{Q{a}} vs P{a}: delete Q and keep a in place.
+    result = score_pair("package P { package Q { part a; } }", "package P { part a; }")
+    assert result.distance == pytest.approx(1.0)
+    # Against an empty model every element is inserted.
+    assert score_pair("package P { part a; part b; }", "").distance == pytest.approx(3.0)
+
+
+def test_matches_brute_force_on_random_trees() -> None:
+    rng = random.Random(0)
+    for _ in range(200):
+        a = build_tree(random_sysml(rng, rng.randint(0, 7)))
+        b = build_tree(random_sysml(rng, rng.randint(0, 7)))
+        assert tree_edit_distance(a, b) == pytest.approx(brute_force_distance(a, b))
+
+
+def test_deadline_raises_and_time_cap_reports_timeout() -> None:
+    tree = build_tree(random_sysml(random.Random(1), 20))
+    with pytest.raises(PairTimeout):
+        tree_edit_distance(tree, tree, deadline=time.perf_counter() - 1.0)
+    text = random_sysml(random.Random(2), 400)
+    result = score_pair(text, text, time_cap=0.01)
+    assert result.timed_out and result.distance is None and result.ted_similarity is None
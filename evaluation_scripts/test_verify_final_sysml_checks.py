@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Regression tests for workspace chunk planning in verify_final_sysml_checks.py."""
+
+from pathlib import Path
+
+from verify_final_sysml_checks import CheckEntry, plan_workspace_chunks
+
+
+def make_entries(tmp_path: Path, sources: dict) -> list:
+    entries = []
+    for model_id, (name, text) in enumerate(sources.items(), start=1):
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        entries.append(CheckEntry(model_id, path, path, "direct", "ok"))
+    return entries
+
+
+def test_top_level_def_dependency_is_isolated(tmp_path: Path) -> None:
+    # b.sysml only resolves if a.sysml's top-level `part def Engine` is in the same workspace.
+    entries = make_entries(
+        tmp_path,
+        {
+            "a.sysml": "part def Engine {\n    attribute power;\n}\n",
+            "b.sysml": "package Car {\n    part engine : Engine;\n}\n",
+        },
+    )
+    chunks = plan_workspace_chunks(entries, chunk_size=8)
+    assert [[entry.model_id for entry in chunk] for chunk in chunks] == [[1], [2]]
+
+
+def test_independent_packages_share_a_chunk(tmp_path: Path) -> None:
+    entries = make_entries(
+        tmp_path,
+        {
+            "a.sysml": "package Alpha {\n    part def Engine;\n}\n",
+            "b.sysml": "package Beta {\n    part def Wheel;\n    part wheel : Wheel;\n}\n",
+        },
+    )
+    chunks = plan_workspace_chunks(entries, chunk_size=8)
+    assert [[entry.model_id for entry in chunk] for chunk in chunks] == [[1, 2]]
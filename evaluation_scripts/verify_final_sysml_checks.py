@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import re
 import subprocess
 import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -12,6 +13,15 @@ from typing import Dict, List, Optional, Sequence, Set
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(REPO_ROOT / "api_loop"))
+
+from validator_pool import ValidatorPool, physical_core_count  # noqa: E402
+from sysml_elements import extract_element_tree, tokenize  # noqa: E402
+
+ANSI_ESCAPE_RE = re.compile(r"\x1B\[[0-9;]*[A-Za-z]")
+DIAGNOSTIC_RE = re.compile(r"^(?P<path>.+?\.sysml):(?P<line>\d+):(?P<col>\d+):\s*(?P<severity>error|warning)\b")
+PACKAGE_DECL_RE = re.compile(r"\bpackage\s+('[^']+'|[A-Za-z_]\w*)")
+NAME_HEAD_RE = re.compile(r"::|\.")
 
 
 @dataclass(frozen=True)
@@ -80,8 +90,37 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--parallelism",
         type=int,
-        default=4,
-        help="Number of concurrent workers (default: 4).",
+        default=None,
+        help="Number of dispatch threads (default: --validator-workers).",
+    )
+    parser.add_argument(
+        "--validator-workers",
+        type=int,
+        default=physical_core_count(),
+        help="Pre-forked syside validator processes (default: physical cores, %(default)s).",
+    )
+    parser.add_argument(
+        "--validator-mode",
+        choices=("warm", "cold"),
+        default="warm",
+        help=(
+            "`warm` keeps syside loaded in long-lived worker processes; "
+            "`cold` spawns one subprocess per check."
+        ),
+    )
+    parser.add_argument(
+        "--workspace",
+        action="store_true",
+        help=(
+            "Check many files per syside invocation and demultiplex diagnostics per file. "
+            "Timeouts and failing files are re-checked in isolation (check only)."
+        ),
+    )
+    parser.add_argument(
+        "--workspace-chunk-size",
+        type=int,
+        default=32,
+        help="Maximum files per workspace invocation (default: 32).",
     )
     parser.add_argument(
         "--ids",
@@ -255,6 +294,7 @@ def run_single_check(
     syside_cmd_prefix: Sequence[str],
     validate_with: str,
     timeout_seconds: int,
+    pool: Optional[ValidatorPool] = None,
 ) -> Dict[str, object]:
     t0 = perf_counter()
     result: Dict[str, object] = {
@@ -280,15 +320,18 @@ def run_single_check(
     subcmd = ["check", target_name] if validate_with == "check" else ["format", target_name]
     cmd = list(syside_cmd_prefix) + subcmd
     try:
-        proc = subprocess.run(
-            cmd,
-            cwd=entry.generated_path.parent,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=False,
-            timeout=timeout_seconds,
-        )
+        if pool is not None:
+            proc = pool.run(subcmd, entry.generated_path.parent, timeout_seconds)
+        else:
+            proc = subprocess.run(
+                cmd,
+                cwd=entry.generated_path.parent,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=False,
+                timeout=timeout_seconds,
+            )
         result["return_code"] = proc.returncode
         result["stdout"] = proc.stdout.strip()
         result["stderr"] = proc.stderr.strip()
@@ -302,6 +345,156 @@ def run_single_check(
     return result
 
 
+def top_level_names(path: Path) -> tuple[Set[str], Set[str]]:
+    """Return (names visible to other workspace files, every name the file mentions).
+
+    Declared names are all top-level members (packages, defs, usages, aliases)
+    plus every package name. Referenced names are every identifier in the file,
+    so simple-name references to another file's top-level members count too.
+    """
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return set(), set()
+    elements, parents = extract_element_tree(text)
+    declared = {
+        NAME_HEAD_RE.split(element.name, 1)[0]
+        for element, parent in zip(elements, parents)
+        if parent < 0 and element.kind != "import"
+    }
+    declared.update(match.group(1).strip("'") for match in PACKAGE_DECL_RE.finditer(text))
+    declared.discard("")
+    referenced = {value.strip("'") for kind, value in tokenize(text) if kind in ("word", "quoted")}
+    return declared, referenced
+
+
+def plan_workspace_chunks(entries: Sequence[CheckEntry], chunk_size: int) -> List[List[CheckEntry]]:
+    """Group files so no file can resolve names against another file in the same chunk."""
+    chunks: List[List[CheckEntry]] = []
+    chunk_names: List[tuple[Set[str], Set[str]]] = []
+    for entry in entries:
+        declared, referenced = top_level_names(entry.generated_path)
+        for index, chunk in enumerate(chunks):
+            chunk_declared, chunk_referenced = chunk_names[index]
+            if len(chunk) >= chunk_size:
+                continue
+            if declared & chunk_declared or declared & chunk_referenced or referenced & chunk_declared:
+                continue
+            chunk.append(entry)
+            chunk_declared.update(declared)
+            chunk_referenced.update(referenced)
+            break
+        else:
+            chunks.append([entry])
+            chunk_names.append((set(declared), set(referenced)))
+    return chunks
+
+
+def demux_diagnostics(output: str, cwd: Path, entries: Sequence[CheckEntry]) -> Dict[int, List[str]]:
+    """Split combined syside output into per-entry diagnostic blocks keyed by model ID."""
+    by_path = {entry.generated_path.resolve(): entry.model_id for entry in entries}
+    blocks: Dict[int, List[str]] = {entry.model_id: [] for entry in entries}
+    current: Optional[int] = None
+    for raw_line in output.splitlines():
+        line = ANSI_ESCAPE_RE.sub("", raw_line)
+        match = DIAGNOSTIC_RE.match(line.strip())
+        if match:
+            diag_path = Path(match.group("path"))
+            if not diag_path.is_absolute():
+                diag_path = cwd / diag_path
+            current = by_path.get(diag_path.resolve())
+        elif not line.strip() or line.strip() == "Checks passed!":
+            continue
+        if current is not None:
+            blocks[current].append(raw_line)
+    return blocks
+
+
+def run_workspace_chunk(
+    chunk: Sequence[CheckEntry],
+    syside_cmd_prefix: Sequence[str],
+    timeout_seconds: int,
+    cwd: Path,
+    pool: Optional[ValidatorPool] = None,
+) -> List[Dict[str, object]]:
+    """Check a chunk in one syside invocation; fall back to isolated checks where needed."""
+    t0 = perf_counter()
+    existing = [entry for entry in chunk if entry.generated_path.exists()]
+    results: List[Dict[str, object]] = [
+        run_single_check(entry, syside_cmd_prefix, "check", timeout_seconds, pool)
+        for entry in chunk
+        if not entry.generated_path.exists()
+    ]
+    if not existing:
+        return results
+    if len(existing) == 1:
+        result = run_single_check(existing[0], syside_cmd_prefix, "check", timeout_seconds, pool)
+        result["workspace_size"] = 1
+        return results + [result]
+
+    subcmd = ["check"] + [str(entry.generated_path) for entry in existing]
+    try:
+        if pool is not None:
+            proc = pool.run(subcmd, cwd, timeout_seconds * len(existing))
+        else:
+            proc = subprocess.run(
+                list(syside_cmd_prefix) + subcmd,
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=False,
+                timeout=timeout_seconds * len(existing),
+            )
+    except subprocess.TimeoutExpired:
+        proc = None
+    elapsed = perf_counter() - t0
+
+    isolate: List[CheckEntry] = []
+    blocks: Dict[int, List[str]] = {}
+    if proc is not None:
+        blocks = demux_diagnostics(f"{proc.stdout}\n{proc.stderr}", cwd, existing)
+    error_ids = {
+        model_id
+        for model_id, block in blocks.items()
+        if any(
+            (match := DIAGNOSTIC_RE.match(ANSI_ESCAPE_RE.sub("", line).strip()))
+            and match.group("severity") == "error"
+            for line in block
+        )
+    }
+    unattributed_failure = proc is not None and proc.returncode != 0 and not error_ids
+    for entry in existing:
+        entry_block = blocks.get(entry.model_id, [])
+        if proc is None or unattributed_failure or entry.model_id in error_ids:
+            # Timeouts, this file's errors, and failures we cannot attribute are re-run alone.
+            isolate.append(entry)
+            continue
+        results.append(
+            {
+                "id": entry.model_id,
+                "source_kind": entry.source_kind,
+                "source_path": str(entry.source_path),
+                "manifest_status": entry.manifest_status,
+                "generated_path": str(entry.generated_path),
+                "exists": True,
+                "validate_with": "check",
+                "return_code": 0,
+                "passed": True,
+                "duration_seconds": elapsed / len(existing),
+                "stdout": "\n".join(entry_block).strip() or "Checks passed!",
+                "stderr": "",
+                "workspace_size": len(existing),
+            }
+        )
+    for entry in isolate:
+        result = run_single_check(entry, syside_cmd_prefix, "check", timeout_seconds, pool)
+        result["workspace_size"] = len(existing)
+        result["isolated_recheck"] = True
+        results.append(result)
+    return results
+
+
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
@@ -327,35 +520,68 @@ def main() -> None:
             f"No entries found under {output_root} for mode={args.mode} and filter={args.ids!r}."
         )
 
+    if args.workspace and args.validate_with != "check":
+        raise SystemExit("--workspace only supports --validate-with check")
+    if args.workspace_chunk_size <= 0:
+        raise SystemExit("--workspace-chunk-size must be > 0")
+    if args.validator_workers <= 0:
+        raise SystemExit("--validator-workers must be > 0")
+    if args.parallelism is None:
+        args.parallelism = args.validator_workers
+
     print(
         f"[verify] loaded {len(entries)} entries from {output_root} | "
-        f"workers={args.parallelism} | mode={resolved_mode}"
+        f"workers={args.parallelism} | validators={args.validator_workers} "
+        f"({args.validator_mode}) | mode={resolved_mode}"
+    )
+    pool = ValidatorPool(
+        python_path,
+        syside_prefix,
+        size=args.validator_workers,
+        mode=args.validator_mode,
     )
 
     checks: List[Dict[str, object]] = []
     by_id: Dict[int, Dict[str, object]] = {}
-    with ThreadPoolExecutor(max_workers=max(1, args.parallelism)) as executor:
-        future_to_id = {
-            executor.submit(
-                run_single_check,
-                entry,
-                syside_prefix,
-                args.validate_with,
-                args.timeout_seconds,
-            ): entry.model_id
-            for entry in entries
-        }
-        completed = 0
-        total = len(entries)
-        for fut in as_completed(future_to_id):
-            completed += 1
-            result = fut.result()
-            by_id[int(result["id"])] = result
-            status = "PASS" if result.get("passed") else "FAIL"
-            print(
-                f"[{completed}/{total}] id={result['id']} {status} "
-                f"rc={result['return_code']} dt={result['duration_seconds']:.2f}s"
-            )
+    completed = 0
+    total = len(entries)
+    with pool, ThreadPoolExecutor(max_workers=max(1, args.parallelism)) as executor:
+        if args.workspace:
+            chunks = plan_workspace_chunks(entries, args.workspace_chunk_size)
+            print(f"[verify] workspace mode: {len(chunks)} invocation(s) for {total} files")
+            futures = [
+                executor.submit(
+                    run_workspace_chunk,
+                    chunk,
+                    syside_prefix,
+                    args.timeout_seconds,
+                    output_root,
+                    pool,
+                )
+                for chunk in chunks
+            ]
+        else:
+            futures = [
+                executor.submit(
+                    run_single_check,
+                    entry,
+                    syside_prefix,
+                    args.validate_with,
+                    args.timeout_seconds,
+                    pool,
+                )
+                for entry in entries
+            ]
+        for fut in as_completed(futures):
+            batch = fut.result()
+            for result in batch if isinstance(batch, list) else [batch]:
+                completed += 1
+                by_id[int(result["id"])] = result
+                status = "PASS" if result.get("passed") else "FAIL"
+                print(
+                    f"[{completed}/{total}] id={result['id']} {status} "
+                    f"rc={result['return_code']} dt={result['duration_seconds']:.2f}s"
+                )
 
     for entry in entries:
         checks.append(by_id[entry.model_id])
@@ -379,6 +605,11 @@ def main() -> None:
         "validate_with": args.validate_with,
         "timeout_seconds": args.timeout_seconds,
         "parallelism": args.parallelism,
+        "validator_workers": args.validator_workers,
+        "validator_mode": pool.mode,
+        "workspace": args.workspace,
+        "workspace_chunk_size": args.workspace_chunk_size if args.workspace else None,
+        "isolated_recheck_count": sum(1 for row in checks if row.get("isolated_recheck")),
         "id_filter": sorted(selected_ids) if selected_ids is not None else None,
         "total_checked": len(checks),
         "pass_count": pass_count,
@@ -2,26 +2,35 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import json
 import os
 import subprocess
 import sys
+import threading
 from pathlib import Path
+from typing import Optional
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 HAMR_CLASSES_DIR = SCRIPT_DIR / "generated" / "hamr_java_classes"
 ANTLR_JAR = SCRIPT_DIR / "tools" / "antlr-4.13.2-complete.jar"
+# Must match ParseSysML.BATCH_PROTOCOL.
+BATCH_PROTOCOL = 1
 
 
-def _check_with_hamr_java(path: Path) -> tuple[bool, list[str]]:
+def _java_cmd(*args: str) -> list[str]:
     if not HAMR_CLASSES_DIR.exists() or not ANTLR_JAR.exists():
         raise RuntimeError(
             "HAMR Java parser artifacts missing. Run: bash experiments/antlr_vs_syside/setup.sh"
         )
-
     java_bin = os.environ.get("JAVA_BIN", "java")
     cp = f"{HAMR_CLASSES_DIR}:{ANTLR_JAR}"
+    return [java_bin, "-cp", cp, "ParseSysML", *args]
+
+
+def _check_with_hamr_java(path: Path) -> tuple[bool, list[str]]:
     proc = subprocess.run(
-        [java_bin, "-cp", cp, "ParseSysML", str(path)],
+        _java_cmd(str(path)),
         capture_output=True,
         text=True,
     )
@@ -36,11 +45,128 @@ def _check_with_hamr_java(path: Path) -> tuple[bool, list[str]]:
     return ok, lines
 
 
-def check_parse(path: Path) -> tuple[str, bool, list[str]]:
-    ok, errors = _check_with_hamr_java(path)
+class DaemonUnavailable(RuntimeError):
+    """The batch parser could not be started or stopped answering."""
+
+
+class ParseDaemon:
+    """A long-lived `ParseSysML --batch` JVM: one path per request, one JSON line per result.
+
+    Keeping the JVM alive amortises startup and class loading, and later files
+    reuse the lexer/parser and the DFA cache warmed by earlier ones. With
+    `inventory=True` each result also carries per-rule parse-tree node counts.
+    """
+
+    def __init__(self, inventory: bool = False) -> None:
+        self._lock = threading.Lock()
+        try:
+            self.proc = subprocess.Popen(
+                _java_cmd("--batch", *(["--inventory"] if inventory else [])),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+            )
+        except OSError as exc:
+            # e.g. no `java` on PATH; check_parse then falls back (and reports) per file.
+            raise DaemonUnavailable(f"could not start ParseSysML --batch: {exc}") from exc
+        hello = self.proc.stdout.readline()
+        try:
+            ready = json.loads(hello) if hello else None
+        except json.JSONDecodeError:
+            ready = None
+        if not isinstance(ready, dict) or ready.get("protocol") != BATCH_PROTOCOL:
+            # Typically classes compiled before --batch existed; rerun setup.sh.
+            self.close()
+            raise DaemonUnavailable("ParseSysML does not support --batch (recompile with setup.sh)")
+
+    def parse(self, path: Path) -> tuple[bool, list[str]]:
+        result = self.request(path)
+        return bool(result["ok"]), [str(e) for e in result["errors"]]
+
+    def request(self, path: Path) -> dict:
+        """The raw JSON result for one file: {"file", "ok", "errors"[, "rules"]}."""
+        text = str(path)
+        if "\n" in text or "\r" in text:
+            raise DaemonUnavailable(f"path cannot be sent over the batch protocol: {text!r}")
+        with self._lock:
+            try:
+                self.proc.stdin.write(text + "\n")
+                self.proc.stdin.flush()
+                line = self.proc.stdout.readline()
+            except (BrokenPipeError, OSError) as exc:
+                raise DaemonUnavailable(f"ParseSysML daemon died: {exc}") from exc
+        if not line:
+            raise DaemonUnavailable("ParseSysML daemon exited")
+        try:
+            result = json.loads(line)
+        except json.JSONDecodeError as exc:
+            # A stray stdout line (e.g. a JVM warning) desynchronises the protocol.
+            raise DaemonUnavailable(f"unexpected ParseSysML output: {line.strip()[:200]!r}") from exc
+        if not isinstance(result, dict) or "ok" not in result or "errors" not in result:
+            raise DaemonUnavailable(f"unexpected ParseSysML output: {line.strip()[:200]!r}")
+        return result
+
+    def close(self) -> None:
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+
+
+# One daemon per thread, so a thread pool parses in parallel JVMs. Set
+# ANTLR_CHECK_DAEMON=0 to force one `java` process per file.
+_local = threading.local()
+_daemons: list[ParseDaemon] = []
+_daemons_lock = threading.Lock()
+_daemon_disabled = os.environ.get("ANTLR_CHECK_DAEMON", "1") == "0"
+
+
+def _check_with_daemon(path: Path) -> Optional[tuple[bool, list[str]]]:
+    global _daemon_disabled
+    daemon = getattr(_local, "daemon", None)
+    if daemon is None:
+        try:
+            daemon = ParseDaemon()
+        except DaemonUnavailable:
+            _daemon_disabled = True
+            return None
+        _local.daemon = daemon
+        with _daemons_lock:
+            _daemons.append(daemon)
+    try:
+        return daemon.parse(path)
+    except DaemonUnavailable:
+        daemon.close()
+        _local.daemon = None
+        return None
+
+
+@atexit.register
+def close_daemons() -> None:
+    with _daemons_lock:
+        for daemon in _daemons:
+            daemon.close()
+        _daemons.clear()
+
+
+def check_parse(path: Path, use_daemon: bool = True) -> tuple[str, bool, list[str]]:
+    result = _check_with_daemon(path) if use_daemon and not _daemon_disabled else None
+    ok, errors = result if result is not None else _check_with_hamr_java(path)
     return "hamr_full", ok, errors
 
 
+def format_result(label: str, ok: bool, path: Path, errors: list[str]) -> str:
+    """The text the CLI prints for one checked file."""
+    if ok:
+        return f"ANTLR_PARSE_PASS[{label}] {path}"
+    return "\n".join([f"ANTLR_PARSE_FAIL[{label}] {path}", *errors])
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="ANTLR grammar-level parse check")
     ap.add_argument("sysml_file", type=Path, help="Path to .sysml file")
@@ -51,20 +177,15 @@ def main() -> int:
         return 2
 
     try:
-        label, ok, errors = check_parse(args.sysml_file)
+        # A single file gains nothing from the batch daemon's handshake.
+        label, ok, errors = check_parse(args.sysml_file, use_daemon=False)
     except Exception as exc:
         print("ERROR: HAMR ANTLR parser backend unavailable.", file=sys.stderr)
         print(f"Backend load failure: {exc}", file=sys.stderr)
         return 2
 
-    if ok:
-        print(f"ANTLR_PARSE_PASS[{label}] {args.sysml_file}")
-        return 0
-
-    print(f"ANTLR_PARSE_FAIL[{label}] {args.sysml_file}")
-    for err in errors:
-        print(err)
-    return 1
+    print(format_result(label, ok, args.sysml_file, errors))
+    return 0 if ok else 1
 
 
 if __name__ == "__main__":
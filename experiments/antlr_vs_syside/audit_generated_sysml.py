@@ -3,11 +3,21 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
 import json
-import subprocess
+import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from typing import Any, Dict, Optional
+
+from checkers import AntlrBackend, CheckerBackend, SysideBackend, probe_all
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+LEDGER_VERSION = 1
+LEDGER_NAME = ".audit_ledger.json"
+# Sources whose changes can alter a row for unchanged inputs.
+DRIVER_SOURCES = ["audit_generated_sysml.py", "checkers.py", "antlr_check.py", "syside_check.py"]
 
 DEFAULT_PROVIDERS = [
     "Generated_from_Prompts_API_LOOP_OPENAI",
@@ -29,10 +39,6 @@ class Row:
     syside_output: str
 
 
-def _run(cmd: list[str]) -> subprocess.CompletedProcess[str]:
-    return subprocess.run(cmd, capture_output=True, text=True)
-
-
 def _compact(text: str, max_chars: int = 1200) -> str:
     t = (text or "").strip()
     return t[:max_chars]
@@ -52,16 +58,16 @@ def discover_files(api_loop_dir: Path, providers: list[str]) -> list[tuple[str,
     return items
 
 
-def audit_one(item: tuple[str, int, Path], antlr_cmd: list[str], syside_cmd: list[str]) -> Row:
+def audit_one(item: tuple[str, int, Path], antlr: CheckerBackend, syside: CheckerBackend) -> Row:
     provider, prompt_id, file_path = item
-    antlr = _run(antlr_cmd + [str(file_path)])
-    syside = _run(syside_cmd + [str(file_path)])
+    antlr_res = antlr.check(file_path)
+    syside_res = syside.check(file_path)
 
-    antlr_out = _compact((antlr.stdout or "") + ("\n" + antlr.stderr if antlr.stderr else ""))
-    syside_out = _compact((syside.stdout or "") + ("\n" + syside.stderr if syside.stderr else ""))
+    antlr_out = _compact(antlr_res.output)
+    syside_out = _compact(syside_res.output)
 
-    antlr_ok = antlr.returncode == 0
-    syside_ok = syside.returncode == 0
+    antlr_ok = antlr_res.ok
+    syside_ok = syside_res.ok
 
     return Row(
         provider=provider,
@@ -75,6 +81,47 @@ def audit_one(item: tuple[str, int, Path], antlr_cmd: list[str], syside_cmd: lis
     )
 
 
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def checker_key(backends: dict) -> str:
+    """Digest of the probed checker versions/artifacts plus this driver's own sources."""
+    h = hashlib.sha256(f"audit-ledger-v{LEDGER_VERSION}\0".encode("utf-8"))
+    h.update(json.dumps(backends, sort_keys=True).encode("utf-8"))
+    for name in DRIVER_SOURCES:
+        h.update(hashlib.sha256((SCRIPT_DIR / name).read_bytes()).digest())
+    return h.hexdigest()
+
+
+def load_ledger(path: Path) -> Dict[str, Any]:
+    """Per-file results: {file: {"sha256", "checkers", "row"}}. Unreadable ledgers start empty."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != LEDGER_VERSION:
+        return {}
+    entries = payload.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_ledger(path: Path, entries: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": LEDGER_VERSION, "entries": entries}, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def ledger_row(entry: Optional[Dict[str, Any]], sha: str, key: str) -> Optional[Row]:
+    if not isinstance(entry, dict) or entry.get("sha256") != sha or entry.get("checkers") != key:
+        return None
+    try:
+        return Row(**entry["row"])
+    except (KeyError, TypeError):
+        return None
+
+
 def summarize(rows: list[Row], providers: list[str]) -> dict:
     summary: dict[str, dict[str, int]] = {}
     for p in providers:
@@ -97,7 +144,7 @@ def summarize(rows: list[Row], providers: list[str]) -> dict:
     return summary
 
 
-def write_outputs(rows: list[Row], summary: dict, out_dir: Path) -> None:
+def write_outputs(rows: list[Row], summary: dict, backends: dict, out_dir: Path) -> None:
     out_dir.mkdir(parents=True, exist_ok=True)
 
     json_path = out_dir / "generated_sysml_audit.json"
@@ -105,7 +152,7 @@ def write_outputs(rows: list[Row], summary: dict, out_dir: Path) -> None:
     fail_csv_path = out_dir / "generated_sysml_audit_failures.csv"
 
     json_path.write_text(
-        json.dumps({"summary": summary, "rows": [asdict(r) for r in rows]}, indent=2),
+        json.dumps({"summary": summary, "backends": backends, "rows": [asdict(r) for r in rows]}, indent=2),
         encoding="utf-8",
     )
 
@@ -157,29 +204,71 @@ def main() -> int:
         "--python-bin",
         type=Path,
         default=Path("./.venv/bin/python"),
-        help="Python executable used to invoke antlr_check.py and syside_check.py",
+        help="Python interpreter probed for `-m syside check` when `syside` is not on PATH",
+    )
+    ap.add_argument(
+        "--no-antlr-daemon",
+        action="store_true",
+        help="Start one java process per file instead of reusing a warm ParseSysML --batch JVM per worker",
     )
+    ap.add_argument(
+        "--ledger",
+        type=Path,
+        default=None,
+        help=f"Per-file result ledger (default: <out-dir>/{LEDGER_NAME})",
+    )
+    ap.add_argument("--rebuild", action="store_true", help="Ignore the ledger and re-check every file")
     args = ap.parse_args()
+    ledger_path = args.ledger or args.out_dir / LEDGER_NAME
 
-    antlr_cmd = [str(args.python_bin), "experiments/antlr_vs_syside/antlr_check.py"]
-    syside_cmd = [str(args.python_bin), "experiments/antlr_vs_syside/syside_check.py"]
+    antlr = AntlrBackend(use_daemon=not args.no_antlr_daemon)
+    syside = SysideBackend(python_bin=str(args.python_bin))
 
     items = discover_files(args.api_loop_dir, args.providers)
     if not items:
         print("No generated .sysml files found for requested providers")
         return 2
 
+    backends = probe_all(antlr, syside)
+    for name, caps in backends.items():
+        print(f"[backend] {name}: {json.dumps(caps)}")
+
+    # Files whose content hash and checker key match a ledger entry reuse its row.
+    key = checker_key(backends)
+    ledger = {} if args.rebuild else load_ledger(ledger_path)
     rows: list[Row] = []
-    with ThreadPoolExecutor(max_workers=args.workers) as ex:
-        futures = [ex.submit(audit_one, item, antlr_cmd, syside_cmd) for item in items]
-        for idx, fut in enumerate(as_completed(futures), start=1):
-            rows.append(fut.result())
-            if idx % 100 == 0:
-                print(f"progress {idx}/{len(futures)}")
+    pending: list[tuple[tuple[str, int, Path], str]] = []
+    for item in items:
+        sha = file_sha256(item[2])
+        row = ledger_row(ledger.get(str(item[2])), sha, key)
+        if row is None:
+            pending.append((item, sha))
+        else:
+            rows.append(row)
+    print(f"[ledger] reused={len(rows)} to_check={len(pending)}")
+
+    def checkpoint() -> None:
+        # Keep entries for other providers' files; drop files that no longer exist.
+        save_ledger(ledger_path, {f: e for f, e in ledger.items() if Path(f).exists()})
+
+    # Saved periodically and on the way out, so an interrupted audit resumes
+    # from the rows it already finished.
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as ex:
+            futures = {ex.submit(audit_one, item, antlr, syside): sha for item, sha in pending}
+            for idx, fut in enumerate(as_completed(futures), start=1):
+                row = fut.result()
+                rows.append(row)
+                ledger[row.file] = {"sha256": futures[fut], "checkers": key, "row": asdict(row)}
+                if idx % 100 == 0:
+                    print(f"progress {idx}/{len(futures)}")
+                    checkpoint()
+    finally:
+        checkpoint()
 
     rows.sort(key=lambda r: (r.provider, r.prompt_id))
     summary = summarize(rows, args.providers)
-    write_outputs(rows, summary, args.out_dir)
+    write_outputs(rows, summary, backends, args.out_dir)
 
     print("=== Summary ===")
     for p in args.providers + ["ALL"]:
@@ -194,6 +283,7 @@ def main() -> int:
     print(f"Wrote {args.out_dir / 'generated_sysml_audit.json'}")
     print(f"Wrote {args.out_dir / 'generated_sysml_audit.csv'}")
     print(f"Wrote {args.out_dir / 'generated_sysml_audit_failures.csv'}")
+    print(f"Wrote {ledger_path}")
     return 0
 
 
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Checker backends shared by the audit and experiment drivers.
+
+A backend probes its toolchain once per process and then checks files
+directly. This replaces the per-file `python antlr_check.py` /
+`python syside_check.py` wrappers and the SysIDE interpreter probing they
+repeated for every file. `CheckResult.output` carries the same text the CLI
+wrappers print, so reports are unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from antlr_check import ANTLR_JAR, HAMR_CLASSES_DIR, check_parse, close_daemons, format_result
+from syside_check import detect_syside_command, format_output
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    ok: bool
+    returncode: int
+    output: str
+
+
+def _join(stdout: str, stderr: str) -> str:
+    """Captured stdout, then stderr, as the drivers used to combine the wrapper's streams."""
+    text = stdout + "\n" if stdout else ""
+    return text + ("\n" + stderr + "\n" if stderr else "")
+
+
+def _run_text(cmd: list[str]) -> str:
+    """First non-empty output line of `cmd`, or "" if it cannot be run."""
+    try:
+        cp = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    lines = [ln.strip() for ln in (cp.stdout + cp.stderr).splitlines() if ln.strip()]
+    return lines[0] if cp.returncode == 0 and lines else ""
+
+
+def artifacts_sha256(*roots: Path) -> str:
+    """Digest of every file under `roots` (relative path + content), in sorted order."""
+    h = hashlib.sha256()
+    for root in roots:
+        files = sorted(p for p in root.rglob("*") if p.is_file()) if root.is_dir() else [root]
+        for path in files:
+            if not path.exists():
+                continue
+            h.update(path.relative_to(root.parent).as_posix().encode("utf-8") + b"\0")
+            h.update(hashlib.sha256(path.read_bytes()).digest())
+    return h.hexdigest()
+
+
+class CheckerBackend:
+    """Base class: `probe()` runs once and is cached; `check()` is thread-safe.
+
+    Probe results hold everything a check's outcome depends on besides the
+    file itself (tool versions, artifact digests), so callers can key
+    cached results on them.
+    """
+
+    name = ""
+
+    def __init__(self) -> None:
+        self._probe_lock = threading.Lock()
+        self._capabilities: Optional[Dict[str, Any]] = None
+
+    def capabilities(self) -> Dict[str, Any]:
+        with self._probe_lock:
+            if self._capabilities is None:
+                self._capabilities = self.probe()
+            return self._capabilities
+
+    def probe(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def check(self, path: Path) -> CheckResult:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release per-thread resources; call once the threads that used `check()` are done."""
+
+
+class AntlrBackend(CheckerBackend):
+    """HAMR ANTLR parse via `check_parse` (a warm `ParseSysML --batch` JVM per thread)."""
+
+    name = "antlr"
+
+    def __init__(self, use_daemon: bool = True) -> None:
+        super().__init__()
+        self.use_daemon = use_daemon
+
+    def probe(self) -> Dict[str, Any]:
+        java_bin = os.environ.get("JAVA_BIN", "java")
+        java_version = _run_text([java_bin, "-version"])
+        artifacts = HAMR_CLASSES_DIR.exists() and ANTLR_JAR.exists()
+        error = None
+        if not artifacts:
+            error = f"HAMR parser artifacts missing: {HAMR_CLASSES_DIR} and {ANTLR_JAR} are required."
+        elif not java_version:
+            error = f"`{java_bin} -version` failed; install a JRE or set JAVA_BIN."
+        return {
+            "available": error is None,
+            "java": java_bin,
+            "java_version": java_version,
+            "artifacts_sha256": artifacts_sha256(HAMR_CLASSES_DIR, ANTLR_JAR) if artifacts else None,
+            "error": error,
+        }
+
+    def check(self, path: Path) -> CheckResult:
+        caps = self.capabilities()
+        if not caps["available"]:
+            return CheckResult(False, 2, _join("", f"ERROR: HAMR ANTLR parser backend unavailable.\n{caps['error']}"))
+        try:
+            label, ok, errors = check_parse(path, use_daemon=self.use_daemon)
+        except Exception as exc:
+            return CheckResult(
+                False,
+                2,
+                _join("", f"ERROR: HAMR ANTLR parser backend unavailable.\nBackend load failure: {exc}"),
+            )
+        return CheckResult(ok, 0 if ok else 1, _join(format_result(label, ok, path, errors), ""))
+
+    def close(self) -> None:
+        close_daemons()
+
+
+class SysideBackend(CheckerBackend):
+    """SysIDE compile check; the checker command is detected once, then run per file."""
+
+    name = "syside"
+
+    def __init__(self, python_bin: Optional[str] = None) -> None:
+        super().__init__()
+        self.python_bin = python_bin
+
+    def probe(self) -> Dict[str, Any]:
+        try:
+            command = detect_syside_command(self.python_bin)
+        except RuntimeError as exc:
+            return {"available": False, "command": None, "version": None, "error": str(exc)}
+        if "-m" in command:
+            # `<python> -m syside check`: ask that interpreter for the installed package version.
+            python = command[0]
+            version = _run_text([python, "-c", "import importlib.metadata as m; print(m.version('syside'))"])
+        else:
+            version = _run_text([command[0], "--version"])
+        return {"available": True, "command": command, "version": version}
+
+    def check(self, path: Path) -> CheckResult:
+        caps = self.capabilities()
+        if not caps["available"]:
+            return CheckResult(False, 2, _join("", f"ERROR: {caps['error']}"))
+        cp = subprocess.run(caps["command"] + [str(path)], capture_output=True, text=True)
+        return CheckResult(cp.returncode == 0, cp.returncode, _join(*format_output(path, cp)))
+
+
+def probe_all(*backends: CheckerBackend) -> Dict[str, Dict[str, Any]]:
+    """Probe each backend up front (before any worker pool starts) and report the results."""
+    return {b.name: b.capabilities() for b in backends}
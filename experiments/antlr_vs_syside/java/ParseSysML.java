@@ -1,17 +1,32 @@
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
 import java.nio.file.Path;
 import java.util.ArrayList;
 import java.util.List;
+import java.util.Map;
+import java.util.TreeMap;
 
 import org.antlr.v4.runtime.BaseErrorListener;
 import org.antlr.v4.runtime.CharStream;
 import org.antlr.v4.runtime.CharStreams;
 import org.antlr.v4.runtime.CommonTokenStream;
+import org.antlr.v4.runtime.ParserRuleContext;
 import org.antlr.v4.runtime.RecognitionException;
 import org.antlr.v4.runtime.Recognizer;
+import org.antlr.v4.runtime.tree.ErrorNode;
+import org.antlr.v4.runtime.tree.ParseTreeListener;
+import org.antlr.v4.runtime.tree.ParseTreeWalker;
+import org.antlr.v4.runtime.tree.TerminalNode;
 import org.sireum.hamr.sysml.parser.SysMLv2Lexer;
 import org.sireum.hamr.sysml.parser.SysMLv2Parser;
 
 public final class ParseSysML {
+  // Bumped whenever the --batch request/response format changes.
+  private static final int BATCH_PROTOCOL = 1;
+
   private static final class CollectingErrorListener extends BaseErrorListener {
     private final List<String> errors = new ArrayList<>();
 
@@ -29,37 +44,214 @@ public final class ParseSysML {
     public List<String> getErrors() {
       return errors;
     }
+
+    public void clear() {
+      errors.clear();
+    }
   }
 
-  public static void main(String[] args) throws Exception {
-    if (args.length != 1) {
-      System.err.println("Usage: ParseSysML <file.sysml>");
-      System.exit(2);
+  /** Counts parse-tree nodes per grammar rule name (the --inventory payload). */
+  private static final class RuleCounter implements ParseTreeListener {
+    private final String[] ruleNames;
+    private final Map<String, Integer> counts = new TreeMap<>();
+
+    RuleCounter(String[] ruleNames) {
+      this.ruleNames = ruleNames;
     }
 
-    String file = Path.of(args[0]).toString();
-    CharStream input = CharStreams.fromFileName(file);
+    @Override
+    public void enterEveryRule(ParserRuleContext ctx) {
+      counts.merge(ruleNames[ctx.getRuleIndex()], 1, Integer::sum);
+    }
 
-    SysMLv2Lexer lexer = new SysMLv2Lexer(input);
-    CollectingErrorListener lexErr = new CollectingErrorListener();
-    lexer.removeErrorListeners();
-    lexer.addErrorListener(lexErr);
+    @Override
+    public void exitEveryRule(ParserRuleContext ctx) {}
 
-    CommonTokenStream tokens = new CommonTokenStream(lexer);
-    SysMLv2Parser parser = new SysMLv2Parser(tokens);
-    CollectingErrorListener parseErr = new CollectingErrorListener();
-    parser.removeErrorListeners();
-    parser.addErrorListener(parseErr);
+    @Override
+    public void visitTerminal(TerminalNode node) {}
+
+    @Override
+    public void visitErrorNode(ErrorNode node) {}
+  }
 
-    parser.entryRuleRootNamespace();
+  private static final class Result {
+    private final boolean ok;
+    private final List<String> errors;
+    private final Map<String, Integer> rules;
 
-    List<String> all = new ArrayList<>();
-    all.addAll(lexErr.getErrors());
-    all.addAll(parseErr.getErrors());
+    Result(boolean ok, List<String> errors) {
+      this(ok, errors, null);
+    }
+
+    Result(boolean ok, List<String> errors, Map<String, Integer> rules) {
+      this.ok = ok;
+      this.errors = errors;
+      this.rules = rules;
+    }
+  }
+
+  /**
+   * One lexer/token stream/parser reused across files. The ATN and DFA caches are static in
+   * the generated recognizers, so every parse after the first runs against a warm cache.
+   */
+  private static final class Session {
+    private final CollectingErrorListener lexErr = new CollectingErrorListener();
+    private final CollectingErrorListener parseErr = new CollectingErrorListener();
+    private SysMLv2Lexer lexer;
+    private CommonTokenStream tokens;
+    private SysMLv2Parser parser;
+
+    Result parse(CharStream input) {
+      return parse(input, false);
+    }
+
+    Result parse(CharStream input, boolean inventory) {
+      lexErr.clear();
+      parseErr.clear();
+      if (lexer == null) {
+        lexer = new SysMLv2Lexer(input);
+        lexer.removeErrorListeners();
+        lexer.addErrorListener(lexErr);
+        tokens = new CommonTokenStream(lexer);
+        parser = new SysMLv2Parser(tokens);
+        parser.removeErrorListeners();
+        parser.addErrorListener(parseErr);
+      } else {
+        lexer.setInputStream(input);
+        tokens.setTokenSource(lexer);
+        parser.setTokenStream(tokens);
+      }
+
+      ParserRuleContext tree;
+      try {
+        tree = parser.entryRuleRootNamespace();
+      } catch (RuntimeException | StackOverflowError e) {
+        // Start from fresh recognizers after an aborted parse.
+        lexer = null;
+        List<String> errors = new ArrayList<>(lexErr.getErrors());
+        errors.addAll(parseErr.getErrors());
+        errors.add("internal parser error: " + e);
+        return new Result(false, errors);
+      }
+
+      List<String> all = new ArrayList<>();
+      all.addAll(lexErr.getErrors());
+      all.addAll(parseErr.getErrors());
+      boolean ok = all.isEmpty() && parser.getNumberOfSyntaxErrors() == 0;
+      if (!inventory) {
+        return new Result(ok, all);
+      }
+      RuleCounter counter = new RuleCounter(parser.getRuleNames());
+      ParseTreeWalker.DEFAULT.walk(counter, tree);
+      return new Result(ok, all, counter.counts);
+    }
+  }
+
+  private static String jsonString(String s) {
+    StringBuilder sb = new StringBuilder(s.length() + 2).append('"');
+    for (int i = 0; i < s.length(); i++) {
+      char c = s.charAt(i);
+      switch (c) {
+        case '"':
+          sb.append("\\\"");
+          break;
+        case '\\':
+          sb.append("\\\\");
+          break;
+        case '\n':
+          sb.append("\\n");
+          break;
+        case '\r':
+          sb.append("\\r");
+          break;
+        case '\t':
+          sb.append("\\t");
+          break;
+        default:
+          if (c < 0x20) {
+            sb.append(String.format("\\u%04x", (int) c));
+          } else {
+            sb.append(c);
+          }
+      }
+    }
+    return sb.append('"').toString();
+  }
+
+  private static String resultJson(String file, Result result) {
+    StringBuilder sb = new StringBuilder();
+    sb.append("{\"file\":").append(jsonString(file));
+    sb.append(",\"ok\":").append(result.ok);
+    sb.append(",\"errors\":[");
+    for (int i = 0; i < result.errors.size(); i++) {
+      if (i > 0) {
+        sb.append(',');
+      }
+      sb.append(jsonString(result.errors.get(i)));
+    }
+    sb.append(']');
+    if (result.rules != null) {
+      sb.append(",\"rules\":{");
+      boolean first = true;
+      for (Map.Entry<String, Integer> e : result.rules.entrySet()) {
+        if (!first) {
+          sb.append(',');
+        }
+        first = false;
+        sb.append(jsonString(e.getKey())).append(':').append(e.getValue());
+      }
+      sb.append('}');
+    }
+    return sb.append('}').toString();
+  }
+
+  /**
+   * Batch/daemon mode: prints a ready line, then reads one file path per stdin line and writes
+   * one JSON object per line ({"file", "ok", "errors"}) until stdin closes. With inventory set,
+   * each object also carries "rules": {grammar rule name: parse-tree node count}.
+   */
+  private static void runBatch(boolean inventory) throws IOException {
+    BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+    PrintStream out = new PrintStream(System.out, false, StandardCharsets.UTF_8);
+    out.println("{\"ready\":true,\"protocol\":" + BATCH_PROTOCOL + "}");
+    out.flush();
+
+    Session session = new Session();
+    String line;
+    while ((line = in.readLine()) != null) {
+      if (line.isEmpty()) {
+        continue;
+      }
+      String file = Path.of(line).toString();
+      Result result;
+      try {
+        result = session.parse(CharStreams.fromFileName(file), inventory);
+      } catch (IOException e) {
+        result = new Result(false, List.of("io error: " + e));
+      }
+      out.println(resultJson(file, result));
+      out.flush();
+    }
+  }
+
+  public static void main(String[] args) throws Exception {
+    if (args.length >= 1 && args[0].equals("--batch")) {
+      if (args.length == 1 || (args.length == 2 && args[1].equals("--inventory"))) {
+        runBatch(args.length == 2);
+        return;
+      }
+    }
+    if (args.length != 1 || args[0].equals("--batch")) {
+      System.err.println("Usage: ParseSysML <file.sysml> | ParseSysML --batch [--inventory]");
+      System.exit(2);
+    }
+
+    String file = Path.of(args[0]).toString();
+    Result result = new Session().parse(CharStreams.fromFileName(file));
 
-    if (!all.isEmpty() || parser.getNumberOfSyntaxErrors() > 0) {
+    if (!result.ok) {
       System.out.println("ANTLR_PARSE_FAIL " + file);
-      for (String err : all) {
+      for (String err : result.errors) {
         System.out.println(err);
       }
       System.exit(1);
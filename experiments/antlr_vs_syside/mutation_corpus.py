@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Deterministic mutation corpus from the upstream SysMBench `design.sysml` samples.
+
+Each sample yields its unmutated original plus `--per-operator` mutants per
+operator:
+
+- `delete_token`: one identifier, keyword, operator or literal removed
+- `drop_brace`: one `{` or `}` removed
+- `insert_construct`: one statement from `CONSTRUCTS` inserted at the top of a
+  random body; most are grammar-valid but semantically invalid (the mismatch
+  families in `examples/mismatch_10_distinct/`), one is the known
+  HAMR-rejected keyword identifier (docs/KNOWN_DISCREPANCIES.md)
+
+Mutants are written as `<sample>__<operator>_<k>.sysml` with a `manifest.json`
+holding each file's operator and construct. The corpus is regenerated only
+when the seed, counts or source samples change.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+SAMPLES_DIR = REPO_ROOT / "sysmbench_original_upstream" / "dataset" / "sysml" / "samples"
+CORPUS_DIR = SCRIPT_DIR / "results" / "mutation_corpus"
+MANIFEST_NAME = "manifest.json"
+CORPUS_VERSION = 1
+
+OPERATORS = ("delete_token", "drop_brace", "insert_construct")
+
+# (family, statement) inserted right after an opening brace.
+CONSTRUCTS: Tuple[Tuple[str, str], ...] = (
+    ("missing_type", "part mutantPart : MutantUndefinedType;"),
+    ("missing_import", "private import MutantMissingLibrary::*;"),
+    ("missing_specialization", "part def MutantDef :> MutantMissingBase;"),
+    ("redefine_missing_feature", "attribute :>> mutantNoSuchFeature = 1;"),
+    ("missing_qualified_type", "attribute mutantAttr : MutantPkg::MutantValue;"),
+    ("keyword_identifier", "port compute;"),
+)
+
+TOKEN_RE = re.compile(
+    r"""
+    //[^\n]*
+  | /\*.*?\*/
+  | "(?:[^"\\]|\\.)*"
+  | '(?:[^'\\]|\\.)*'
+  | :>>|::>|:>|::|->|\.\.
+  | [A-Za-z_$][A-Za-z0-9_$]*
+  | \d+(?:\.\d+)?
+  | [^\s]
+    """,
+    re.S | re.X,
+)
+
+
+def token_spans(text: str) -> List[Tuple[int, int]]:
+    """(start, end) of every token outside comments."""
+    return [m.span() for m in TOKEN_RE.finditer(text) if not m.group().startswith(("//", "/*"))]
+
+
+def delete_token(text: str, rng: random.Random) -> Optional[Tuple[str, str]]:
+    spans = token_spans(text)
+    if not spans:
+        return None
+    start, end = rng.choice(spans)
+    return text[:start] + text[end:], text[start:end]
+
+
+def drop_brace(text: str, rng: random.Random) -> Optional[Tuple[str, str]]:
+    spans = [(s, e) for s, e in token_spans(text) if text[s:e] in ("{", "}")]
+    if not spans:
+        return None
+    start, end = rng.choice(spans)
+    return text[:start] + text[end:], text[start:end]
+
+
+def insert_construct(text: str, rng: random.Random) -> Optional[Tuple[str, str]]:
+    spans = [(s, e) for s, e in token_spans(text) if text[s:e] == "{"]
+    if not spans:
+        return None
+    _, end = rng.choice(spans)
+    family, statement = rng.choice(CONSTRUCTS)
+    return f"{text[:end]}\n  {statement}{text[end:]}", family
+
+
+MUTATORS = {
+    "delete_token": delete_token,
+    "drop_brace": drop_brace,
+    "insert_construct": insert_construct,
+}
+
+
+def load_samples(samples_dir: Path) -> List[Tuple[str, str]]:
+    samples = []
+    for design in sorted(samples_dir.glob("*/design.sysml")):
+        samples.append((design.parent.name, design.read_text(encoding="utf-8", errors="replace")))
+    return samples
+
+
+def corpus_key(samples: List[Tuple[str, str]], seed: int, per_operator: int) -> str:
+    h = hashlib.sha256(f"{CORPUS_VERSION}:{seed}:{per_operator}".encode("utf-8"))
+    for name, text in samples:
+        h.update(name.encode("utf-8") + b"\0" + text.encode("utf-8") + b"\0")
+    return h.hexdigest()
+
+
+def generate(samples: List[Tuple[str, str]], seed: int, per_operator: int) -> Dict[str, Dict[str, str]]:
+    """file name -> {sample, operator, detail, text}; deterministic in `seed`."""
+    files: Dict[str, Dict[str, str]] = {}
+    for name, text in samples:
+        files[f"{name}__original.sysml"] = {"sample": name, "operator": "original", "detail": "", "text": text}
+        rng = random.Random(f"{seed}:{name}")
+        for operator in OPERATORS:
+            for k in range(per_operator):
+                mutated = MUTATORS[operator](text, rng)
+                if mutated is None:
+                    continue
+                files[f"{name}__{operator}_{k}.sysml"] = {
+                    "sample": name,
+                    "operator": operator,
+                    "detail": mutated[1],
+                    "text": mutated[0],
+                }
+    return files
+
+
+def build_corpus(
+    samples_dir: Path = SAMPLES_DIR,
+    corpus_dir: Path = CORPUS_DIR,
+    seed: int = 0,
+    per_operator: int = 3,
+) -> Dict[str, Dict[str, str]]:
+    """Write (or reuse) the corpus; returns the manifest's file entries (without text)."""
+    samples = load_samples(samples_dir)
+    if not samples:
+        raise SystemExit(f"No */design.sysml samples under {samples_dir}")
+    key = corpus_key(samples, seed, per_operator)
+    manifest_path = corpus_dir / MANIFEST_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        manifest = {}
+    if manifest.get("key") == key and all((corpus_dir / name).exists() for name in manifest.get("files", {})):
+        return manifest["files"]
+
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    for stale in corpus_dir.glob("*.sysml"):
+        stale.unlink()
+    files = generate(samples, seed, per_operator)
+    entries = {}
+    for name, entry in files.items():
+        (corpus_dir / name).write_text(entry["text"], encoding="utf-8")
+        entries[name] = {k: v for k, v in entry.items() if k != "text"}
+    payload = {"key": key, "seed": seed, "per_operator": per_operator, "samples": len(samples), "files": entries}
+    manifest_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return entries
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Generate the SysML mutation corpus")
+    ap.add_argument("--samples-dir", type=Path, default=SAMPLES_DIR)
+    ap.add_argument("--corpus-dir", type=Path, default=CORPUS_DIR)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--per-operator", type=int, default=3, help="Mutants per operator per sample")
+    args = ap.parse_args()
+
+    entries = build_corpus(args.samples_dir, args.corpus_dir, args.seed, args.per_operator)
+    counts: Dict[str, int] = {}
+    for entry in entries.values():
+        counts[entry["operator"]] = counts.get(entry["operator"], 0) + 1
+    print(f"[corpus] {len(entries)} files in {args.corpus_dir}: " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,21 +3,20 @@ from __future__ import annotations
 
 import argparse
 import csv
+import json
 import os
 import re
-import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from checkers import AntlrBackend, CheckerBackend, SysideBackend, probe_all
+from mutation_corpus import CORPUS_DIR, SAMPLES_DIR, build_corpus
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 RESULTS_DIR = SCRIPT_DIR / "results"
 EXAMPLES_DIR = SCRIPT_DIR / "examples" / "mismatch_10_distinct"
-ANTLR_CHECK = SCRIPT_DIR / "antlr_check.py"
-SYSIDE_CHECK = SCRIPT_DIR / "syside_check.py"
-
-
-def run_cmd(cmd: list[str]) -> subprocess.CompletedProcess[str]:
-    return subprocess.run(cmd, capture_output=True, text=True)
 
 
 def pick_python_bin() -> str:
@@ -40,25 +39,21 @@ def compact(text: str, max_lines: int = 40) -> str:
     return "\n".join(lines[:max_lines] + ["... [truncated]"])
 
 
-def run_one(example: Path) -> dict[str, str | bool]:
-    python_bin = pick_python_bin()
-    antlr_cp = run_cmd([python_bin, str(ANTLR_CHECK), str(example)])
-    syside_cp = run_cmd([python_bin, str(SYSIDE_CHECK), str(example)])
+def run_one(example: Path, antlr: CheckerBackend, syside: CheckerBackend) -> dict[str, str | bool]:
+    antlr_res = antlr.check(example)
+    syside_res = syside.check(example)
 
-    antlr_text = (antlr_cp.stdout or "") + (("\n" + antlr_cp.stderr) if antlr_cp.stderr else "")
-    syside_text = (syside_cp.stdout or "") + (("\n" + syside_cp.stderr) if syside_cp.stderr else "")
-
-    parse_ok = antlr_cp.returncode == 0
-    compile_ok = syside_cp.returncode == 0
+    parse_ok = antlr_res.ok
+    compile_ok = syside_res.ok
 
     return {
         "example": example.name,
         "parse_ok": parse_ok,
         "compile_ok": compile_ok,
-        "antlr_returncode": str(antlr_cp.returncode),
-        "syside_returncode": str(syside_cp.returncode),
-        "antlr_errors": "" if parse_ok else compact(antlr_text),
-        "syside_errors": "" if compile_ok else compact(syside_text),
+        "antlr_returncode": str(antlr_res.returncode),
+        "syside_returncode": str(syside_res.returncode),
+        "antlr_errors": "" if parse_ok else compact(antlr_res.output),
+        "syside_errors": "" if compile_ok else compact(syside_res.output),
     }
 
 
@@ -116,12 +111,186 @@ def write_summary(rows: list[dict[str, str | bool]], out_md: Path) -> None:
     out_md.write_text("\n".join(lines), encoding="utf-8")
 
 
+def percentile(values: list[float], q: float) -> float:
+    """Linear-interpolated `q`-th percentile (0-100) of `values`."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def timed_check(backend: CheckerBackend, path: Path) -> tuple[bool, float]:
+    started = time.perf_counter()
+    ok = backend.check(path).ok
+    return ok, time.perf_counter() - started
+
+
+def bench_backend(backend: CheckerBackend, paths: list[Path], workers: int) -> dict:
+    """Check every path on `workers` threads; outcomes, per-file latencies and throughput."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        timed = list(ex.map(lambda path: timed_check(backend, path), paths))
+    wall = time.perf_counter() - started
+    # Per-thread JVMs belong to the pool's threads, which are gone now.
+    backend.close()
+    latencies = [seconds for _, seconds in timed]
+    return {
+        "outcomes": [ok for ok, _ in timed],
+        "stats": {
+            "backend": backend.name,
+            "workers": workers,
+            "files": len(paths),
+            "wall_s": wall,
+            "files_per_s": len(paths) / wall if wall > 0 else float("nan"),
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": max(latencies, default=float("nan")) * 1000,
+        },
+    }
+
+
+def agreement_matrices(operators: list[str], parse_ok: list[bool], compile_ok: list[bool]) -> dict[str, dict[str, int]]:
+    """Per operator (and "all"): counts of ANTLR/SysIDE pass-fail combinations."""
+    cells = {
+        (True, True): "parse_pass_compile_pass",
+        (True, False): "parse_pass_compile_fail",
+        (False, True): "parse_fail_compile_pass",
+        (False, False): "parse_fail_compile_fail",
+    }
+    matrices: dict[str, dict[str, int]] = {}
+    for operator, p_ok, c_ok in zip(operators, parse_ok, compile_ok):
+        for group in (operator, "all"):
+            matrix = matrices.setdefault(group, {name: 0 for name in cells.values()})
+            matrix[cells[(p_ok, c_ok)]] += 1
+    return matrices
+
+
+def write_benchmark_summary(report: dict, out_md: Path) -> None:
+    lines = ["# Checker Benchmark (mutation corpus)", ""]
+    corpus = report["corpus"]
+    lines.append(f"- Corpus: {corpus['files']} files from {corpus['dir']} (seed {corpus['seed']}, {corpus['per_operator']} per operator)")
+    lines.append(f"- Outcomes that changed across concurrency levels: {report['unstable_files']}")
+    lines.append("")
+    lines.append("## Agreement (ANTLR parse vs SysIDE compile)")
+    lines.append("")
+    lines.append("| operator | parse PASS / compile PASS | parse PASS / compile FAIL | parse FAIL / compile PASS | parse FAIL / compile FAIL |")
+    lines.append("|---|---:|---:|---:|---:|")
+    for group, m in sorted(report["agreement"].items(), key=lambda kv: (kv[0] == "all", kv[0])):
+        lines.append(
+            f"| {group} | {m['parse_pass_compile_pass']} | {m['parse_pass_compile_fail']} "
+            f"| {m['parse_fail_compile_pass']} | {m['parse_fail_compile_fail']} |"
+        )
+    lines.append("")
+    lines.append("## Throughput and latency")
+    lines.append("")
+    lines.append("| backend | workers | files/s | p50 ms | p95 ms | p99 ms | max ms |")
+    lines.append("|---|---:|---:|---:|---:|---:|---:|")
+    for st in report["runs"]:
+        lines.append(
+            f"| {st['backend']} | {st['workers']} | {st['files_per_s']:.1f} | {st['p50_ms']:.1f} "
+            f"| {st['p95_ms']:.1f} | {st['p99_ms']:.1f} | {st['max_ms']:.1f} |"
+        )
+    out_md.parent.mkdir(parents=True, exist_ok=True)
+    out_md.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def run_benchmark(args: argparse.Namespace) -> int:
+    entries = build_corpus(args.samples_dir, args.corpus_dir, args.seed, args.per_operator)
+    names = sorted(entries)[: args.limit] if args.limit else sorted(entries)
+    paths = [args.corpus_dir / name for name in names]
+    operators = [entries[name]["operator"] for name in names]
+    print(f"[corpus] {len(paths)} files from {args.corpus_dir}")
+
+    backends = [AntlrBackend(), SysideBackend(python_bin=pick_python_bin())]
+    probes = probe_all(*backends)
+    for name, caps in probes.items():
+        print(f"[backend] {name}: " + ", ".join(f"{k}={v}" for k, v in caps.items()))
+    # An unavailable backend fails every file instantly, which would show up as
+    # bogus throughput and a one-sided agreement matrix.
+    unavailable = [name for name, caps in probes.items() if not caps["available"]]
+    if unavailable:
+        print(
+            f"Backend(s) unavailable: {', '.join(unavailable)}. "
+            "The benchmark needs both checkers; see the [backend] lines above.",
+            file=sys.stderr,
+        )
+        return 2
+
+    runs: list[dict] = []
+    outcomes: dict[str, list[list[bool]]] = {b.name: [] for b in backends}
+    for workers in args.concurrency:
+        for backend in backends:
+            result = bench_backend(backend, paths, max(1, workers))
+            outcomes[backend.name].append(result["outcomes"])
+            runs.append(result["stats"])
+            st = result["stats"]
+            print(
+                f"[bench] {st['backend']:<6} workers={st['workers']:<3} files/s={st['files_per_s']:8.1f} "
+                f"p50={st['p50_ms']:.1f}ms p95={st['p95_ms']:.1f}ms p99={st['p99_ms']:.1f}ms"
+            )
+
+    parse_ok, compile_ok = outcomes["antlr"][0], outcomes["syside"][0]
+    unstable = sum(
+        1
+        for i in range(len(paths))
+        if len({level[i] for level in outcomes["antlr"]}) > 1 or len({level[i] for level in outcomes["syside"]}) > 1
+    )
+    report = {
+        "corpus": {
+            "dir": str(args.corpus_dir),
+            "files": len(paths),
+            "seed": args.seed,
+            "per_operator": args.per_operator,
+        },
+        "backends": {b.name: b.capabilities() for b in backends},
+        "agreement": agreement_matrices(operators, parse_ok, compile_ok),
+        "unstable_files": unstable,
+        "runs": runs,
+    }
+
+    out_json = args.results_dir / "checker_benchmark.json"
+    out_csv = args.results_dir / "checker_benchmark.csv"
+    out_md = args.results_dir / "checker_benchmark.md"
+    out_json.parent.mkdir(parents=True, exist_ok=True)
+    out_json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    with out_csv.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["file", "sample", "operator", "detail", "parse_ok", "compile_ok"])
+        for name, p_ok, c_ok in zip(names, parse_ok, compile_ok):
+            entry = entries[name]
+            w.writerow([name, entry["sample"], entry["operator"], entry["detail"], p_ok, c_ok])
+    write_benchmark_summary(report, out_md)
+    print(f"Wrote: {out_json}")
+    print(f"Wrote: {out_csv}")
+    print(f"Wrote: {out_md}")
+    return 0
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Run ANTLR-vs-SysIDE mismatch experiment")
     ap.add_argument("--examples-dir", type=Path, default=EXAMPLES_DIR)
     ap.add_argument("--results-dir", type=Path, default=RESULTS_DIR)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Check a mutation corpus of the upstream samples and report agreement, latency and throughput",
+    )
+    ap.add_argument("--samples-dir", type=Path, default=SAMPLES_DIR, help="Benchmark: */design.sysml sources")
+    ap.add_argument("--corpus-dir", type=Path, default=CORPUS_DIR, help="Benchmark: generated corpus location")
+    ap.add_argument("--seed", type=int, default=0, help="Benchmark: mutation seed")
+    ap.add_argument("--per-operator", type=int, default=3, help="Benchmark: mutants per operator per sample")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8], help="Benchmark: worker counts")
+    ap.add_argument("--limit", type=int, default=0, help="Benchmark: only the first N corpus files")
     args = ap.parse_args()
 
+    if args.benchmark:
+        return run_benchmark(args)
+
     examples = sorted(args.examples_dir.glob("*.sysml"))
     if not examples:
         print(
@@ -131,7 +300,11 @@ def main() -> int:
         )
         return 2
 
-    rows = [run_one(ex) for ex in examples]
+    antlr = AntlrBackend()
+    syside = SysideBackend(python_bin=pick_python_bin())
+    probe_all(antlr, syside)
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex:
+        rows = list(ex.map(lambda example: run_one(example, antlr, syside), examples))
 
     out_csv = args.results_dir / "results.csv"
     out_md = args.results_dir / "summary.md"
@@ -6,6 +6,7 @@ import shutil
 import subprocess
 import sys
 from pathlib import Path
+from typing import Optional
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent.parent
@@ -19,7 +20,8 @@ def _is_working(cmd: list[str]) -> bool:
         return False
 
 
-def detect_syside_command() -> list[str]:
+def detect_syside_command(python_bin: Optional[str] = None) -> list[str]:
+    """Probe for a working checker; `python_bin` stands in for this interpreter."""
     if shutil.which("syside") and _is_working(["syside", "check"]):
         return ["syside", "check"]
 
@@ -27,8 +29,9 @@ def detect_syside_command() -> list[str]:
     if venv_py.exists() and _is_working([str(venv_py), "-m", "syside", "check"]):
         return [str(venv_py), "-m", "syside", "check"]
 
-    if _is_working([sys.executable, "-m", "syside", "check"]):
-        return [sys.executable, "-m", "syside", "check"]
+    python = python_bin or sys.executable
+    if _is_working([python, "-m", "syside", "check"]):
+        return [python, "-m", "syside", "check"]
 
     py3 = shutil.which("python3")
     if py3 and _is_working([py3, "-m", "syside", "check"]):
@@ -45,6 +48,14 @@ def run_syside_check(path: Path) -> subprocess.CompletedProcess[str]:
     return subprocess.run(cmd, capture_output=True, text=True)
 
 
+def format_output(path: Path, cp: subprocess.CompletedProcess[str]) -> tuple[str, str]:
+    """The (stdout, stderr) text the CLI prints for one checked file."""
+    out_lines = [cp.stdout.rstrip()] if cp.stdout else []
+    marker = "SYSIDE_COMPILE_PASS" if cp.returncode == 0 else "SYSIDE_COMPILE_FAIL"
+    out_lines.append(f"{marker} {path}")
+    return "\n".join(out_lines), cp.stderr.rstrip() if cp.stderr else ""
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Run SysIDE compile check for one SysML file")
     ap.add_argument("sysml_file", type=Path, help="Path to .sysml file")
@@ -60,16 +71,10 @@ def main() -> int:
         print(f"ERROR: {exc}", file=sys.stderr)
         return 2
 
-    if cp.stdout:
-        print(cp.stdout.rstrip())
-    if cp.stderr:
-        print(cp.stderr.rstrip(), file=sys.stderr)
-
-    if cp.returncode == 0:
-        print(f"SYSIDE_COMPILE_PASS {args.sysml_file}")
-    else:
-        print(f"SYSIDE_COMPILE_FAIL {args.sysml_file}")
-
+    out_text, err_text = format_output(args.sysml_file, cp)
+    print(out_text)
+    if err_text:
+        print(err_text, file=sys.stderr)
     return cp.returncode
 
 
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Bulk structural element inventory of generated and ground-truth SysML files.
+
+Every `<root>/<id>/<id>.sysml` (generated) and `<id>_groundtruth.sysml` is
+parsed once by the HAMR ANTLR grammar through `ParseSysML --batch --inventory`,
+which reports how many parse-tree nodes each grammar rule produced. The rule
+counts are folded into element kinds (ELEMENT_RULES) and stored in SQLite:
+
+    inventory_files   path, root, provider, model_id, kind, mtime_ns, size, sha256
+    inventory_parses  sha256, parser_key, parse_ok, error_count, <element counts>, rules_json
+    inventory         view: files joined with their parse
+    inventory_pairs   view: each generated file next to the ground truth of the same case
+
+Parses are keyed by content hash and by the digest of the parser artifacts, so
+identical files (the ground truth repeats under every root) are parsed once and
+refreshes only parse new or changed content.
+
+Usage:
+    python experiments/antlr_vs_syside/sysml_inventory.py [--root ...] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from antlr_check import ANTLR_JAR, HAMR_CLASSES_DIR, DaemonUnavailable, ParseDaemon
+from checkers import artifacts_sha256
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+
+DEFAULT_INDEX_PATH = SCRIPT_DIR / "results" / "sysml_inventory.sqlite"
+DEFAULT_ROOT_GLOBS = ["api_loop/Generated_from_Prompts_*", "ai_agent/Generated_from_Prompts_*"]
+ROOT_PREFIX = "Generated_from_Prompts_"
+GROUND_TRUTH_SUFFIX = "_groundtruth.sysml"
+
+# Element kind -> HAMR SysMLv2.g4 rules whose parse-tree nodes count as one element each.
+ELEMENT_RULES: Dict[str, List[str]] = {
+    "packages": ["rulePackage", "ruleLibraryPackage"],
+    "imports": ["ruleMembershipImport", "ruleNamespaceImport"],
+    "part_defs": ["rulePartDefinition"],
+    "parts": ["rulePartUsage"],
+    "attribute_defs": ["ruleAttributeDefinition"],
+    "attributes": ["ruleAttributeUsage"],
+    "port_defs": ["rulePortDefinition"],
+    "ports": ["rulePortUsage"],
+    "item_defs": ["ruleItemDefinition"],
+    "items": ["ruleItemUsage"],
+    "enum_defs": ["ruleEnumerationDefinition"],
+    "enum_values": ["ruleEnumeratedValue"],
+    "connection_defs": ["ruleConnectionDefinition"],
+    "connections": ["ruleConnectionUsage", "ruleBindingConnectorAsUsage"],
+    "interface_defs": ["ruleInterfaceDefinition"],
+    "interfaces": ["ruleInterfaceUsage"],
+    "flows": ["ruleFlowUsage", "ruleSuccessionFlowUsage"],
+    "action_defs": ["ruleActionDefinition"],
+    "actions": ["ruleActionUsage"],
+    "state_defs": ["ruleStateDefinition"],
+    "states": ["ruleStateUsage"],
+    "requirement_defs": ["ruleRequirementDefinition"],
+    "requirements": ["ruleRequirementUsage"],
+    "constraint_defs": ["ruleConstraintDefinition"],
+    "constraints": ["ruleConstraintUsage"],
+}
+ELEMENT_KINDS = list(ELEMENT_RULES)
+# Bump when ELEMENT_RULES or the schema changes; older indexes are dropped and rebuilt.
+INVENTORY_VERSION = 1
+
+_COUNT_COLUMNS = ",\n".join(f"    {kind} INTEGER NOT NULL" for kind in ELEMENT_KINDS)
+TABLE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS inventory_files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS inventory_files_case ON inventory_files (model_id, kind);
+CREATE INDEX IF NOT EXISTS inventory_files_root ON inventory_files (root, kind, model_id);
+CREATE INDEX IF NOT EXISTS inventory_files_sha ON inventory_files (sha256);
+CREATE TABLE IF NOT EXISTS inventory_parses (
+    sha256 TEXT PRIMARY KEY,
+    parser_key TEXT NOT NULL,
+    parse_ok INTEGER NOT NULL,
+    error_count INTEGER NOT NULL,
+{_COUNT_COLUMNS},
+    rules_json TEXT NOT NULL
+);
+CREATE VIEW IF NOT EXISTS inventory AS
+SELECT f.*, p.parse_ok, p.error_count, {", ".join(f"p.{kind}" for kind in ELEMENT_KINDS)}
+FROM inventory_files f JOIN inventory_parses p ON p.sha256 = f.sha256;
+CREATE VIEW IF NOT EXISTS inventory_pairs AS
+SELECT g.root AS root, g.provider AS provider, g.model_id AS model_id,
+    g.path AS generated_path, t.path AS ground_truth_path,
+    g.parse_ok AS gen_parse_ok, t.parse_ok AS gt_parse_ok,
+    {", ".join(f"g.{kind} AS gen_{kind}, t.{kind} AS gt_{kind}" for kind in ELEMENT_KINDS)}
+FROM inventory g JOIN inventory t
+    ON t.root = g.root AND t.model_id = g.model_id AND t.kind = 'ground_truth'
+WHERE g.kind = 'generated';
+"""
+
+
+def provider_from_root(root: Path) -> str:
+    """`.../Generated_from_Prompts_API_LOOP_OPENAI` -> `OPENAI`, `..._AI_AGENT` -> `AI_AGENT`."""
+    name = root.name
+    if name.startswith(ROOT_PREFIX):
+        name = name[len(ROOT_PREFIX):]
+    if name.startswith("API_LOOP_"):
+        name = name[len("API_LOOP_"):]
+    return name or root.name
+
+
+def default_roots() -> List[Path]:
+    return sorted(p for pattern in DEFAULT_ROOT_GLOBS for p in REPO_ROOT.glob(pattern) if p.is_dir())
+
+
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def element_counts(rules: Dict[str, int]) -> Dict[str, int]:
+    return {kind: sum(int(rules.get(rule, 0)) for rule in names) for kind, names in ELEMENT_RULES.items()}
+
+
+def case_files(root: Path) -> Iterable[Tuple[int, str, Path]]:
+    """(model_id, kind, path) for each generated/ground-truth file under `root`."""
+    model_dirs = [d for d in root.iterdir() if d.is_dir() and d.name.isdigit()] if root.is_dir() else []
+    for model_dir in sorted(model_dirs, key=lambda d: int(d.name)):
+        for kind, suffix in (("generated", ".sysml"), ("ground_truth", GROUND_TRUTH_SUFFIX)):
+            path = model_dir / f"{model_dir.name}{suffix}"
+            if path.is_file():
+                yield int(model_dir.name), kind, path
+
+
+class _DaemonPool:
+    """One `--inventory` daemon per worker thread, closed together."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._daemons: List[ParseDaemon] = []
+
+    def request(self, path: Path) -> dict:
+        daemon = getattr(self._local, "daemon", None)
+        if daemon is None:
+            daemon = ParseDaemon(inventory=True)
+            self._local.daemon = daemon
+            with self._lock:
+                self._daemons.append(daemon)
+        return daemon.request(path)
+
+    def close(self) -> None:
+        with self._lock:
+            for daemon in self._daemons:
+                daemon.close()
+            self._daemons.clear()
+
+
+class InventoryIndex:
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != INVENTORY_VERSION:
+            self.conn.executescript(
+                "DROP VIEW IF EXISTS inventory_pairs; DROP VIEW IF EXISTS inventory;"
+                "DROP TABLE IF EXISTS inventory_parses; DROP TABLE IF EXISTS inventory_files;"
+            )
+            self.conn.execute(f"PRAGMA user_version = {INVENTORY_VERSION}")
+        self.conn.executescript(TABLE_SCHEMA)
+        self.stats = {"scanned": 0, "unchanged": 0, "touched": 0, "hashed": 0, "parsed": 0, "removed": 0}
+
+    def __enter__(self) -> "InventoryIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def refresh(self, roots: Iterable[Path], workers: int = 4) -> Dict[str, int]:
+        """Index `roots`, parsing each content hash not yet parsed by the current artifacts."""
+        parser_key = artifacts_sha256(HAMR_CLASSES_DIR, ANTLR_JAR)
+        for root in roots:
+            self._refresh_root(Path(root).resolve())
+
+        todo: Dict[str, Path] = {}
+        for row in self.conn.execute(
+            "SELECT f.sha256, f.path FROM inventory_files f LEFT JOIN inventory_parses p "
+            "ON p.sha256 = f.sha256 AND p.parser_key = ? WHERE p.sha256 IS NULL",
+            (parser_key,),
+        ):
+            todo.setdefault(row["sha256"], Path(row["path"]))
+        if todo:
+            self._parse(todo, parser_key, workers)
+        self.conn.commit()
+        return dict(self.stats)
+
+    def _refresh_root(self, root: Path) -> None:
+        provider = provider_from_root(root)
+        known = {
+            row["path"]: row
+            for row in self.conn.execute(
+                "SELECT path, mtime_ns, size, sha256 FROM inventory_files WHERE root = ?", (str(root),)
+            )
+        }
+        seen = set()
+        for model_id, kind, path in case_files(root):
+            stat = path.stat()
+            key = str(path)
+            seen.add(key)
+            self.stats["scanned"] += 1
+            row = known.get(key)
+            if row is not None and row["mtime_ns"] == stat.st_mtime_ns and row["size"] == stat.st_size:
+                self.stats["unchanged"] += 1
+                continue
+            sha256 = file_sha256(path)
+            self.stats["touched" if row is not None and row["sha256"] == sha256 else "hashed"] += 1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO inventory_files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, str(root), provider, model_id, kind, stat.st_mtime_ns, stat.st_size, sha256),
+            )
+        stale = [path for path in known if path not in seen]
+        for path in stale:
+            self.conn.execute("DELETE FROM inventory_files WHERE path = ?", (path,))
+        self.stats["removed"] += len(stale)
+
+    def _parse(self, todo: Dict[str, Path], parser_key: str, workers: int) -> None:
+        pool = _DaemonPool()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+                results = list(ex.map(lambda item: (item[0], pool.request(item[1])), todo.items()))
+        except DaemonUnavailable as exc:
+            raise SystemExit(f"ERROR: {exc}. `ParseSysML --batch --inventory` is required.") from exc
+        finally:
+            pool.close()
+        for sha256, result in results:
+            rules = {str(k): int(v) for k, v in (result.get("rules") or {}).items()}
+            counts = element_counts(rules)
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO inventory_parses VALUES ({', '.join('?' for _ in range(len(ELEMENT_KINDS) + 5))})",
+                (
+                    sha256, parser_key, int(bool(result["ok"])), len(result["errors"]),
+                    *(counts[kind] for kind in ELEMENT_KINDS),
+                    json.dumps(rules, sort_keys=True),
+                ),
+            )
+        self.conn.execute(
+            "DELETE FROM inventory_parses WHERE sha256 NOT IN (SELECT sha256 FROM inventory_files)"
+        )
+        self.stats["parsed"] += len(results)
+
+    def rows(self, kind: Optional[str] = None, roots: Optional[Iterable[Path]] = None) -> List[sqlite3.Row]:
+        """`inventory` view rows, optionally limited to one kind and/or `roots`."""
+        sql = "SELECT * FROM inventory WHERE 1 = 1"
+        params: List[object] = []
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        if roots is not None:
+            root_list = [str(Path(root).resolve()) for root in roots]
+            sql += f" AND root IN ({', '.join('?' for _ in root_list)})"
+            params.extend(root_list)
+        sql += " ORDER BY root, model_id, kind"
+        return list(self.conn.execute(sql, params))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build/refresh the SysML element inventory index.")
+    parser.add_argument(
+        "--root",
+        type=Path,
+        nargs="+",
+        default=None,
+        help=f"Generated roots with <id>/<id>.sysml and <id>/<id>{GROUND_TRUTH_SUFFIX} "
+        f"(default: {', '.join(DEFAULT_ROOT_GLOBS)} under the repo root).",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=DEFAULT_INDEX_PATH,
+        help="SQLite index path (default: %(default)s).",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Parallel parse daemons (JVMs).")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Drop all parses and re-parse every file.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    roots = args.root or default_roots()
+    if not roots:
+        raise SystemExit("No generated roots found")
+    with InventoryIndex(args.index) as index:
+        if args.rebuild:
+            index.conn.execute("DELETE FROM inventory_parses")
+        stats = index.refresh(roots, workers=args.workers)
+        generated = index.rows("generated", roots)
+        truth = index.rows("ground_truth", roots)
+    print(
+        f"[inventory] scanned={stats['scanned']} unchanged={stats['unchanged']} "
+        f"touched={stats['touched']} hashed={stats['hashed']} parsed={stats['parsed']} "
+        f"removed={stats['removed']} generated={len(generated)} ground_truth={len(truth)} index={args.index}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Dependency-tracked build of the syntax-campaign paper results.
+
+Steps (extract -> stats -> one step per table and per figure) declare their
+command, input files and output files; dependencies follow from outputs that
+other steps read. A step re-runs only when the content hash of its command and
+inputs changed since its last successful run, or when one of its outputs is
+missing or was modified. Steps whose dependencies are done run concurrently
+(--jobs), so independent tables and figures render in parallel, and a step whose
+outputs come out byte-identical does not invalidate anything downstream.
+
+Usage:
+    python paper/results/scripts/build_pipeline.py              # rebuild whatever is stale
+    python paper/results/scripts/build_pipeline.py 'figure:1*'  # matching steps + their dependencies
+    python paper/results/scripts/build_pipeline.py --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parents[2]
+
+from make_syntax_figures import FIGURES  # noqa: E402
+from make_syntax_tables import TABLES  # noqa: E402
+from syntax_data import parquet_available  # noqa: E402
+
+STATE_VERSION = 1
+DEFAULT_STATE_PATH = REPO_ROOT / "paper" / "results" / ".build_state.json"
+EXTRACTED_TABLES = ("prompt_level_syntax_metrics", "iteration_level_syntax_metrics", "iteration_error_families")
+STATS_TABLES = ("model_level_syntax_summary", "error_taxonomy_summary", "provider_comparisons")
+
+
+@dataclass
+class Step:
+    name: str
+    argv: List[str]
+    inputs: List[Path]
+    outputs: List[Path]
+    # Pass --workers <jobs> at run time; not part of the step signature.
+    pooled: bool = False
+    deps: Set[str] = field(default_factory=set)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild stale paper results steps.")
+    parser.add_argument("targets", nargs="*", help="Step name patterns (fnmatch), e.g. 'table:*' (default: all).")
+    parser.add_argument("--api-loop-root", type=Path, default=REPO_ROOT / "api_loop")
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "paper" / "results" / "data")
+    parser.add_argument("--tables-dir", type=Path, default=REPO_ROOT / "paper" / "results" / "tables")
+    parser.add_argument("--figures-dir", type=Path, default=REPO_ROOT / "paper" / "results" / "figures")
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        default=REPO_ROOT / "sysmbench_original_upstream" / "dataset" / "sysml" / "dataset.json",
+    )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=DEFAULT_STATE_PATH,
+        help="Build state file (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Steps run concurrently (default: %(default)s).",
+    )
+    parser.add_argument("--force", action="store_true", help="Re-run selected steps even if up to date.")
+    parser.add_argument("--dry-run", action="store_true", help="List stale steps without running them.")
+    parser.add_argument("--list", action="store_true", help="List steps with their inputs/outputs and exit.")
+    parser.add_argument("--verbose", action="store_true", help="Echo the output of every step.")
+    args = parser.parse_args()
+    if args.jobs <= 0:
+        raise SystemExit("--jobs must be > 0")
+    return args
+
+
+def table_files(data_dir: Path, tables: Sequence[str]) -> List[Path]:
+    suffixes = (".csv", ".parquet") if parquet_available() else (".csv",)
+    return [data_dir / f"{table}{suffix}" for table in tables for suffix in suffixes]
+
+
+def define_steps(args: argparse.Namespace) -> Dict[str, Step]:
+    py = sys.executable
+    data_dir = args.data_dir.resolve()
+    tables_dir = args.tables_dir.resolve()
+    figures_dir = args.figures_dir.resolve()
+    api_loop_root = args.api_loop_root.resolve()
+    shared = [SCRIPT_DIR / "syntax_data.py"]
+
+    steps = [
+        Step(
+            "extract",
+            [
+                py, str(SCRIPT_DIR / "extract_syntax_metrics.py"),
+                "--repo-root", str(REPO_ROOT),
+                "--api-loop-root", str(api_loop_root),
+                "--output-data-dir", str(data_dir),
+            ],
+            [SCRIPT_DIR / "extract_syntax_metrics.py", *shared,
+             *sorted(api_loop_root.glob("Generated_from_Prompts_API_LOOP_*/**/*.json"))],
+            [*table_files(data_dir, EXTRACTED_TABLES), data_dir / "campaign_manifest.json"],
+            pooled=True,
+        ),
+        Step(
+            "stats",
+            [
+                py, str(SCRIPT_DIR / "compute_syntax_stats.py"),
+                "--input-data-dir", str(data_dir),
+                "--output-data-dir", str(data_dir),
+                "--dataset", str(args.dataset.resolve()),
+            ],
+            [SCRIPT_DIR / "compute_syntax_stats.py", *shared,
+             REPO_ROOT / "evaluation_scripts" / "dataset_index.py", args.dataset.resolve(),
+             *table_files(data_dir, EXTRACTED_TABLES)],
+            [*table_files(data_dir, STATS_TABLES), data_dir / "stat_tests.json"],
+            pooled=True,
+        ),
+    ]
+    for table in TABLES:
+        steps.append(
+            Step(
+                f"table:{table.key}",
+                [
+                    py, str(SCRIPT_DIR / "make_syntax_tables.py"),
+                    "--data-dir", str(data_dir), "--tables-dir", str(tables_dir),
+                    "--only", table.key, "--workers", "1",
+                ],
+                [SCRIPT_DIR / "make_syntax_tables.py", *shared, *table_files(data_dir, table.tables)],
+                [tables_dir / table.filename],
+            )
+        )
+    for figure in FIGURES:
+        steps.append(
+            Step(
+                f"figure:{figure.key}",
+                [
+                    py, str(SCRIPT_DIR / "make_syntax_figures.py"),
+                    "--data-dir", str(data_dir), "--figures-dir", str(figures_dir),
+                    "--only", figure.key, "--workers", "1",
+                ],
+                [SCRIPT_DIR / "make_syntax_figures.py", *shared, *table_files(data_dir, figure.tables)],
+                [figures_dir / figure.filename],
+            )
+        )
+    steps.append(
+        Step(
+            "figure:catalog",
+            [py, str(SCRIPT_DIR / "make_syntax_figures.py"), "--figures-dir", str(figures_dir), "--catalog-only"],
+            [SCRIPT_DIR / "make_syntax_figures.py"],
+            [figures_dir / "FIGURE_CATALOG.md"],
+        )
+    )
+
+    producers = {output: step.name for step in steps for output in step.outputs}
+    for step in steps:
+        step.deps = {producers[path] for path in step.inputs if path in producers} - {step.name}
+    return {step.name: step for step in steps}
+
+
+def select_steps(steps: Dict[str, Step], patterns: Sequence[str]) -> Set[str]:
+    if not patterns:
+        return set(steps)
+    selected = {name for name in steps if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)}
+    if not selected:
+        raise SystemExit(f"No steps match: {' '.join(patterns)}")
+    queue = list(selected)
+    while queue:
+        for dep in steps[queue.pop()].deps:
+            if dep not in selected:
+                selected.add(dep)
+                queue.append(dep)
+    return selected
+
+
+class BuildState:
+    """Step signatures/output hashes plus an (mtime, size) -> sha256 memo for every file seen."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        data: Dict[str, Any] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            data = {}
+        self.files: Dict[str, List[Any]] = data.get("files", {})
+        self.steps: Dict[str, Dict[str, Any]] = data.get("steps", {})
+
+    def digest(self, path: Path) -> Optional[str]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        key = str(path)
+        memo = self.files.get(key)
+        if memo is not None and memo[0] == stat.st_mtime_ns and memo[1] == stat.st_size:
+            return memo[2]
+        sha256 = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.files[key] = [stat.st_mtime_ns, stat.st_size, sha256]
+        return sha256
+
+    def signature(self, step: Step) -> str:
+        payload = {
+            "argv": step.argv[1:],
+            "inputs": [[str(path), self.digest(path)] for path in sorted(set(step.inputs))],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def is_stale(self, step: Step) -> bool:
+        record = self.steps.get(step.name)
+        if record is None or record.get("signature") != self.signature(step):
+            return True
+        outputs = record.get("outputs", {})
+        return any(outputs.get(str(path)) is None or outputs[str(path)] != self.digest(path) for path in step.outputs)
+
+    def record(self, step: Step, signature: str) -> None:
+        self.steps[step.name] = {
+            "signature": signature,
+            "outputs": {str(path): self.digest(path) for path in step.outputs},
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": STATE_VERSION, "files": self.files, "steps": self.steps}
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, sort_keys=True, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def run_step(argv: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(argv, cwd=REPO_ROOT, capture_output=True, text=True, check=False)
+
+
+def build(steps: Dict[str, Step], selected: Set[str], state: BuildState, args: argparse.Namespace) -> int:
+    done: Set[str] = set()
+    failed: Set[str] = set()
+    ran = skipped = 0
+    running: Dict[Future, tuple] = {}
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        while True:
+            active = {name for name, _, _ in running.values()}
+            ready = sorted(
+                name for name in selected - done - failed - active
+                if steps[name].deps & selected <= done
+            )
+            progressed = False
+            for name in ready:
+                step = steps[name]
+                if not args.force and not state.is_stale(step):
+                    done.add(name)
+                    skipped += 1
+                    progressed = True
+                    continue
+                argv = [*step.argv, *(["--workers", str(args.jobs)] if step.pooled else [])]
+                running[pool.submit(run_step, argv)] = (name, state.signature(step), time.perf_counter())
+            if progressed:
+                continue
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, signature, started = running.pop(future)
+                proc = future.result()
+                elapsed = time.perf_counter() - started
+                if args.verbose or proc.returncode != 0:
+                    sys.stdout.write(proc.stdout)
+                    sys.stderr.write(proc.stderr)
+                if proc.returncode != 0:
+                    print(f"[fail] {name} (exit {proc.returncode}, {elapsed:.1f}s)")
+                    failed.add(name)
+                    continue
+                state.record(steps[name], signature)
+                state.save()
+                done.add(name)
+                ran += 1
+                print(f"[run] {name} ({elapsed:.1f}s)")
+
+    blocked = selected - done - failed
+    state.save()
+    print(f"[build] ran={ran} up_to_date={skipped} failed={len(failed)} blocked={len(blocked)}")
+    if failed:
+        for name in sorted(blocked):
+            print(f"[blocked] {name}")
+        return 1
+    return 0
+
+
+def dry_run(steps: Dict[str, Step], selected: Set[str], state: BuildState, force: bool) -> None:
+    order: List[str] = []
+    seen: Set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in seen:
+            return
+        seen.add(name)
+        for dep in sorted(steps[name].deps & selected):
+            visit(dep)
+        order.append(name)
+
+    for name in sorted(selected):
+        visit(name)
+    stale: Set[str] = set()
+    for name in order:
+        step = steps[name]
+        if force or state.is_stale(step):
+            stale.add(name)
+            print(f"[stale] {name}")
+        elif step.deps & stale:
+            stale.add(name)
+            print(f"[stale] {name} (if upstream output changes)")
+    print(f"[dry-run] {len(stale)} of {len(selected)} step(s) would run")
+
+
+def main() -> None:
+    args = parse_args()
+    steps = define_steps(args)
+    selected = select_steps(steps, args.targets)
+    if args.list:
+        for name in sorted(selected):
+            step = steps[name]
+            deps = ", ".join(sorted(step.deps)) or "-"
+            print(f"{name}: {len(step.inputs)} input(s), {len(step.outputs)} output(s), deps: {deps}")
+        return
+    state = BuildState(args.state.resolve())
+    if args.dry_run:
+        dry_run(steps, selected, state, args.force)
+        state.save()
+        return
+    raise SystemExit(build(steps, selected, state, args))
+
+
+if __name__ == "__main__":
+    main()
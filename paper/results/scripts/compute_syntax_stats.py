@@ -4,17 +4,27 @@
 from __future__ import annotations
 
 import argparse
+import itertools
 import json
 import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 from statsmodels.stats.contingency_tables import mcnemar
 from statsmodels.stats.proportion import proportion_confint
 
+from syntax_data import load_table, write_frame
+
+# Upper bound on resample-index cells (resamples x sample size) held per chunk.
+BOOTSTRAP_MAX_CELLS = 2_000_000
+COMPARISON_METRICS = ("first_shot_pass", "eventual_pass")
+
 
 def parse_args() -> argparse.Namespace:
     script_dir = Path(__file__).resolve().parent
@@ -32,19 +42,38 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--bootstrap-seed", type=int, default=20260220)
     parser.add_argument("--bootstrap-resamples", type=int, default=10000)
-    return parser.parse_args()
-
-
-def to_bool_series(s: pd.Series) -> pd.Series:
-    if s.dtype == bool:
-        return s
-    mapping = {
-        "true": True,
-        "false": False,
-        "1": True,
-        "0": False,
-    }
-    return s.astype(str).str.strip().str.lower().map(mapping)
+    parser.add_argument(
+        "--bootstrap-max-cells",
+        type=int,
+        default=BOOTSTRAP_MAX_CELLS,
+        help="Resample-index cells per chunk; bounds bootstrap memory (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used for per-group statistics (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--comparison-strata",
+        choices=("difficulty", "none"),
+        default="difficulty",
+        help=(
+            "Strata for the paired provider-comparison bootstrap: dataset difficulty bucket "
+            "(from evaluation_scripts/dataset_index.py) or none."
+        ),
+    )
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        default=repo_root / "sysmbench_original_upstream" / "dataset" / "sysml" / "dataset.json",
+    )
+    args = parser.parse_args()
+    if args.workers <= 0:
+        raise SystemExit("--workers must be > 0")
+    if args.bootstrap_max_cells <= 0:
+        raise SystemExit("--bootstrap-max-cells must be > 0")
+    return args
 
 
 def wilson_ci(count: int, nobs: int, alpha: float = 0.05) -> Tuple[Optional[float], Optional[float]]:
@@ -54,43 +83,94 @@ def wilson_ci(count: int, nobs: int, alpha: float = 0.05) -> Tuple[Optional[floa
     return float(lo), float(hi)
 
 
-def bootstrap_mean_ci(values: np.ndarray, seed: int, n_resamples: int = 10000) -> Tuple[Optional[float], Optional[float]]:
+def bootstrap_means(
+    values: np.ndarray,
+    seed: int,
+    n_resamples: int = 10000,
+    strata: Optional[np.ndarray] = None,
+    max_cells: int = BOOTSTRAP_MAX_CELLS,
+) -> np.ndarray:
+    """Bootstrap distribution of the mean.
+
+    `values` is 1-D, or (k, n) for a paired bootstrap in which every row is
+    resampled with the same indices. Resample indices are drawn as (chunk, n)
+    matrices with chunk * n <= `max_cells`. Without `strata` a single
+    `default_rng(seed)` draws integers, which reproduces the original per-resample
+    `rng.choice` loop exactly, whatever the chunk size. With `strata`, indices
+    are drawn within each stratum (preserving stratum sizes) from a generator
+    per stratum spawned from `seed`.
+    """
+    data = np.atleast_2d(np.asarray(values, dtype=float))
+    n = data.shape[1]
+    chunk = max(1, min(n_resamples, max_cells // max(1, n)))
+    means = np.empty((data.shape[0], n_resamples), dtype=float)
+    if strata is None:
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_resamples, chunk):
+            rows = min(chunk, n_resamples - start)
+            idx = rng.integers(0, n, size=(rows, n))
+            means[:, start : start + rows] = data[:, idx].mean(axis=2)
+        return means if np.ndim(values) > 1 else means[0]
+
+    strata = np.asarray(strata)
+    members = [np.flatnonzero(strata == level) for level in np.unique(strata)]
+    rngs = [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(len(members))]
+    for start in range(0, n_resamples, chunk):
+        rows = min(chunk, n_resamples - start)
+        idx = np.empty((rows, n), dtype=np.intp)
+        col = 0
+        for rng, pool in zip(rngs, members):
+            size = pool.size
+            idx[:, col : col + size] = pool[rng.integers(0, size, size=(rows, size))]
+            col += size
+        means[:, start : start + rows] = data[:, idx].mean(axis=2)
+    return means if np.ndim(values) > 1 else means[0]
+
+
+def bootstrap_mean_ci(
+    values: np.ndarray,
+    seed: int,
+    n_resamples: int = 10000,
+    strata: Optional[np.ndarray] = None,
+    max_cells: int = BOOTSTRAP_MAX_CELLS,
+) -> Tuple[Optional[float], Optional[float]]:
     if values.size == 0:
         return None, None
-    rng = np.random.default_rng(seed)
-    n = values.size
-    means = np.empty(n_resamples, dtype=float)
-    for i in range(n_resamples):
-        sample = rng.choice(values, size=n, replace=True)
-        means[i] = float(np.mean(sample))
+    means = bootstrap_means(values, seed, n_resamples, strata=strata, max_cells=max_cells)
     lo, hi = np.quantile(means, [0.025, 0.975])
     return float(lo), float(hi)
 
 
+def paired_bootstrap_diff_ci(
+    a: np.ndarray,
+    b: np.ndarray,
+    seed: int,
+    n_resamples: int = 10000,
+    strata: Optional[np.ndarray] = None,
+    max_cells: int = BOOTSTRAP_MAX_CELLS,
+) -> Tuple[Optional[float], Optional[float]]:
+    """95% CI of mean(a) - mean(b) for prompt-aligned samples (same resample indices)."""
+    if a.size == 0:
+        return None, None
+    means = bootstrap_means(np.vstack([a, b]), seed, n_resamples, strata=strata, max_cells=max_cells)
+    lo, hi = np.quantile(means[0] - means[1], [0.025, 0.975])
+    return float(lo), float(hi)
+
+
+def run_tasks(func: Callable[..., Any], tasks: Sequence[Tuple[Any, ...]], workers: int) -> List[Any]:
+    """Apply `func` to each argument tuple, in order, across a process pool."""
+    if workers <= 1 or len(tasks) <= 1:
+        return [func(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        return list(executor.map(func, *zip(*tasks)))
+
+
 def safe_pct(num: float, den: float) -> Optional[float]:
     if den == 0:
         return None
     return 100.0 * num / den
 
 
-def _json_load_dict(text: Any) -> Dict[str, int]:
-    if not isinstance(text, str) or not text.strip():
-        return {}
-    try:
-        obj = json.loads(text)
-    except Exception:
-        return {}
-    if not isinstance(obj, dict):
-        return {}
-    out: Dict[str, int] = {}
-    for k, v in obj.items():
-        try:
-            out[str(k)] = int(v)
-        except Exception:
-            continue
-    return out
-
-
 @dataclass
 class GroupStats:
     provider: str
@@ -133,10 +213,11 @@ def compute_group_stats(
     model: str,
     bootstrap_seed: int,
     bootstrap_resamples: int,
+    bootstrap_max_cells: int = BOOTSTRAP_MAX_CELLS,
 ) -> GroupStats:
     total = int(len(sub))
-    fs = to_bool_series(sub["first_shot_pass"]).fillna(False)
-    ev = to_bool_series(sub["eventual_pass"]).fillna(False)
+    fs = sub["first_shot_pass"]
+    ev = sub["eventual_pass"]
 
     first_pass = int(fs.sum())
     first_fail = total - first_pass
@@ -155,7 +236,7 @@ def compute_group_stats(
     ev_lo, ev_hi = wilson_ci(eventual_pass, total)
     un_lo, un_hi = wilson_ci(unresolved, total)
 
-    iters = pd.to_numeric(sub["iterations_to_success"], errors="coerce").dropna().to_numpy(dtype=float)
+    iters = sub["iterations_to_success"].dropna().to_numpy(dtype=float)
     if iters.size:
         mean_iters = float(np.mean(iters))
         median_iters = float(np.median(iters))
@@ -163,7 +244,9 @@ def compute_group_stats(
         max_iters = float(np.max(iters))
         q25 = float(np.quantile(iters, 0.25))
         q75 = float(np.quantile(iters, 0.75))
-        boot_lo, boot_hi = bootstrap_mean_ci(iters, bootstrap_seed, bootstrap_resamples)
+        boot_lo, boot_hi = bootstrap_mean_ci(
+            iters, bootstrap_seed, bootstrap_resamples, max_cells=bootstrap_max_cells
+        )
     else:
         mean_iters = median_iters = std_iters = max_iters = q25 = q75 = None
         boot_lo = boot_hi = None
@@ -219,13 +302,69 @@ def compute_group_stats(
     )
 
 
+def load_strata(args: argparse.Namespace) -> Dict[int, str]:
+    """prompt_id -> stratum label for the comparison bootstrap ({} when disabled/unavailable)."""
+    if args.comparison_strata == "none":
+        return {}
+    repo_root = Path(__file__).resolve().parents[3]
+    sys.path.insert(0, str(repo_root / "evaluation_scripts"))
+    try:
+        from dataset_index import load_dataset_index
+    except ImportError:
+        return {}
+    if not args.dataset.exists():
+        print(f"[warn] dataset not found ({args.dataset}); comparison bootstrap is unstratified")
+        return {}
+    records = load_dataset_index(args.dataset)
+    return {model_id: str(meta[args.comparison_strata]) for model_id, meta in records.items()}
+
+
+def compare_pair(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    key_left: Tuple[str, str],
+    key_right: Tuple[str, str],
+    strata_map: Dict[int, str],
+    bootstrap_seed: int,
+    bootstrap_resamples: int,
+    bootstrap_max_cells: int,
+) -> List[Dict[str, Any]]:
+    """Paired (prompt-aligned), optionally stratified, bootstrap of pass-rate differences."""
+    cols = ["prompt_id", *COMPARISON_METRICS]
+    merged = left[cols].merge(right[cols], on="prompt_id", suffixes=("_a", "_b")).sort_values("prompt_id")
+    strata = None
+    if strata_map:
+        strata = merged["prompt_id"].map(strata_map).fillna("unknown").astype(str).to_numpy()
+    rows: List[Dict[str, Any]] = []
+    for metric in COMPARISON_METRICS:
+        a = merged[f"{metric}_a"].to_numpy(dtype=float)
+        b = merged[f"{metric}_b"].to_numpy(dtype=float)
+        lo, hi = paired_bootstrap_diff_ci(
+            a, b, bootstrap_seed, bootstrap_resamples, strata=strata, max_cells=bootstrap_max_cells
+        )
+        rows.append(
+            {
+                "provider_a": key_left[0],
+                "model_a": key_left[1],
+                "provider_b": key_right[0],
+                "model_b": key_right[1],
+                "metric": metric,
+                "paired_prompts": int(a.size),
+                "rate_a_pct": safe_pct(float(a.sum()), a.size),
+                "rate_b_pct": safe_pct(float(b.sum()), b.size),
+                "diff_pp": safe_pct(float(a.sum() - b.sum()), a.size),
+                "diff_ci95_low_pp": None if lo is None else 100.0 * lo,
+                "diff_ci95_high_pp": None if hi is None else 100.0 * hi,
+                "strata": "none" if strata is None else "difficulty",
+            }
+        )
+    return rows
+
+
 def explode_error_rows(iter_df: pd.DataFrame) -> pd.DataFrame:
     rows: List[Dict[str, Any]] = []
     for rec in iter_df.to_dict(orient="records"):
-        fam = _json_load_dict(rec.get("error_families_json"))
-        if not fam:
-            continue
-        for k, v in fam.items():
+        for k, v in rec["error_families"].items():
             rows.append(
                 {
                     "provider": rec["provider"],
@@ -239,147 +378,103 @@ def explode_error_rows(iter_df: pd.DataFrame) -> pd.DataFrame:
     return pd.DataFrame(rows)
 
 
-def summarize_error_taxonomy(iter_df: pd.DataFrame) -> pd.DataFrame:
-    exploded = explode_error_rows(iter_df)
-    if exploded.empty:
-        cols = [
-            "provider",
-            "model",
-            "scope",
-            "error_family",
-            "error_count",
-            "prompts_affected",
-            "iteration_rows_with_family",
-        ]
+def summarize_error_taxonomy(families: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate long-format (provider, model, prompt_id, iteration_index, error_family, count) rows."""
+    cols = [
+        "error_family",
+        "error_count",
+        "prompts_affected",
+        "iteration_rows_with_family",
+        "provider",
+        "model",
+        "scope",
+    ]
+    if families.empty:
         return pd.DataFrame(columns=cols)
 
-    out_rows: List[Dict[str, Any]] = []
-
-    groups = exploded.groupby(["provider", "model"], dropna=False)
-    for (provider, model), g in groups:
-        # scope: all iterations
-        agg_all = (
-            g.groupby("error_family")
-            .agg(
-                error_count=("count", "sum"),
-                prompts_affected=("prompt_id", "nunique"),
-                iteration_rows_with_family=("iteration_index", "count"),
-            )
-            .reset_index()
-        )
-        for rec in agg_all.to_dict(orient="records"):
-            rec.update({"provider": provider, "model": model, "scope": "all_iterations"})
-            out_rows.append(rec)
-
-        # scope: first failed iteration per prompt
-        first_failed_idx = (
-            g[g["count"] > 0]
-            .sort_values(["prompt_id", "iteration_index"])
-            .groupby("prompt_id", as_index=False)
-            .first()[["prompt_id", "iteration_index"]]
-        )
-        g_first_failed = g.merge(first_failed_idx, on=["prompt_id", "iteration_index"], how="inner")
-        agg_first_failed = (
-            g_first_failed.groupby("error_family")
-            .agg(
-                error_count=("count", "sum"),
-                prompts_affected=("prompt_id", "nunique"),
-                iteration_rows_with_family=("iteration_index", "count"),
-            )
-            .reset_index()
-        )
-        for rec in agg_first_failed.to_dict(orient="records"):
-            rec.update({"provider": provider, "model": model, "scope": "first_failed_iteration"})
-            out_rows.append(rec)
-
-        # scope: first iteration only
-        g_first_iter = g[g["iteration_index"] == 1]
-        agg_first_iter = (
-            g_first_iter.groupby("error_family")
-            .agg(
-                error_count=("count", "sum"),
-                prompts_affected=("prompt_id", "nunique"),
-                iteration_rows_with_family=("iteration_index", "count"),
-            )
-            .reset_index()
-        )
-        for rec in agg_first_iter.to_dict(orient="records"):
-            rec.update({"provider": provider, "model": model, "scope": "first_iteration"})
-            out_rows.append(rec)
-
-    summary = pd.DataFrame(out_rows)
-
-    # Add pooled ALL/ALL for each scope
-    pooled_rows: List[Dict[str, Any]] = []
-    for scope in sorted(summary["scope"].unique()):
-        sub = summary[summary["scope"] == scope]
-        pooled = (
-            sub.groupby("error_family", as_index=False)
-            .agg(
-                error_count=("error_count", "sum"),
-                prompts_affected=("prompts_affected", "sum"),
-                iteration_rows_with_family=("iteration_rows_with_family", "sum"),
-            )
+    case_keys = ["provider", "model", "prompt_id"]
+    first_failed_iter = (
+        families[families["count"] > 0].groupby(case_keys)["iteration_index"].min().rename("first_failed_iter")
+    )
+    flagged = families.join(first_failed_iter, on=case_keys)
+    scoped = pd.concat(
+        [
+            families.assign(scope="all_iterations"),
+            families[flagged["iteration_index"] == flagged["first_failed_iter"]].assign(scope="first_failed_iteration"),
+            families[families["iteration_index"] == 1].assign(scope="first_iteration"),
+        ],
+        ignore_index=True,
+    )
+    per_model = (
+        scoped.groupby(["provider", "model", "scope", "error_family"])
+        .agg(
+            error_count=("count", "sum"),
+            prompts_affected=("prompt_id", "nunique"),
+            iteration_rows_with_family=("iteration_index", "count"),
         )
-        for rec in pooled.to_dict(orient="records"):
-            rec.update({"provider": "ALL", "model": "ALL", "scope": scope})
-            pooled_rows.append(rec)
+        .reset_index()
+    )
+    # Pooled ALL/ALL for each scope
+    pooled = (
+        per_model.groupby(["scope", "error_family"])[
+            ["error_count", "prompts_affected", "iteration_rows_with_family"]
+        ]
+        .sum()
+        .reset_index()
+        .assign(provider="ALL", model="ALL")
+    )
 
-    summary = pd.concat([summary, pd.DataFrame(pooled_rows)], ignore_index=True)
+    summary = pd.concat([per_model, pooled], ignore_index=True)[cols]
     summary = summary.sort_values(["provider", "model", "scope", "error_count", "error_family"], ascending=[True, True, True, False, True])
     return summary
 
 
+def load_error_families(input_dir: Path, iter_df: pd.DataFrame) -> pd.DataFrame:
+    """Long-format family table from extraction; older data dirs fall back to exploding the families column."""
+    try:
+        return load_table(input_dir, "iteration_error_families")
+    except FileNotFoundError:
+        return explode_error_rows(iter_df)
+
+
 def main() -> None:
     args = parse_args()
     input_dir = args.input_data_dir.resolve()
     out_dir = args.output_data_dir.resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    prompt_csv = input_dir / "prompt_level_syntax_metrics.csv"
-    iter_csv = input_dir / "iteration_level_syntax_metrics.csv"
-    if not prompt_csv.exists() or not iter_csv.exists():
-        raise SystemExit("Missing extracted CSVs. Run extract_syntax_metrics.py first.")
-
-    prompt_df = pd.read_csv(prompt_csv)
-    iter_df = pd.read_csv(iter_csv)
-
-    # Normalize core types
-    prompt_df["prompt_id"] = pd.to_numeric(prompt_df["prompt_id"], errors="coerce").astype("Int64")
-    prompt_df = prompt_df.dropna(subset=["prompt_id"]).copy()
-    prompt_df["prompt_id"] = prompt_df["prompt_id"].astype(int)
-
-    model_stats: List[GroupStats] = []
-
-    for (provider, model), sub in prompt_df.groupby(["provider", "model"], dropna=False):
-        model_stats.append(
-            compute_group_stats(
-                sub.copy(),
-                str(provider),
-                str(model),
-                bootstrap_seed=args.bootstrap_seed,
-                bootstrap_resamples=args.bootstrap_resamples,
-            )
-        )
-
-    model_stats.append(
-        compute_group_stats(
-            prompt_df.copy(),
-            provider="ALL",
-            model="ALL",
-            bootstrap_seed=args.bootstrap_seed,
-            bootstrap_resamples=args.bootstrap_resamples,
-        )
-    )
+    try:
+        prompt_df = load_table(input_dir, "prompt_level_syntax_metrics")
+        iter_df = load_table(input_dir, "iteration_level_syntax_metrics")
+    except FileNotFoundError:
+        raise SystemExit("Missing extracted tables. Run extract_syntax_metrics.py first.")
+
+    groups = [
+        ((str(provider), str(model)), sub.copy())
+        for (provider, model), sub in prompt_df.groupby(["provider", "model"], dropna=False)
+    ]
+    boot = (args.bootstrap_seed, args.bootstrap_resamples, args.bootstrap_max_cells)
+    stat_tasks = [(sub, provider, model, *boot) for (provider, model), sub in groups]
+    stat_tasks.append((prompt_df.copy(), "ALL", "ALL", *boot))
+    model_stats: List[GroupStats] = run_tasks(compute_group_stats, stat_tasks, args.workers)
+
+    strata_map = load_strata(args)
+    comparison_tasks = [
+        (left_sub, right_sub, left_key, right_key, strata_map, *boot)
+        for (left_key, left_sub), (right_key, right_sub) in itertools.combinations(groups, 2)
+    ]
+    comparison_rows = [
+        row for rows in run_tasks(compare_pair, comparison_tasks, args.workers) for row in rows
+    ]
+    comparison_df = pd.DataFrame(comparison_rows)
+    comparison_paths = write_frame(out_dir, "provider_comparisons", comparison_df)
 
     model_summary_df = pd.DataFrame([asdict(s) for s in model_stats])
     model_summary_df = model_summary_df.sort_values(["provider", "model"], ascending=[True, True])
-    model_summary_path = out_dir / "model_level_syntax_summary.csv"
-    model_summary_df.to_csv(model_summary_path, index=False)
+    model_summary_paths = write_frame(out_dir, "model_level_syntax_summary", model_summary_df)
 
-    error_summary_df = summarize_error_taxonomy(iter_df)
-    error_summary_path = out_dir / "error_taxonomy_summary.csv"
-    error_summary_df.to_csv(error_summary_path, index=False)
+    error_summary_df = summarize_error_taxonomy(load_error_families(input_dir, iter_df))
+    error_summary_paths = write_frame(out_dir, "error_taxonomy_summary", error_summary_df)
 
     overall = model_summary_df[(model_summary_df["provider"] == "ALL") & (model_summary_df["model"] == "ALL")].iloc[0].to_dict()
 
@@ -394,12 +489,13 @@ def main() -> None:
         "bootstrap_resamples": args.bootstrap_resamples,
         "overall": overall,
         "per_model": per_model,
+        "provider_comparisons": comparison_rows,
     }
     stat_tests_path = out_dir / "stat_tests.json"
     stat_tests_path.write_text(json.dumps(stat_tests, indent=2, sort_keys=True, ensure_ascii=False), encoding="utf-8")
 
-    print(f"[ok] wrote {model_summary_path}")
-    print(f"[ok] wrote {error_summary_path}")
+    for path in [*model_summary_paths, *error_summary_paths, *comparison_paths]:
+        print(f"[ok] wrote {path}")
     print(f"[ok] wrote {stat_tests_path}")
 
 
@@ -4,13 +4,17 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import re
 import subprocess
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from syntax_data import write_rows
 
 ERROR_FAMILY_RE = re.compile(r"\berror \(([^)]+)\):")
 WARNING_RE = re.compile(r"\bwarning \(([^)]+)\):")
@@ -18,6 +22,8 @@ ANSI_ESCAPE_RE = re.compile(r"\x1B\[[0-9;]*[A-Za-z]")
 
 MODEL_ROOT_PREFIX = "Generated_from_Prompts_API_LOOP_"
 PROMPT_IDS = list(range(1, 152))
+EXTRACT_CACHE_NAME = ".extract_cache.json"
+EXTRACT_CACHE_VERSION = 1
 
 
 def parse_args() -> argparse.Namespace:
@@ -40,7 +46,23 @@ def parse_args() -> argparse.Namespace:
             "If omitted, all Generated_from_Prompts_API_LOOP_* roots are used."
         ),
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to extract changed (model root, prompt) cases (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help=f"Per-case extraction cache (default: <output-data-dir>/{EXTRACT_CACHE_NAME}).",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the cache and re-extract every case.")
+    args = parser.parse_args()
+    if args.workers <= 0:
+        raise SystemExit("--workers must be > 0")
+    return args
 
 
 def read_json(path: Path) -> Optional[Any]:
@@ -117,7 +139,12 @@ def infer_provider_model(model_root: Path) -> Tuple[str, str]:
     return inferred_provider, inferred_model
 
 
-def resolve_run_log_path(model_root: Path, prompt_id: int, manifest: Dict[str, Any]) -> Optional[Path]:
+def resolve_run_log_path(
+    model_root: Path,
+    prompt_id: int,
+    manifest: Dict[str, Any],
+    sources: Optional[List[Path]] = None,
+) -> Optional[Path]:
     candidates: List[Path] = []
 
     run_log_path_raw = manifest.get("run_log_path")
@@ -135,6 +162,10 @@ def resolve_run_log_path(model_root: Path, prompt_id: int, manifest: Dict[str, A
         for p in sorted(refine_runs_dir.glob("*/run_log.json"), key=lambda x: x.parent.name):
             candidates.append(p)
 
+    if sources is not None:
+        sources.append(refine_runs_dir)
+        sources.extend(candidates)
+
     for path in candidates:
         if path.exists():
             return path
@@ -162,7 +193,11 @@ def json_dumps_sorted(obj: Any) -> str:
     return json.dumps(obj, sort_keys=True, ensure_ascii=False)
 
 
-def parse_iteration_tokens(step: Dict[str, Any], run_log_dir: Path) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+def parse_iteration_tokens(
+    step: Dict[str, Any],
+    run_log_dir: Path,
+    sources: Optional[List[Path]] = None,
+) -> Tuple[Optional[int], Optional[int], Optional[int]]:
     token_obj = step.get("tokens_used_this_iter")
     if isinstance(token_obj, dict):
         ti = token_obj.get("input_tokens")
@@ -175,6 +210,8 @@ def parse_iteration_tokens(step: Dict[str, Any], run_log_dir: Path) -> Tuple[Opt
     response_path = None
     if isinstance(response_path_raw, str) and response_path_raw.strip():
         response_path = Path(response_path_raw)
+        if sources is not None:
+            sources.extend([response_path, run_log_dir / response_path.name])
         if not response_path.exists():
             response_path = run_log_dir / response_path.name
     if response_path and response_path.exists():
@@ -212,6 +249,232 @@ def _to_float(v: Any) -> Optional[float]:
         return None
 
 
+def source_state(path: Path, with_digest: bool = True) -> Optional[List[Any]]:
+    """[mtime_ns, size, sha256] of a file (a directory hashes its sorted listing); None if absent."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if not with_digest:
+        return [stat.st_mtime_ns, stat.st_size, None]
+    if path.is_dir():
+        data = "\n".join(sorted(child.name for child in path.iterdir())).encode("utf-8")
+    else:
+        data = path.read_bytes()
+    return [stat.st_mtime_ns, stat.st_size, hashlib.sha256(data).hexdigest()]
+
+
+def sources_unchanged(sources: Dict[str, Optional[List[Any]]]) -> bool:
+    """True if every recorded source still has the same mtime/size (or is still absent)."""
+    for path, state in sources.items():
+        current = source_state(Path(path), with_digest=False)
+        if (current is None) != (state is None):
+            return False
+        if current is not None and current[:2] != state[:2]:
+            return False
+    return True
+
+
+def finish_case(result: Dict[str, Any], status: str) -> Dict[str, Any]:
+    result["status"] = status
+    result["sources"] = {str(path): source_state(path) for path in dict.fromkeys(result["sources"])}
+    return result
+
+
+def extract_case(model_root: Path, prompt_id: int, provider: str, model: str) -> Dict[str, Any]:
+    """Rows for one (model root, prompt) plus the state of every source file consulted."""
+    case_dir = model_root / str(prompt_id)
+    manifest_path = case_dir / f"{prompt_id}_refine_manifest.json"
+    sources: List[Path] = [manifest_path]
+    result: Dict[str, Any] = {"provider": provider, "model": model, "sources": sources}
+    if not manifest_path.exists():
+        return finish_case(result, "missing_manifests")
+
+    manifest = read_json(manifest_path)
+    if not isinstance(manifest, dict):
+        return finish_case(result, "invalid_manifests")
+
+    run_log_path = resolve_run_log_path(model_root, prompt_id, manifest, sources)
+    if not run_log_path or not run_log_path.exists():
+        return finish_case(result, "missing_run_logs")
+
+    run_log = read_json(run_log_path)
+    if not isinstance(run_log, list) or not run_log:
+        return finish_case(result, "invalid_run_logs")
+
+    sources.append(run_log_path.parent / "run_meta.json")
+    run_meta = read_json(run_log_path.parent / "run_meta.json")
+    if not isinstance(run_meta, dict):
+        run_meta = {}
+
+    iteration_rows: List[Dict[str, Any]] = []
+    family_rows: List[Dict[str, Any]] = []
+    norm_steps: List[Dict[str, Any]] = []
+    for step in run_log:
+        if not isinstance(step, dict):
+            continue
+        iteration_index = _to_int(step.get("iteration"))
+        if iteration_index is None:
+            continue
+
+        compiler_stdout = str(step.get("compiler_stdout") or "")
+        compiler_stderr = str(step.get("compiler_stderr") or "")
+        error_count, error_families, warning_count, warning_families = parse_error_families(
+            compiler_stdout,
+            compiler_stderr,
+        )
+        tokens_in, tokens_out, tokens_total = parse_iteration_tokens(step, run_log_path.parent, sources)
+
+        iter_row = {
+            "provider": provider,
+            "model": model,
+            "prompt_id": prompt_id,
+            "iteration_index": iteration_index,
+            "pass_at_iteration": bool(step.get("success", False)),
+            "error_count": error_count,
+            "error_families_json": json_dumps_sorted(error_families),
+            "warning_count": warning_count,
+            "warning_families_json": json_dumps_sorted(warning_families),
+            "iteration_time_sec": _to_float(step.get("iteration_duration_seconds")),
+            "tokens_in": tokens_in,
+            "tokens_out": tokens_out,
+            "tokens_total": tokens_total,
+            "return_code": _to_int(step.get("return_code")),
+            "run_id": run_log_path.parent.name,
+            "session_id": run_log_path.parent.name,
+            "source_path": str(manifest_path),
+        }
+        iteration_rows.append(iter_row)
+        norm_steps.append(iter_row)
+        for family, count in error_families.items():
+            family_rows.append(
+                {
+                    "provider": provider,
+                    "model": model,
+                    "prompt_id": prompt_id,
+                    "iteration_index": iteration_index,
+                    "error_family": family,
+                    "count": count,
+                }
+            )
+
+    if not norm_steps:
+        return finish_case(result, "invalid_run_logs")
+
+    norm_steps.sort(key=lambda r: int(r["iteration_index"]))
+    first = norm_steps[0]
+    last = norm_steps[-1]
+    start_iter_raw = int(first["iteration_index"])
+    end_iter_raw = int(last["iteration_index"])
+    is_resumed_segment = start_iter_raw > 1
+    first_success = bool(first["pass_at_iteration"])
+    eventual_success = bool(manifest.get("final_iteration_success", last["pass_at_iteration"]))
+    success_iters = [int(r["iteration_index"]) for r in norm_steps if bool(r["pass_at_iteration"])]
+    iters_to_success = success_iters[0] if success_iters else None
+
+    tokens_in_total = sum((r["tokens_in"] or 0) for r in norm_steps)
+    tokens_out_total = sum((r["tokens_out"] or 0) for r in norm_steps)
+    tokens_total = sum((r["tokens_total"] or 0) for r in norm_steps)
+    if not tokens_total:
+        tokens_total = _to_int(manifest.get("tokens_used_total")) or _to_int(run_meta.get("tokens_used_total")) or 0
+
+    wall_time_sec = (
+        _to_float(manifest.get("loop_duration_seconds"))
+        or _to_float(run_meta.get("run_duration_seconds"))
+        or sum((r["iteration_time_sec"] or 0.0) for r in norm_steps)
+    )
+
+    # If a persisted run starts at iteration > 1, it is a resumed segment.
+    # Full-prompt wall time/token totals are not reconstructible from this segment alone.
+    if is_resumed_segment:
+        wall_time_sec = None
+        tokens_in_total = None
+        tokens_out_total = None
+        tokens_total = None
+
+    result["prompt_row"] = {
+        "provider": provider,
+        "model": model,
+        "prompt_id": prompt_id,
+        "first_shot_pass": first_success,
+        "eventual_pass": eventual_success,
+        "iterations_run": len(norm_steps),
+        "iterations_to_success": iters_to_success,
+        "unresolved_within_cap": not eventual_success,
+        "first_iteration_error_count": int(first["error_count"]),
+        "final_error_count": int(last["error_count"]),
+        "total_error_count_across_iterations": int(sum(int(r["error_count"]) for r in norm_steps)),
+        "first_failed_then_recovered": (not first_success) and eventual_success,
+        "wall_time_sec": wall_time_sec,
+        "token_input": tokens_in_total if tokens_in_total is not None else None,
+        "token_output": tokens_out_total if tokens_out_total is not None else None,
+        "token_total": tokens_total if tokens_total is not None else None,
+        "estimated_cost_usd": None,
+        "run_start_iteration": start_iter_raw,
+        "run_end_iteration": end_iter_raw,
+        "is_resumed_segment": is_resumed_segment,
+        "run_id": run_log_path.parent.name,
+        "session_id": run_log_path.parent.name,
+        "source_path": str(manifest_path),
+    }
+    result["iteration_rows"] = iteration_rows
+    result["family_rows"] = family_rows
+    return finish_case(result, "ok")
+
+
+def process_case(
+    model_root: Path,
+    prompt_id: int,
+    provider: str,
+    model: str,
+    cached: Optional[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], bool]:
+    """Reuse `cached` if its sources still hash the same, else re-extract; returns (result, reused)."""
+    if cached is not None:
+        sources = {path: source_state(Path(path)) for path in cached["sources"]}
+        if all(
+            (state is None) == (cached["sources"][path] is None)
+            and (state is None or state[2] == cached["sources"][path][2])
+            for path, state in sources.items()
+        ):
+            return {**cached, "sources": sources}, True
+    return extract_case(model_root, prompt_id, provider, model), False
+
+
+def run_tasks(func: Callable[..., Any], tasks: Sequence[Tuple[Any, ...]], workers: int) -> List[Any]:
+    """Apply `func` to each argument tuple, in order, across a process pool."""
+    if workers <= 1 or len(tasks) <= 1:
+        return [func(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        return list(executor.map(func, *zip(*tasks)))
+
+
+def extractor_digest() -> str:
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def load_extract_cache(path: Path, digest: str) -> Dict[str, Dict[str, Any]]:
+    """Cached per-case results, or {} if absent/corrupt or written by a different extractor."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    if data.get("version") != EXTRACT_CACHE_VERSION or data.get("extractor_sha256") != digest:
+        return {}
+    cases = data.get("cases")
+    return cases if isinstance(cases, dict) else {}
+
+
+def write_extract_cache(path: Path, digest: str, cases: Dict[str, Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": EXTRACT_CACHE_VERSION, "extractor_sha256": digest, "cases": cases}
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
 def main() -> None:
     args = parse_args()
     repo_root = args.repo_root.resolve()
@@ -225,6 +488,7 @@ def main() -> None:
 
     prompt_rows: List[Dict[str, Any]] = []
     iteration_rows: List[Dict[str, Any]] = []
+    family_rows: List[Dict[str, Any]] = []
 
     campaign_manifest: Dict[str, Any] = {
         "repo_root": str(repo_root),
@@ -239,6 +503,16 @@ def main() -> None:
         "git_commit": get_git_commit(repo_root),
     }
 
+    cache_path = (args.cache or output_data_dir / EXTRACT_CACHE_NAME).resolve()
+    digest = extractor_digest()
+    cache = {} if args.rebuild else load_extract_cache(cache_path, digest)
+    counts = {"reused": 0, "revalidated": 0, "extracted": 0}
+
+    # Cases whose sources kept their mtime/size are reused directly; the rest go to the pool,
+    # which revalidates them by content hash and re-extracts only what actually changed.
+    cases: List[Tuple[Dict[str, Any], int, str]] = []
+    results: Dict[str, Dict[str, Any]] = {}
+    pending: List[Tuple[str, Tuple[Any, ...]]] = []
     for model_root in model_roots:
         provider, model = infer_provider_model(model_root)
         model_entry: Dict[str, Any] = {
@@ -251,136 +525,37 @@ def main() -> None:
             "invalid_run_logs": [],
             "processed_prompts": 0,
         }
-
+        campaign_manifest["model_roots"].append(model_entry)
         for prompt_id in PROMPT_IDS:
-            case_dir = model_root / str(prompt_id)
-            manifest_path = case_dir / f"{prompt_id}_refine_manifest.json"
-            if not manifest_path.exists():
-                model_entry["missing_manifests"].append(prompt_id)
-                continue
-
-            manifest = read_json(manifest_path)
-            if not isinstance(manifest, dict):
-                model_entry["invalid_manifests"].append(prompt_id)
-                continue
-
-            run_log_path = resolve_run_log_path(model_root, prompt_id, manifest)
-            if not run_log_path or not run_log_path.exists():
-                model_entry["missing_run_logs"].append(prompt_id)
-                continue
-
-            run_log = read_json(run_log_path)
-            if not isinstance(run_log, list) or not run_log:
-                model_entry["invalid_run_logs"].append(prompt_id)
-                continue
-
-            run_meta = read_json(run_log_path.parent / "run_meta.json")
-            if not isinstance(run_meta, dict):
-                run_meta = {}
-
-            norm_steps: List[Dict[str, Any]] = []
-            for step in run_log:
-                if not isinstance(step, dict):
-                    continue
-                iteration_index = _to_int(step.get("iteration"))
-                if iteration_index is None:
-                    continue
-
-                compiler_stdout = str(step.get("compiler_stdout") or "")
-                compiler_stderr = str(step.get("compiler_stderr") or "")
-                error_count, error_families, warning_count, warning_families = parse_error_families(
-                    compiler_stdout,
-                    compiler_stderr,
-                )
-                tokens_in, tokens_out, tokens_total = parse_iteration_tokens(step, run_log_path.parent)
-
-                iter_row = {
-                    "provider": provider,
-                    "model": model,
-                    "prompt_id": prompt_id,
-                    "iteration_index": iteration_index,
-                    "pass_at_iteration": bool(step.get("success", False)),
-                    "error_count": error_count,
-                    "error_families_json": json_dumps_sorted(error_families),
-                    "warning_count": warning_count,
-                    "warning_families_json": json_dumps_sorted(warning_families),
-                    "iteration_time_sec": _to_float(step.get("iteration_duration_seconds")),
-                    "tokens_in": tokens_in,
-                    "tokens_out": tokens_out,
-                    "tokens_total": tokens_total,
-                    "return_code": _to_int(step.get("return_code")),
-                    "run_id": run_log_path.parent.name,
-                    "session_id": run_log_path.parent.name,
-                    "source_path": str(manifest_path),
-                }
-                iteration_rows.append(iter_row)
-                norm_steps.append(iter_row)
-
-            if not norm_steps:
-                model_entry["invalid_run_logs"].append(prompt_id)
-                continue
-
-            norm_steps.sort(key=lambda r: int(r["iteration_index"]))
-            first = norm_steps[0]
-            last = norm_steps[-1]
-            start_iter_raw = int(first["iteration_index"])
-            end_iter_raw = int(last["iteration_index"])
-            is_resumed_segment = start_iter_raw > 1
-            first_success = bool(first["pass_at_iteration"])
-            eventual_success = bool(manifest.get("final_iteration_success", last["pass_at_iteration"]))
-            success_iters = [int(r["iteration_index"]) for r in norm_steps if bool(r["pass_at_iteration"])]
-            iters_to_success = success_iters[0] if success_iters else None
-
-            tokens_in_total = sum((r["tokens_in"] or 0) for r in norm_steps)
-            tokens_out_total = sum((r["tokens_out"] or 0) for r in norm_steps)
-            tokens_total = sum((r["tokens_total"] or 0) for r in norm_steps)
-            if not tokens_total:
-                tokens_total = _to_int(manifest.get("tokens_used_total")) or _to_int(run_meta.get("tokens_used_total")) or 0
-
-            wall_time_sec = (
-                _to_float(manifest.get("loop_duration_seconds"))
-                or _to_float(run_meta.get("run_duration_seconds"))
-                or sum((r["iteration_time_sec"] or 0.0) for r in norm_steps)
-            )
-
-            # If a persisted run starts at iteration > 1, it is a resumed segment.
-            # Full-prompt wall time/token totals are not reconstructible from this segment alone.
-            if is_resumed_segment:
-                wall_time_sec = None
-                tokens_in_total = None
-                tokens_out_total = None
-                tokens_total = None
-
-            prompt_rows.append(
-                {
-                    "provider": provider,
-                    "model": model,
-                    "prompt_id": prompt_id,
-                    "first_shot_pass": first_success,
-                    "eventual_pass": eventual_success,
-                    "iterations_run": len(norm_steps),
-                    "iterations_to_success": iters_to_success,
-                    "unresolved_within_cap": not eventual_success,
-                    "first_iteration_error_count": int(first["error_count"]),
-                    "final_error_count": int(last["error_count"]),
-                    "total_error_count_across_iterations": int(sum(int(r["error_count"]) for r in norm_steps)),
-                    "first_failed_then_recovered": (not first_success) and eventual_success,
-                    "wall_time_sec": wall_time_sec,
-                    "token_input": tokens_in_total if tokens_in_total is not None else None,
-                    "token_output": tokens_out_total if tokens_out_total is not None else None,
-                    "token_total": tokens_total if tokens_total is not None else None,
-                    "estimated_cost_usd": None,
-                    "run_start_iteration": start_iter_raw,
-                    "run_end_iteration": end_iter_raw,
-                    "is_resumed_segment": is_resumed_segment,
-                    "run_id": run_log_path.parent.name,
-                    "session_id": run_log_path.parent.name,
-                    "source_path": str(manifest_path),
-                }
-            )
-            model_entry["processed_prompts"] += 1
+            key = f"{model_root}/{prompt_id}"
+            cases.append((model_entry, prompt_id, key))
+            cached = cache.get(key)
+            if cached is not None and (cached.get("provider"), cached.get("model")) != (provider, model):
+                cached = None
+            if cached is not None and sources_unchanged(cached["sources"]):
+                results[key] = cached
+                counts["reused"] += 1
+            else:
+                pending.append((key, (model_root, prompt_id, provider, model, cached)))
+
+    outcomes = run_tasks(process_case, [task for _, task in pending], args.workers)
+    for (key, _), (result, revalidated) in zip(pending, outcomes):
+        results[key] = result
+        counts["revalidated" if revalidated else "extracted"] += 1
+
+    for model_entry, prompt_id, key in cases:
+        result = results[key]
+        if result["status"] != "ok":
+            model_entry[result["status"]].append(prompt_id)
+            continue
+        prompt_rows.append(result["prompt_row"])
+        iteration_rows.extend(result["iteration_rows"])
+        family_rows.extend(result["family_rows"])
+        model_entry["processed_prompts"] += 1
 
-        campaign_manifest["model_roots"].append(model_entry)
+    cache.update(results)
+    write_extract_cache(cache_path, digest, cache)
+    campaign_manifest["extraction"] = {"workers": args.workers, "cache": str(cache_path), **counts}
 
     prompt_rows.sort(key=lambda r: (r["provider"], r["model"], int(r["prompt_id"])))
     iteration_rows.sort(
@@ -391,70 +566,30 @@ def main() -> None:
             int(r["iteration_index"]),
         )
     )
+    family_rows.sort(
+        key=lambda r: (
+            r["provider"],
+            r["model"],
+            int(r["prompt_id"]),
+            int(r["iteration_index"]),
+            r["error_family"],
+        )
+    )
 
-    prompt_cols = [
-        "provider",
-        "model",
-        "prompt_id",
-        "first_shot_pass",
-        "eventual_pass",
-        "iterations_run",
-        "iterations_to_success",
-        "unresolved_within_cap",
-        "first_iteration_error_count",
-        "final_error_count",
-        "total_error_count_across_iterations",
-        "first_failed_then_recovered",
-        "wall_time_sec",
-        "token_input",
-        "token_output",
-        "token_total",
-        "estimated_cost_usd",
-        "run_start_iteration",
-        "run_end_iteration",
-        "is_resumed_segment",
-        "run_id",
-        "session_id",
-        "source_path",
-    ]
-    iter_cols = [
-        "provider",
-        "model",
-        "prompt_id",
-        "iteration_index",
-        "pass_at_iteration",
-        "error_count",
-        "error_families_json",
-        "iteration_time_sec",
-        "tokens_in",
-        "tokens_out",
-        "tokens_total",
-        "return_code",
-        "warning_count",
-        "warning_families_json",
-        "run_id",
-        "session_id",
-        "source_path",
+    written = [
+        *write_rows(output_data_dir, "prompt_level_syntax_metrics", prompt_rows),
+        *write_rows(output_data_dir, "iteration_level_syntax_metrics", iteration_rows),
+        *write_rows(output_data_dir, "iteration_error_families", family_rows),
     ]
-
     prompt_csv = output_data_dir / "prompt_level_syntax_metrics.csv"
     iter_csv = output_data_dir / "iteration_level_syntax_metrics.csv"
-
-    def write_csv(path: Path, cols: List[str], rows: List[Dict[str, Any]]) -> None:
-        import csv
-
-        with path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=cols)
-            writer.writeheader()
-            for row in rows:
-                writer.writerow({c: row.get(c) for c in cols})
-
-    write_csv(prompt_csv, prompt_cols, prompt_rows)
-    write_csv(iter_csv, iter_cols, iteration_rows)
+    family_csv = output_data_dir / "iteration_error_families.csv"
 
     campaign_manifest["outputs"] = {
         "prompt_level_csv": str(prompt_csv),
         "iteration_level_csv": str(iter_csv),
+        "iteration_error_families_csv": str(family_csv),
+        "parquet": [str(path) for path in written if path.suffix == ".parquet"],
     }
     campaign_manifest_path = output_data_dir / "campaign_manifest.json"
     campaign_manifest_path.write_text(
@@ -462,10 +597,17 @@ def main() -> None:
         encoding="utf-8",
     )
 
-    print(f"[ok] wrote {prompt_csv}")
-    print(f"[ok] wrote {iter_csv}")
+    for path in written:
+        print(f"[ok] wrote {path}")
+    print(
+        f"[cache] reused={counts['reused']} revalidated={counts['revalidated']} "
+        f"extracted={counts['extracted']} workers={args.workers} cache={cache_path}"
+    )
     print(f"[ok] wrote {campaign_manifest_path}")
-    print(f"[summary] prompt rows={len(prompt_rows)} iteration rows={len(iteration_rows)}")
+    print(
+        f"[summary] prompt rows={len(prompt_rows)} iteration rows={len(iteration_rows)} "
+        f"error-family rows={len(family_rows)}"
+    )
 
 
 if __name__ == "__main__":
@@ -5,8 +5,11 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Sequence, Tuple
 
 import matplotlib
 matplotlib.use("Agg")
@@ -15,6 +18,17 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from syntax_data import load_table
+
+# Data table -> keyword argument name passed to the plotting functions.
+TABLE_ARGS = {
+    "prompt_level_syntax_metrics": "prompt_df",
+    "iteration_level_syntax_metrics": "iter_df",
+    "model_level_syntax_summary": "model_df",
+    "error_taxonomy_summary": "err_df",
+}
+CATALOG_NAME = "FIGURE_CATALOG.md"
+
 
 def parse_args() -> argparse.Namespace:
     script_dir = Path(__file__).resolve().parent
@@ -22,7 +36,24 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--data-dir", type=Path, default=repo_root / "paper" / "results" / "data")
     parser.add_argument("--figures-dir", type=Path, default=repo_root / "paper" / "results" / "figures")
-    return parser.parse_args()
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        default=None,
+        metavar="KEY",
+        help="Render only these figures (file stems, e.g. 05_iterations_to_success_hist_overall); skips the catalog.",
+    )
+    parser.add_argument("--catalog-only", action="store_true", help=f"Only (re)write {CATALOG_NAME}.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to render figures (default: %(default)s).",
+    )
+    args = parser.parse_args()
+    if args.workers <= 0:
+        raise SystemExit("--workers must be > 0")
+    return args
 
 
 def pct(v: Any) -> float:
@@ -39,12 +70,6 @@ def savefig(path: Path, dpi: int = 220) -> None:
     plt.close()
 
 
-def bool_series(s: pd.Series) -> pd.Series:
-    if s.dtype == bool:
-        return s
-    return s.astype(str).str.strip().str.lower().map({"true": True, "false": False, "1": True, "0": False}).fillna(False)
-
-
 def fig_placeholder(path: Path, title: str, message: str) -> None:
     plt.figure(figsize=(8, 4.5))
     plt.axis("off")
@@ -53,40 +78,25 @@ def fig_placeholder(path: Path, title: str, message: str) -> None:
     savefig(path)
 
 
-def main() -> None:
-    args = parse_args()
-    data_dir = args.data_dir.resolve()
-    figures_dir = args.figures_dir.resolve()
-    figures_dir.mkdir(parents=True, exist_ok=True)
+def model_pass_rates(prompt_df: pd.DataFrame) -> pd.DataFrame:
+    by_model = prompt_df.groupby(["provider", "model"], as_index=False).agg(
+        first_shot_pass_rate=("first_shot_pass", "mean"),
+        eventual_pass_rate=("eventual_pass", "mean"),
+    )
+    by_model["label"] = by_model["provider"] + "\n" + by_model["model"]
+    return by_model
 
-    prompt_df = pd.read_csv(data_dir / "prompt_level_syntax_metrics.csv")
-    iter_df = pd.read_csv(data_dir / "iteration_level_syntax_metrics.csv")
-    model_df = pd.read_csv(data_dir / "model_level_syntax_summary.csv")
-    err_df = pd.read_csv(data_dir / "error_taxonomy_summary.csv")
-
-    prompt_df["first_shot_pass"] = bool_series(prompt_df["first_shot_pass"])
-    prompt_df["eventual_pass"] = bool_series(prompt_df["eventual_pass"])
-    prompt_df["prompt_id"] = pd.to_numeric(prompt_df["prompt_id"], errors="coerce")
-    prompt_df["iterations_to_success"] = pd.to_numeric(prompt_df["iterations_to_success"], errors="coerce")
-    prompt_df["iterations_run"] = pd.to_numeric(prompt_df["iterations_run"], errors="coerce")
-    prompt_df["first_iteration_error_count"] = pd.to_numeric(prompt_df["first_iteration_error_count"], errors="coerce")
-    prompt_df["final_error_count"] = pd.to_numeric(prompt_df["final_error_count"], errors="coerce")
-    prompt_df["total_error_count_across_iterations"] = pd.to_numeric(prompt_df["total_error_count_across_iterations"], errors="coerce")
-    prompt_df["wall_time_sec"] = pd.to_numeric(prompt_df["wall_time_sec"], errors="coerce")
-    prompt_df["token_total"] = pd.to_numeric(prompt_df["token_total"], errors="coerce")
-    prompt_df["estimated_cost_usd"] = pd.to_numeric(prompt_df["estimated_cost_usd"], errors="coerce")
-
-    iter_df["prompt_id"] = pd.to_numeric(iter_df["prompt_id"], errors="coerce")
-    iter_df["iteration_index"] = pd.to_numeric(iter_df["iteration_index"], errors="coerce")
-    iter_df["error_count"] = pd.to_numeric(iter_df["error_count"], errors="coerce")
-    iter_df["warning_count"] = pd.to_numeric(iter_df.get("warning_count", pd.Series(dtype=float)), errors="coerce")
-    iter_df["pass_at_iteration"] = bool_series(iter_df["pass_at_iteration"])
 
-    sns.set_theme(style="whitegrid", context="talk")
+def cumulative_success(prompt_df: pd.DataFrame) -> Tuple[np.ndarray, List[float]]:
+    max_iter = int(np.nanmax(prompt_df["iterations_run"])) if len(prompt_df) else 1
+    xs = np.arange(1, max_iter + 1)
+    cum_success = []
+    for i in xs:
+        cum_success.append((prompt_df["iterations_to_success"].fillna(np.inf) <= i).mean() * 100.0)
+    return xs, cum_success
 
-    catalog: List[Tuple[str, str, str]] = []
 
-    # 1. Baseline vs pipeline compile rate overall
+def plot_overall_compile_rate(path: Path, prompt_df: pd.DataFrame) -> None:
     overall_first = prompt_df["first_shot_pass"].mean() * 100.0
     overall_final = prompt_df["eventual_pass"].mean() * 100.0
     plt.figure(figsize=(7, 5))
@@ -107,16 +117,11 @@ def main() -> None:
     plt.ylabel("Compile success rate (%)")
     plt.ylim(0, 105)
     plt.title("Overall Compile Success: Baseline vs Pipeline")
-    p = figures_dir / "01_baseline_vs_pipeline_compile_rate_overall.png"
-    savefig(p)
-    catalog.append((p.name, "Overall baseline vs pipeline compile rate", "Main headline figure"))
+    savefig(path)
 
-    # 2. Baseline vs pipeline by model
-    by_model = prompt_df.groupby(["provider", "model"], as_index=False).agg(
-        first_shot_pass_rate=("first_shot_pass", "mean"),
-        eventual_pass_rate=("eventual_pass", "mean"),
-    )
-    by_model["label"] = by_model["provider"] + "\n" + by_model["model"]
+
+def plot_compile_rate_by_model(path: Path, prompt_df: pd.DataFrame) -> None:
+    by_model = model_pass_rates(prompt_df)
     plot_df = by_model.melt(id_vars=["label"], value_vars=["first_shot_pass_rate", "eventual_pass_rate"], var_name="metric", value_name="rate")
     plot_df["rate"] = plot_df["rate"] * 100.0
     plt.figure(figsize=(12, 6))
@@ -126,12 +131,11 @@ def main() -> None:
     plt.ylim(0, 105)
     plt.title("Compile Success by Model: Baseline vs Pipeline")
     plt.legend(title="")
-    p = figures_dir / "02_baseline_vs_pipeline_compile_rate_by_model.png"
-    savefig(p)
-    catalog.append((p.name, "Baseline vs pipeline by model", "Model comparison"))
+    savefig(path)
 
-    # 3. Absolute and relative improvement by model
-    imp_df = by_model.copy()
+
+def plot_improvement_by_model(path: Path, prompt_df: pd.DataFrame) -> None:
+    imp_df = model_pass_rates(prompt_df)
     imp_df["absolute_gain_pp"] = (imp_df["eventual_pass_rate"] - imp_df["first_shot_pass_rate"]) * 100.0
     imp_df["relative_gain_pct"] = np.where(imp_df["first_shot_pass_rate"] > 0, (imp_df["eventual_pass_rate"] - imp_df["first_shot_pass_rate"]) / imp_df["first_shot_pass_rate"] * 100.0, np.nan)
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
@@ -143,11 +147,10 @@ def main() -> None:
     axes[1].set_title("Relative Gain (%)")
     axes[1].set_ylabel("Percent")
     axes[1].set_xlabel("Provider / Model")
-    p = figures_dir / "03_absolute_relative_improvement_by_model.png"
-    savefig(p)
-    catalog.append((p.name, "Absolute and relative improvement by model", "Improvement framing"))
+    savefig(path)
+
 
-    # 4. Paired outcome matrix overall
+def plot_paired_outcome_matrix(path: Path, prompt_df: pd.DataFrame) -> None:
     fs = prompt_df["first_shot_pass"]
     ev = prompt_df["eventual_pass"]
     matrix = np.array([
@@ -157,21 +160,19 @@ def main() -> None:
     plt.figure(figsize=(6, 5))
     sns.heatmap(matrix, annot=True, fmt="d", cmap="Blues", xticklabels=["Final pass", "Final fail"], yticklabels=["First pass", "First fail"])
     plt.title("Paired Outcomes: First Iteration vs Final")
-    p = figures_dir / "04_paired_outcome_matrix_overall.png"
-    savefig(p)
-    catalog.append((p.name, "Paired first-vs-final outcome matrix", "Transition structure"))
+    savefig(path)
+
 
-    # 5. Iterations-to-success histogram overall
+def plot_iterations_hist(path: Path, prompt_df: pd.DataFrame) -> None:
     plt.figure(figsize=(8, 5))
     sns.histplot(prompt_df["iterations_to_success"].dropna(), discrete=True, stat="count", color="#1b9e77")
     plt.xlabel("Iterations to first successful compile")
     plt.ylabel("Prompt count")
     plt.title("Iterations-to-Success Distribution (Overall)")
-    p = figures_dir / "05_iterations_to_success_hist_overall.png"
-    savefig(p)
-    catalog.append((p.name, "Iterations-to-success histogram", "Convergence profile"))
+    savefig(path)
 
-    # 6. ECDF overall
+
+def plot_iterations_ecdf(path: Path, prompt_df: pd.DataFrame) -> None:
     vals = np.sort(prompt_df["iterations_to_success"].dropna().to_numpy())
     if vals.size > 0:
         y = np.arange(1, vals.size + 1) / vals.size
@@ -180,27 +181,24 @@ def main() -> None:
         plt.xlabel("Iterations to success")
         plt.ylabel("ECDF")
         plt.title("ECDF of Iterations-to-Success")
-        p = figures_dir / "06_iterations_to_success_ecdf_overall.png"
-        savefig(p)
-        catalog.append((p.name, "ECDF of iterations-to-success", "Convergence compactness"))
+        savefig(path)
+    else:
+        fig_placeholder(path, "ECDF of Iterations-to-Success", "No successful prompts in current dataset.")
 
-    # 7. Cumulative success by iteration
-    max_iter = int(np.nanmax(prompt_df["iterations_run"])) if len(prompt_df) else 1
-    xs = np.arange(1, max_iter + 1)
-    cum_success = []
-    for i in xs:
-        cum_success.append((prompt_df["iterations_to_success"].fillna(np.inf) <= i).mean() * 100.0)
+
+def plot_cumulative_success(path: Path, prompt_df: pd.DataFrame) -> None:
+    xs, cum_success = cumulative_success(prompt_df)
     plt.figure(figsize=(8, 5))
     plt.plot(xs, cum_success, marker="o", color="#1b9e77")
     plt.ylim(0, 102)
     plt.xlabel("Iteration")
     plt.ylabel("Cumulative success rate (%)")
     plt.title("Cumulative Compile Success by Iteration")
-    p = figures_dir / "07_cumulative_success_by_iteration_overall.png"
-    savefig(p)
-    catalog.append((p.name, "Cumulative success by iteration", "Pipeline convergence"))
+    savefig(path)
 
-    # 8. Unresolved survival curve
+
+def plot_unresolved_survival(path: Path, prompt_df: pd.DataFrame) -> None:
+    xs, cum_success = cumulative_success(prompt_df)
     unresolved = [100.0 - c for c in cum_success]
     plt.figure(figsize=(8, 5))
     plt.plot(xs, unresolved, marker="o", color="#d95f02")
@@ -208,11 +206,10 @@ def main() -> None:
     plt.xlabel("Iteration")
     plt.ylabel("Unresolved prompts (%)")
     plt.title("Unresolved-Survival Curve")
-    p = figures_dir / "08_unresolved_survival_by_iteration_overall.png"
-    savefig(p)
-    catalog.append((p.name, "Unresolved-survival by iteration", "Remaining failure surface"))
+    savefig(path)
 
-    # 9. Error drop first -> final
+
+def plot_error_drop(path: Path, prompt_df: pd.DataFrame) -> None:
     plt.figure(figsize=(8, 5))
     plt.scatter(prompt_df["first_iteration_error_count"], prompt_df["final_error_count"], alpha=0.65, color="#377eb8")
     max_err = max(prompt_df["first_iteration_error_count"].max(), prompt_df["final_error_count"].max()) if len(prompt_df) else 1
@@ -220,41 +217,37 @@ def main() -> None:
     plt.xlabel("First-iteration error count")
     plt.ylabel("Final-iteration error count")
     plt.title("Compiler Error Reduction per Prompt")
-    p = figures_dir / "09_error_count_drop_first_to_final.png"
-    savefig(p)
-    catalog.append((p.name, "First-vs-final error counts", "Error elimination behavior"))
+    savefig(path)
+
 
-    # 10. First error count vs iterations to success
+def plot_first_error_vs_iterations(path: Path, prompt_df: pd.DataFrame) -> None:
     plt.figure(figsize=(8, 5))
     sns.scatterplot(data=prompt_df, x="first_iteration_error_count", y="iterations_to_success", hue="provider", alpha=0.7)
     plt.title("Initial Error Burden vs Iterations to Success")
-    p = figures_dir / "10_first_error_vs_iters_scatter.png"
-    savefig(p)
-    catalog.append((p.name, "Initial errors vs iterations", "Difficulty signal"))
+    savefig(path)
+
 
-    # 11. Error taxonomy Pareto first iteration
+def plot_error_pareto_first_iteration(path: Path, err_df: pd.DataFrame) -> None:
     err_first = err_df[(err_df["provider"] == "ALL") & (err_df["model"] == "ALL") & (err_df["scope"] == "first_iteration")].sort_values("error_count", ascending=False).head(20)
     plt.figure(figsize=(12, 6))
     sns.barplot(data=err_first, x="error_family", y="error_count", color="#e41a1c")
     plt.xticks(rotation=60, ha="right")
     plt.title("Top Error Families on First Iteration")
     plt.ylabel("Count")
-    p = figures_dir / "11_error_taxonomy_pareto_first_iteration.png"
-    savefig(p)
-    catalog.append((p.name, "Top first-iteration error families", "Failure mode taxonomy"))
+    savefig(path)
 
-    # 12. Error taxonomy Pareto all iterations
+
+def plot_error_pareto_all_iterations(path: Path, err_df: pd.DataFrame) -> None:
     err_all = err_df[(err_df["provider"] == "ALL") & (err_df["model"] == "ALL") & (err_df["scope"] == "all_iterations")].sort_values("error_count", ascending=False).head(20)
     plt.figure(figsize=(12, 6))
     sns.barplot(data=err_all, x="error_family", y="error_count", color="#984ea3")
     plt.xticks(rotation=60, ha="right")
     plt.title("Top Error Families Across All Iterations")
     plt.ylabel("Count")
-    p = figures_dir / "12_error_taxonomy_pareto_all_iterations.png"
-    savefig(p)
-    catalog.append((p.name, "Top all-iteration error families", "Aggregate failure modes"))
+    savefig(path)
+
 
-    # 13. Prompt x iteration heatmap
+def plot_prompt_iteration_heatmap(path: Path, iter_df: pd.DataFrame) -> None:
     heat = (
         iter_df.groupby(["prompt_id", "iteration_index"], as_index=False)["error_count"].sum()
         .pivot(index="prompt_id", columns="iteration_index", values="error_count")
@@ -266,11 +259,10 @@ def main() -> None:
     plt.title("Prompt-Level Error Heatmap Across Iterations (Pooled Models)")
     plt.xlabel("Iteration")
     plt.ylabel("Prompt ID")
-    p = figures_dir / "13_prompt_iteration_error_heatmap_all_models.png"
-    savefig(p)
-    catalog.append((p.name, "Prompt x iteration error heatmap", "Difficulty heterogeneity"))
+    savefig(path)
+
 
-    # 14. Hardest prompts by total errors
+def plot_hardest_prompts(path: Path, prompt_df: pd.DataFrame) -> None:
     hard = prompt_df.groupby("prompt_id", as_index=False)["total_error_count_across_iterations"].sum().sort_values("total_error_count_across_iterations", ascending=False).head(25)
     plt.figure(figsize=(12, 6))
     sns.barplot(data=hard, x="prompt_id", y="total_error_count_across_iterations", color="#ff7f00")
@@ -278,33 +270,30 @@ def main() -> None:
     plt.title("Hardest Prompts by Cumulative Error Count")
     plt.xlabel("Prompt ID")
     plt.ylabel("Total errors (pooled)")
-    p = figures_dir / "14_hardest_prompts_total_errors.png"
-    savefig(p)
-    catalog.append((p.name, "Hardest prompts by total errors", "Outlier prompts"))
+    savefig(path)
 
-    # 15. Runtime distribution by model
+
+def plot_runtime_by_model(path: Path, prompt_df: pd.DataFrame) -> None:
     plt.figure(figsize=(12, 6))
     sns.boxplot(data=prompt_df, x="model", y="wall_time_sec")
     plt.xticks(rotation=30, ha="right")
     plt.title("Runtime Distribution by Model")
     plt.xlabel("Model")
     plt.ylabel("Wall time (seconds)")
-    p = figures_dir / "15_runtime_boxplot_by_model.png"
-    savefig(p)
-    catalog.append((p.name, "Runtime boxplot by model", "Efficiency tradeoff"))
+    savefig(path)
+
 
-    # 16. Token distribution by model
+def plot_tokens_by_model(path: Path, prompt_df: pd.DataFrame) -> None:
     plt.figure(figsize=(12, 6))
     sns.boxplot(data=prompt_df, x="model", y="token_total")
     plt.xticks(rotation=30, ha="right")
     plt.title("Token Distribution by Model")
     plt.xlabel("Model")
     plt.ylabel("Total tokens per prompt")
-    p = figures_dir / "16_tokens_boxplot_by_model.png"
-    savefig(p)
-    catalog.append((p.name, "Token boxplot by model", "Token efficiency"))
+    savefig(path)
+
 
-    # 17. Cost distribution by model (or placeholder)
+def plot_cost_by_model(path: Path, prompt_df: pd.DataFrame) -> None:
     if prompt_df["estimated_cost_usd"].notna().any():
         plt.figure(figsize=(12, 6))
         sns.boxplot(data=prompt_df, x="model", y="estimated_cost_usd")
@@ -312,14 +301,12 @@ def main() -> None:
         plt.title("Estimated Cost Distribution by Model")
         plt.xlabel("Model")
         plt.ylabel("Estimated cost (USD)")
-        p = figures_dir / "17_cost_boxplot_by_model.png"
-        savefig(p)
+        savefig(path)
     else:
-        p = figures_dir / "17_cost_boxplot_by_model.png"
-        fig_placeholder(p, "Estimated Cost Distribution by Model", "Cost data unavailable in current artifacts.")
-    catalog.append((p.name, "Cost distribution (or availability placeholder)", "Cost reporting"))
+        fig_placeholder(path, "Estimated Cost Distribution by Model", "Cost data unavailable in current artifacts.")
+
 
-    # 18. Recovery-only subset distribution
+def plot_recovery_iterations(path: Path, prompt_df: pd.DataFrame) -> None:
     recovery = prompt_df[(~prompt_df["first_shot_pass"]) & (prompt_df["eventual_pass"])]
     if len(recovery) > 0:
         plt.figure(figsize=(8, 5))
@@ -327,26 +314,23 @@ def main() -> None:
         plt.title("Iterations-to-Success for Recovered Cases")
         plt.xlabel("Iterations to first success")
         plt.ylabel("Recovered prompt count")
-        p = figures_dir / "18_recovery_only_iterations_hist.png"
-        savefig(p)
+        savefig(path)
     else:
-        p = figures_dir / "18_recovery_only_iterations_hist.png"
-        fig_placeholder(p, "Recovered Cases", "No recovered cases in current dataset.")
-    catalog.append((p.name, "Recovery-only iterations histogram", "Repair behavior"))
+        fig_placeholder(path, "Recovered Cases", "No recovered cases in current dataset.")
 
-    # 19. Iterations-to-success by model
+
+def plot_iterations_by_model(path: Path, prompt_df: pd.DataFrame) -> None:
     plt.figure(figsize=(12, 6))
     sns.boxplot(data=prompt_df, x="model", y="iterations_to_success")
     plt.xticks(rotation=30, ha="right")
     plt.title("Iterations-to-Success by Model")
     plt.xlabel("Model")
     plt.ylabel("Iterations")
-    p = figures_dir / "19_iterations_to_success_box_by_model.png"
-    savefig(p)
-    catalog.append((p.name, "Iterations-to-success by model", "Convergence by model"))
+    savefig(path)
+
 
-    # 20. First-shot failure rate by model
-    fail_df = by_model.copy()
+def plot_first_shot_failure_by_model(path: Path, prompt_df: pd.DataFrame) -> None:
+    fail_df = model_pass_rates(prompt_df)
     fail_df["first_shot_fail_rate"] = 100.0 - fail_df["first_shot_pass_rate"] * 100.0
     plt.figure(figsize=(12, 6))
     sns.barplot(data=fail_df, x="label", y="first_shot_fail_rate", color="#d95f02")
@@ -354,11 +338,10 @@ def main() -> None:
     plt.ylabel("First-shot fail rate (%)")
     plt.xlabel("Provider / Model")
     plt.title("First-Shot Failure Rate by Model")
-    p = figures_dir / "20_first_shot_failure_rate_by_model.png"
-    savefig(p)
-    catalog.append((p.name, "First-shot failure rate by model", "Baseline weakness"))
+    savefig(path)
+
 
-    # 21. Stacked first-shot vs recovered vs unresolved by model
+def plot_outcome_composition(path: Path, prompt_df: pd.DataFrame) -> None:
     stack_rows = []
     for (provider, model), sub in prompt_df.groupby(["provider", "model"]):
         n = len(sub)
@@ -375,11 +358,10 @@ def main() -> None:
     plt.ylim(0, 105)
     plt.title("Outcome Composition by Model")
     plt.legend()
-    p = figures_dir / "21_outcome_composition_stacked_by_model.png"
-    savefig(p)
-    catalog.append((p.name, "Outcome composition stacked bars", "How final success is achieved"))
+    savefig(path)
 
-    # 22. Mean error count by iteration and model
+
+def plot_error_trend_by_model(path: Path, iter_df: pd.DataFrame) -> None:
     trend = iter_df.groupby(["provider", "model", "iteration_index"], as_index=False)["error_count"].mean()
     trend["label"] = trend["provider"] + "/" + trend["model"]
     plt.figure(figsize=(12, 6))
@@ -387,23 +369,20 @@ def main() -> None:
     plt.title("Mean Error Count by Iteration")
     plt.xlabel("Iteration")
     plt.ylabel("Mean error count")
-    p = figures_dir / "22_iteration_error_trend_by_model.png"
-    savefig(p)
-    catalog.append((p.name, "Error trend by iteration and model", "Repair dynamics"))
+    savefig(path)
+
 
-    # 23. Warning vs error scatter per iteration
+def plot_warning_vs_error(path: Path, iter_df: pd.DataFrame) -> None:
     if "warning_count" in iter_df.columns:
         plt.figure(figsize=(8, 5))
         sns.scatterplot(data=iter_df, x="warning_count", y="error_count", hue="provider", alpha=0.6)
         plt.title("Warnings vs Errors per Iteration")
-        p = figures_dir / "23_warning_vs_error_scatter.png"
-        savefig(p)
+        savefig(path)
     else:
-        p = figures_dir / "23_warning_vs_error_scatter.png"
-        fig_placeholder(p, "Warnings vs Errors", "warning_count unavailable.")
-    catalog.append((p.name, "Warning-vs-error scatter", "Diagnostic only"))
+        fig_placeholder(path, "Warnings vs Errors", "warning_count unavailable.")
 
-    # 24. Prompt difficulty rank curve by model
+
+def plot_difficulty_rank_curves(path: Path, prompt_df: pd.DataFrame) -> None:
     plt.figure(figsize=(12, 6))
     for (provider, model), sub in prompt_df.groupby(["provider", "model"]):
         vals = np.sort(sub["total_error_count_across_iterations"].fillna(0).to_numpy())[::-1]
@@ -412,33 +391,126 @@ def main() -> None:
     plt.ylabel("Total error count")
     plt.title("Prompt Difficulty Rank Curves by Model")
     plt.legend()
-    p = figures_dir / "24_prompt_difficulty_rank_curves_by_model.png"
-    savefig(p)
-    catalog.append((p.name, "Prompt difficulty rank curves", "Tail difficulty behavior"))
+    savefig(path)
+
 
-    # 25. Runtime vs tokens scatter
+def plot_runtime_vs_tokens(path: Path, prompt_df: pd.DataFrame) -> None:
     plt.figure(figsize=(8, 5))
     sns.scatterplot(data=prompt_df, x="token_total", y="wall_time_sec", hue="provider", alpha=0.6)
     plt.xlabel("Total tokens")
     plt.ylabel("Wall time (s)")
     plt.title("Runtime vs Token Usage")
-    p = figures_dir / "25_runtime_vs_tokens_scatter.png"
-    savefig(p)
-    catalog.append((p.name, "Runtime vs token scatter", "Cost/runtime scaling"))
+    savefig(path)
+
+
+@dataclass(frozen=True)
+class Figure:
+    filename: str
+    purpose: str
+    use: str
+    tables: Tuple[str, ...]
+    render: Callable[..., None]
+
+    @property
+    def key(self) -> str:
+        return Path(self.filename).stem
+
+
+PROMPTS = ("prompt_level_syntax_metrics",)
+ITERATIONS = ("iteration_level_syntax_metrics",)
+ERRORS = ("error_taxonomy_summary",)
+
+# Registry in catalog order; each figure only receives the tables it declares.
+FIGURES: List[Figure] = [
+    Figure("01_baseline_vs_pipeline_compile_rate_overall.png", "Overall baseline vs pipeline compile rate", "Main headline figure", PROMPTS, plot_overall_compile_rate),
+    Figure("02_baseline_vs_pipeline_compile_rate_by_model.png", "Baseline vs pipeline by model", "Model comparison", PROMPTS, plot_compile_rate_by_model),
+    Figure("03_absolute_relative_improvement_by_model.png", "Absolute and relative improvement by model", "Improvement framing", PROMPTS, plot_improvement_by_model),
+    Figure("04_paired_outcome_matrix_overall.png", "Paired first-vs-final outcome matrix", "Transition structure", PROMPTS, plot_paired_outcome_matrix),
+    Figure("05_iterations_to_success_hist_overall.png", "Iterations-to-success histogram", "Convergence profile", PROMPTS, plot_iterations_hist),
+    Figure("06_iterations_to_success_ecdf_overall.png", "ECDF of iterations-to-success", "Convergence compactness", PROMPTS, plot_iterations_ecdf),
+    Figure("07_cumulative_success_by_iteration_overall.png", "Cumulative success by iteration", "Pipeline convergence", PROMPTS, plot_cumulative_success),
+    Figure("08_unresolved_survival_by_iteration_overall.png", "Unresolved-survival by iteration", "Remaining failure surface", PROMPTS, plot_unresolved_survival),
+    Figure("09_error_count_drop_first_to_final.png", "First-vs-final error counts", "Error elimination behavior", PROMPTS, plot_error_drop),
+    Figure("10_first_error_vs_iters_scatter.png", "Initial errors vs iterations", "Difficulty signal", PROMPTS, plot_first_error_vs_iterations),
+    Figure("11_error_taxonomy_pareto_first_iteration.png", "Top first-iteration error families", "Failure mode taxonomy", ERRORS, plot_error_pareto_first_iteration),
+    Figure("12_error_taxonomy_pareto_all_iterations.png", "Top all-iteration error families", "Aggregate failure modes", ERRORS, plot_error_pareto_all_iterations),
+    Figure("13_prompt_iteration_error_heatmap_all_models.png", "Prompt x iteration error heatmap", "Difficulty heterogeneity", ITERATIONS, plot_prompt_iteration_heatmap),
+    Figure("14_hardest_prompts_total_errors.png", "Hardest prompts by total errors", "Outlier prompts", PROMPTS, plot_hardest_prompts),
+    Figure("15_runtime_boxplot_by_model.png", "Runtime boxplot by model", "Efficiency tradeoff", PROMPTS, plot_runtime_by_model),
+    Figure("16_tokens_boxplot_by_model.png", "Token boxplot by model", "Token efficiency", PROMPTS, plot_tokens_by_model),
+    Figure("17_cost_boxplot_by_model.png", "Cost distribution (or availability placeholder)", "Cost reporting", PROMPTS, plot_cost_by_model),
+    Figure("18_recovery_only_iterations_hist.png", "Recovery-only iterations histogram", "Repair behavior", PROMPTS, plot_recovery_iterations),
+    Figure("19_iterations_to_success_box_by_model.png", "Iterations-to-success by model", "Convergence by model", PROMPTS, plot_iterations_by_model),
+    Figure("20_first_shot_failure_rate_by_model.png", "First-shot failure rate by model", "Baseline weakness", PROMPTS, plot_first_shot_failure_by_model),
+    Figure("21_outcome_composition_stacked_by_model.png", "Outcome composition stacked bars", "How final success is achieved", PROMPTS, plot_outcome_composition),
+    Figure("22_iteration_error_trend_by_model.png", "Error trend by iteration and model", "Repair dynamics", ITERATIONS, plot_error_trend_by_model),
+    Figure("23_warning_vs_error_scatter.png", "Warning-vs-error scatter", "Diagnostic only", ITERATIONS, plot_warning_vs_error),
+    Figure("24_prompt_difficulty_rank_curves_by_model.png", "Prompt difficulty rank curves", "Tail difficulty behavior", PROMPTS, plot_difficulty_rank_curves),
+    Figure("25_runtime_vs_tokens_scatter.png", "Runtime vs token scatter", "Cost/runtime scaling", PROMPTS, plot_runtime_vs_tokens),
+]
+FIGURES_BY_KEY: Dict[str, Figure] = {figure.key: figure for figure in FIGURES}
+
+# Tables loaded once per rendering process (see init_renderer).
+_TABLES: Dict[str, pd.DataFrame] = {}
+
+
+def init_renderer(data_dir: Path, tables: Sequence[str]) -> None:
+    _TABLES.clear()
+    for table in tables:
+        _TABLES[table] = load_table(data_dir, table)
+    sns.set_theme(style="whitegrid", context="talk")
+
+
+def render_figure(key: str, figures_dir: Path) -> str:
+    figure = FIGURES_BY_KEY[key]
+    figure.render(figures_dir / figure.filename, **{TABLE_ARGS[table]: _TABLES[table] for table in figure.tables})
+    return figure.filename
 
-    # Figure catalog markdown
+
+def render_figures(keys: Sequence[str], data_dir: Path, figures_dir: Path, workers: int) -> List[str]:
+    """Render `keys` (in order) in-process or across a pool whose workers each load the tables once."""
+    tables = sorted({table for key in keys for table in FIGURES_BY_KEY[key].tables})
+    if workers <= 1 or len(keys) <= 1:
+        init_renderer(data_dir, tables)
+        return [render_figure(key, figures_dir) for key in keys]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(keys)),
+        initializer=init_renderer,
+        initargs=(data_dir, tables),
+    ) as executor:
+        return list(executor.map(render_figure, keys, [figures_dir] * len(keys)))
+
+
+def write_catalog(figures_dir: Path) -> Path:
     lines = [
         "# Figure Catalog",
         "",
         "| Figure | Purpose | When To Use |",
         "|---|---|---|",
     ]
-    for name, purpose, use in catalog:
-        lines.append(f"| `{name}` | {purpose} | {use} |")
-    (figures_dir / "FIGURE_CATALOG.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    for figure in FIGURES:
+        lines.append(f"| `{figure.filename}` | {figure.purpose} | {figure.use} |")
+    catalog_path = figures_dir / CATALOG_NAME
+    catalog_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return catalog_path
+
+
+def main() -> None:
+    args = parse_args()
+    data_dir = args.data_dir.resolve()
+    figures_dir = args.figures_dir.resolve()
+    figures_dir.mkdir(parents=True, exist_ok=True)
+
+    if not args.catalog_only:
+        keys = args.only or [figure.key for figure in FIGURES]
+        unknown = [key for key in keys if key not in FIGURES_BY_KEY]
+        if unknown:
+            raise SystemExit(f"Unknown figure key(s): {', '.join(unknown)}")
+        rendered = render_figures(keys, data_dir, figures_dir, args.workers)
+        print(f"[ok] wrote {len(rendered)} figures to {figures_dir}")
 
-    print(f"[ok] wrote {len(catalog)} figures to {figures_dir}")
-    print(f"[ok] wrote {figures_dir / 'FIGURE_CATALOG.md'}")
+    if args.only is None:
+        print(f"[ok] wrote {write_catalog(figures_dir)}")
 
 
 if __name__ == "__main__":
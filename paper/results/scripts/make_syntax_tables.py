@@ -4,12 +4,24 @@
 from __future__ import annotations
 
 import argparse
-import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Sequence, Tuple
 
 import pandas as pd
 
+from syntax_data import load_table
+
+# Data table -> keyword argument name passed to the table builders.
+TABLE_ARGS = {
+    "prompt_level_syntax_metrics": "prompt_df",
+    "iteration_level_syntax_metrics": "iter_df",
+    "model_level_syntax_summary": "model_df",
+    "error_taxonomy_summary": "error_df",
+}
+
 
 def parse_args() -> argparse.Namespace:
     script_dir = Path(__file__).resolve().parent
@@ -17,7 +29,23 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--data-dir", type=Path, default=repo_root / "paper" / "results" / "data")
     parser.add_argument("--tables-dir", type=Path, default=repo_root / "paper" / "results" / "tables")
-    return parser.parse_args()
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        default=None,
+        metavar="KEY",
+        help="Build only these tables (file stems, e.g. table_model_comparison).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to build tables (default: %(default)s).",
+    )
+    args = parser.parse_args()
+    if args.workers <= 0:
+        raise SystemExit("--workers must be > 0")
+    return args
 
 
 def pct(x: Any, d: int = 2) -> str:
@@ -51,19 +79,8 @@ def write_tex_table(path: Path, df: pd.DataFrame, caption: str, label: str) -> N
     path.write_text(wrapped, encoding="utf-8")
 
 
-def main() -> None:
-    args = parse_args()
-    data_dir = args.data_dir.resolve()
-    tables_dir = args.tables_dir.resolve()
-    tables_dir.mkdir(parents=True, exist_ok=True)
-
-    prompt_df = pd.read_csv(data_dir / "prompt_level_syntax_metrics.csv")
-    model_df = pd.read_csv(data_dir / "model_level_syntax_summary.csv")
-    iter_df = pd.read_csv(data_dir / "iteration_level_syntax_metrics.csv")
-    error_df = pd.read_csv(data_dir / "error_taxonomy_summary.csv")
-    stat_tests = json.loads((data_dir / "stat_tests.json").read_text(encoding="utf-8"))
-
-    # Table 1: Overall compile outcomes
+def build_overall_outcomes(model_df: pd.DataFrame) -> pd.DataFrame:
+    """Overall compile outcomes."""
     overall = model_df[(model_df["provider"] == "ALL") & (model_df["model"] == "ALL")].iloc[0]
     tbl_overall = pd.DataFrame(
         [
@@ -117,14 +134,11 @@ def main() -> None:
             },
         ]
     )
-    write_tex_table(
-        tables_dir / "table_overall_compile_outcomes.tex",
-        tbl_overall,
-        caption="Overall compiler-gated outcomes for single-shot baseline vs iterative pipeline.",
-        label="tab:overall_compile",
-    )
+    return tbl_overall
+
 
-    # Table 2: Model comparison
+def build_model_comparison(model_df: pd.DataFrame) -> pd.DataFrame:
+    """Model comparison."""
     model_rows = model_df[~((model_df["provider"] == "ALL") & (model_df["model"] == "ALL"))].copy()
     model_rows = model_rows.sort_values(["provider", "model"]) 
     tbl_model = pd.DataFrame(
@@ -141,16 +155,12 @@ def main() -> None:
             "Max iters": model_rows["iterations_to_success_max"].map(num),
         }
     )
-    write_tex_table(
-        tables_dir / "table_model_comparison.tex",
-        tbl_model,
-        caption="Per-model syntactic reliability summary.",
-        label="tab:model_comparison",
-    )
+    return tbl_model
 
-    # Table 3: Iteration distribution (overall + per model)
+
+def build_iteration_distribution(prompt_df: pd.DataFrame) -> pd.DataFrame:
+    """Iteration distribution (overall + per model)."""
     tmp = prompt_df.copy()
-    tmp["iterations_to_success"] = pd.to_numeric(tmp["iterations_to_success"], errors="coerce")
     dist_all = (
         tmp.groupby("iterations_to_success", dropna=True)
         .size()
@@ -185,14 +195,11 @@ def main() -> None:
     )
     dist_tbl["Iteration"] = dist_tbl["Iteration"].map(num)
     dist_tbl["Share"] = dist_tbl["Share"].map(pct)
-    write_tex_table(
-        tables_dir / "table_iteration_distribution.tex",
-        dist_tbl,
-        caption="Distribution of iterations required to reach first successful compile.",
-        label="tab:iteration_distribution",
-    )
+    return dist_tbl
+
 
-    # Table 4: Top error taxonomy (first iteration and first failed iteration)
+def build_error_taxonomy_top(error_df: pd.DataFrame) -> pd.DataFrame:
+    """Top error taxonomy (first iteration and first failed iteration)."""
     err_top = error_df[(error_df["provider"] == "ALL") & (error_df["model"] == "ALL") & (error_df["scope"] == "first_iteration")].copy()
     err_top = err_top.sort_values(["error_count", "error_family"], ascending=[False, True]).head(20)
     err_tbl = pd.DataFrame(
@@ -202,14 +209,11 @@ def main() -> None:
             "Prompts affected": err_top["prompts_affected"].map(int_or_na),
         }
     )
-    write_tex_table(
-        tables_dir / "table_error_taxonomy_top.tex",
-        err_tbl,
-        caption="Top compiler error families on first iteration (pooled across models).",
-        label="tab:error_taxonomy_top",
-    )
+    return err_tbl
+
 
-    # Table 5: Hardest prompts
+def build_hardest_prompts(prompt_df: pd.DataFrame) -> pd.DataFrame:
+    """Hardest prompts."""
     hardest = prompt_df.copy()
     hardest = hardest.sort_values(
         ["total_error_count_across_iterations", "iterations_run", "first_iteration_error_count", "prompt_id"],
@@ -226,14 +230,11 @@ def main() -> None:
             "Eventual pass": hardest["eventual_pass"].astype(str),
         }
     )
-    write_tex_table(
-        tables_dir / "table_hardest_prompts.tex",
-        hardest_tbl,
-        caption="High-burden prompts by cumulative compiler error volume.",
-        label="tab:hardest_prompts",
-    )
+    return hardest_tbl
 
-    # Table 6: Runtime/token/cost summary
+
+def build_runtime_token_cost(prompt_df: pd.DataFrame) -> pd.DataFrame:
+    """Runtime/token/cost summary."""
     rt = prompt_df.copy()
     grouped = rt.groupby(["provider", "model"], as_index=False).agg(
         n=("prompt_id", "count"),
@@ -265,14 +266,117 @@ def main() -> None:
             "Total cost (USD)": grouped["est_cost_total"].map(num),
         }
     )
-    write_tex_table(
-        tables_dir / "table_runtime_token_cost_summary.tex",
-        rt_tbl,
-        caption="Runtime, token, and estimated cost summary by model (cost is NA when unavailable).",
-        label="tab:runtime_token_cost",
-    )
+    return rt_tbl
+
+
+@dataclass(frozen=True)
+class Table:
+    filename: str
+    caption: str
+    label: str
+    tables: Tuple[str, ...]
+    build: Callable[..., pd.DataFrame]
+
+    @property
+    def key(self) -> str:
+        return Path(self.filename).stem
+
+
+PROMPTS = ("prompt_level_syntax_metrics",)
+MODELS = ("model_level_syntax_summary",)
+ERRORS = ("error_taxonomy_summary",)
+
+# Each table only receives the data tables it declares.
+TABLES: List[Table] = [
+    Table(
+        "table_overall_compile_outcomes.tex",
+        "Overall compiler-gated outcomes for single-shot baseline vs iterative pipeline.",
+        "tab:overall_compile",
+        MODELS,
+        build_overall_outcomes,
+    ),
+    Table(
+        "table_model_comparison.tex",
+        "Per-model syntactic reliability summary.",
+        "tab:model_comparison",
+        MODELS,
+        build_model_comparison,
+    ),
+    Table(
+        "table_iteration_distribution.tex",
+        "Distribution of iterations required to reach first successful compile.",
+        "tab:iteration_distribution",
+        PROMPTS,
+        build_iteration_distribution,
+    ),
+    Table(
+        "table_error_taxonomy_top.tex",
+        "Top compiler error families on first iteration (pooled across models).",
+        "tab:error_taxonomy_top",
+        ERRORS,
+        build_error_taxonomy_top,
+    ),
+    Table(
+        "table_hardest_prompts.tex",
+        "High-burden prompts by cumulative compiler error volume.",
+        "tab:hardest_prompts",
+        PROMPTS,
+        build_hardest_prompts,
+    ),
+    Table(
+        "table_runtime_token_cost_summary.tex",
+        "Runtime, token, and estimated cost summary by model (cost is NA when unavailable).",
+        "tab:runtime_token_cost",
+        PROMPTS,
+        build_runtime_token_cost,
+    ),
+]
+TABLES_BY_KEY: Dict[str, Table] = {table.key: table for table in TABLES}
+
+# Data tables loaded once per building process (see init_builder).
+_DATA: Dict[str, pd.DataFrame] = {}
+
+
+def init_builder(data_dir: Path, tables: Sequence[str]) -> None:
+    _DATA.clear()
+    for table in tables:
+        _DATA[table] = load_table(data_dir, table)
+
+
+def build_table(key: str, tables_dir: Path) -> str:
+    table = TABLES_BY_KEY[key]
+    df = table.build(**{TABLE_ARGS[name]: _DATA[name] for name in table.tables})
+    write_tex_table(tables_dir / table.filename, df, caption=table.caption, label=table.label)
+    return table.filename
+
+
+def build_tables(keys: Sequence[str], data_dir: Path, tables_dir: Path, workers: int) -> List[str]:
+    """Build `keys` (in order) in-process or across a pool whose workers each load the data once."""
+    tables = sorted({name for key in keys for name in TABLES_BY_KEY[key].tables})
+    if workers <= 1 or len(keys) <= 1:
+        init_builder(data_dir, tables)
+        return [build_table(key, tables_dir) for key in keys]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(keys)),
+        initializer=init_builder,
+        initargs=(data_dir, tables),
+    ) as executor:
+        return list(executor.map(build_table, keys, [tables_dir] * len(keys)))
+
+
+def main() -> None:
+    args = parse_args()
+    data_dir = args.data_dir.resolve()
+    tables_dir = args.tables_dir.resolve()
+    tables_dir.mkdir(parents=True, exist_ok=True)
+
+    keys = args.only or [table.key for table in TABLES]
+    unknown = [key for key in keys if key not in TABLES_BY_KEY]
+    if unknown:
+        raise SystemExit(f"Unknown table key(s): {', '.join(unknown)}")
+    built = build_tables(keys, data_dir, tables_dir, args.workers)
 
-    print("[ok] wrote LaTeX tables to", tables_dir)
+    print(f"[ok] wrote {len(built)} LaTeX tables to", tables_dir)
 
 
 if __name__ == "__main__":
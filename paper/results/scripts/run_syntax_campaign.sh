@@ -26,8 +26,10 @@ echo "[campaign] generating figures"
 KEY_FILES=(
   "$DATA_DIR/prompt_level_syntax_metrics.csv"
   "$DATA_DIR/iteration_level_syntax_metrics.csv"
+  "$DATA_DIR/iteration_error_families.csv"
   "$DATA_DIR/model_level_syntax_summary.csv"
   "$DATA_DIR/error_taxonomy_summary.csv"
+  "$DATA_DIR/provider_comparisons.csv"
   "$DATA_DIR/stat_tests.json"
 )
 
@@ -50,8 +52,8 @@ PY
 
 HASH1="$(hash_bundle)"
 
-# Re-run extract+compute only, then compare hashes
-"$PYTHON_BIN" "$SCRIPT_DIR/extract_syntax_metrics.py" --repo-root "$REPO_ROOT" >/dev/null
+# Re-run extract (bypassing the per-case cache) + compute only, then compare hashes
+"$PYTHON_BIN" "$SCRIPT_DIR/extract_syntax_metrics.py" --repo-root "$REPO_ROOT" --rebuild >/dev/null
 "$PYTHON_BIN" "$SCRIPT_DIR/compute_syntax_stats.py" --output-data-dir "$DATA_DIR" >/dev/null
 
 HASH2="$(hash_bundle)"
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Typed storage for the syntax-campaign data tables.
+
+Every table is written as CSV and, when pyarrow is installed, as Parquet with
+an explicit schema. `load_table` prefers the Parquet file and otherwise reads
+the CSV and coerces it to the same dtypes, so downstream scripts get bools,
+numbers and family dicts without their own conversion code.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - Parquet output is optional
+    pa = None
+    pq = None
+
+BOOL, INT, FLOAT, STR, FAMILIES = "bool", "int", "float", "str", "families"
+
+# Column kinds per table. FAMILIES columns are JSON strings named `<name>_json`
+# in the CSV and `map<string, int64>` columns named `<name>` in Parquet; the
+# loader always returns them as `<name>` holding dicts.
+TABLE_COLUMNS: Dict[str, Dict[str, str]] = {
+    "prompt_level_syntax_metrics": {
+        "provider": STR,
+        "model": STR,
+        "prompt_id": INT,
+        "first_shot_pass": BOOL,
+        "eventual_pass": BOOL,
+        "iterations_run": INT,
+        "iterations_to_success": INT,
+        "unresolved_within_cap": BOOL,
+        "first_iteration_error_count": INT,
+        "final_error_count": INT,
+        "total_error_count_across_iterations": INT,
+        "first_failed_then_recovered": BOOL,
+        "wall_time_sec": FLOAT,
+        "token_input": INT,
+        "token_output": INT,
+        "token_total": INT,
+        "estimated_cost_usd": FLOAT,
+        "run_start_iteration": INT,
+        "run_end_iteration": INT,
+        "is_resumed_segment": BOOL,
+        "run_id": STR,
+        "session_id": STR,
+        "source_path": STR,
+    },
+    "iteration_level_syntax_metrics": {
+        "provider": STR,
+        "model": STR,
+        "prompt_id": INT,
+        "iteration_index": INT,
+        "pass_at_iteration": BOOL,
+        "error_count": INT,
+        "error_families": FAMILIES,
+        "iteration_time_sec": FLOAT,
+        "tokens_in": INT,
+        "tokens_out": INT,
+        "tokens_total": INT,
+        "return_code": INT,
+        "warning_count": INT,
+        "warning_families": FAMILIES,
+        "run_id": STR,
+        "session_id": STR,
+        "source_path": STR,
+    },
+    "iteration_error_families": {
+        "provider": STR,
+        "model": STR,
+        "prompt_id": INT,
+        "iteration_index": INT,
+        "error_family": STR,
+        "count": INT,
+    },
+}
+
+_BOOL_STRINGS = {"true": True, "false": False, "1": True, "0": False}
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def csv_columns(table: str) -> List[str]:
+    return [f"{name}_json" if kind == FAMILIES else name for name, kind in TABLE_COLUMNS[table].items()]
+
+
+def arrow_schema(table: str) -> "pa.Schema":
+    types = {
+        BOOL: pa.bool_(),
+        INT: pa.int64(),
+        FLOAT: pa.float64(),
+        STR: pa.string(),
+        FAMILIES: pa.map_(pa.string(), pa.int64()),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in TABLE_COLUMNS[table].items()])
+
+
+def _family_dict(value: Any) -> Dict[str, int]:
+    if isinstance(value, dict):
+        return {str(k): int(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return {str(k): int(v) for k, v in value}
+    if isinstance(value, str) and value.strip():
+        try:
+            obj = json.loads(value)
+        except json.JSONDecodeError:
+            return {}
+        return _family_dict(obj) if isinstance(obj, dict) else {}
+    return {}
+
+
+def write_rows(data_dir: Path, table: str, rows: Sequence[Dict[str, Any]]) -> List[Path]:
+    """Write extraction rows (CSV-shaped dicts) as `<table>.csv` and, if possible, `<table>.parquet`."""
+    csv_path = data_dir / f"{table}.csv"
+    cols = csv_columns(table)
+    with csv_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=cols)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({c: row.get(c) for c in cols})
+    written = [csv_path]
+    if parquet_available():
+        columns: Dict[str, List[Any]] = {}
+        for name, kind in TABLE_COLUMNS[table].items():
+            if kind == FAMILIES:
+                columns[name] = [sorted(_family_dict(row.get(f"{name}_json")).items()) for row in rows]
+            else:
+                columns[name] = [row.get(name) for row in rows]
+        parquet_path = data_dir / f"{table}.parquet"
+        pq.write_table(pa.table(columns, schema=arrow_schema(table)), parquet_path)
+        written.append(parquet_path)
+    return written
+
+
+def write_frame(data_dir: Path, table: str, df: pd.DataFrame) -> List[Path]:
+    """Write a derived DataFrame as `<table>.csv` and, if possible, `<table>.parquet`."""
+    csv_path = data_dir / f"{table}.csv"
+    df.to_csv(csv_path, index=False)
+    written = [csv_path]
+    if parquet_available():
+        parquet_path = data_dir / f"{table}.parquet"
+        df.to_parquet(parquet_path, index=False)
+        written.append(parquet_path)
+    return written
+
+
+def _coerce_csv(table: str, df: pd.DataFrame) -> pd.DataFrame:
+    for name, kind in TABLE_COLUMNS[table].items():
+        if kind == FAMILIES:
+            source = f"{name}_json"
+            values = df[source] if source in df.columns else pd.Series([None] * len(df), index=df.index)
+            df[name] = values.map(_family_dict)
+            if source in df.columns:
+                df = df.drop(columns=[source])
+        elif name not in df.columns:
+            df[name] = pd.Series([None] * len(df), index=df.index, dtype=float if kind in (INT, FLOAT) else object)
+        elif kind == BOOL:
+            if df[name].dtype != bool:
+                df[name] = df[name].astype(str).str.strip().str.lower().map(_BOOL_STRINGS).fillna(False).astype(bool)
+        elif kind in (INT, FLOAT):
+            df[name] = pd.to_numeric(df[name], errors="coerce")
+    return df[list(TABLE_COLUMNS[table])]
+
+
+def load_table(data_dir: Path, table: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Load `<table>` from Parquet when present, else from CSV with schema coercion."""
+    parquet_path = data_dir / f"{table}.parquet"
+    csv_path = data_dir / f"{table}.csv"
+    if parquet_available() and parquet_path.exists() and (
+        not csv_path.exists() or parquet_path.stat().st_mtime_ns >= csv_path.stat().st_mtime_ns
+    ):
+        df = pq.read_table(parquet_path, columns=list(columns) if columns else None).to_pandas()
+        for name, kind in TABLE_COLUMNS.get(table, {}).items():
+            if kind == FAMILIES and name in df.columns:
+                df[name] = df[name].map(_family_dict)
+        return df
+    if not csv_path.exists():
+        raise FileNotFoundError(csv_path)
+    df = pd.read_csv(csv_path)
+    if table in TABLE_COLUMNS:
+        df = _coerce_csv(table, df)
+    return df[list(columns)] if columns else df
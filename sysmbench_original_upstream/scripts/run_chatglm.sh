@@ -5,13 +5,12 @@ reasons=(
   "grammar"
 )
 
-for reason in "${reasons[@]}"; do
-  CUDA_VISIBLE_DEVICES=4,5,6,7 python src/llm_inference/run_chatglm.py \
-      --data dataset/sysml/dataset.json \
-      --reason "${reason}" \
-      --prompt_dir prompts \
-      --model_type general \
-      --model  chatglm3-6b \
-      --moda greedy \
-      --output_dir predict
-done
+# 模型只加载一次，依次生成所有推理模式
+CUDA_VISIBLE_DEVICES=4,5,6,7 python src/llm_inference/run_chatglm.py \
+    --data dataset/sysml/dataset.json \
+    --reason "${reasons[@]}" \
+    --prompt_dir prompts \
+    --model_type general \
+    --model  chatglm3-6b \
+    --moda greedy \
+    --output_dir predict
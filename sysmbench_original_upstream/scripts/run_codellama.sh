@@ -5,13 +5,12 @@ reasons=(
   "grammar"
 )
 
-for reason in "${reasons[@]}"; do
-  CUDA_VISIBLE_DEVICES=0,1 python src/llm_inference/run_codellama.py \
-      --data dataset/sysml/dataset.json \
-      --reason "${reason}" \
-      --prompt_dir prompts \
-      --model_type general \
-      --model CodeLlama-13b-Instruct-hf \
-      --moda greedy \
-      --output_dir predict
-done
+# 模型只加载一次，依次生成所有推理模式
+CUDA_VISIBLE_DEVICES=0,1 python src/llm_inference/run_codellama.py \
+    --data dataset/sysml/dataset.json \
+    --reason "${reasons[@]}" \
+    --prompt_dir prompts \
+    --model_type general \
+    --model CodeLlama-13b-Instruct-hf \
+    --moda greedy \
+    --output_dir predict
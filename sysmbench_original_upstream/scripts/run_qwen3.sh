@@ -5,13 +5,12 @@ reasons=(
   "grammar"
 )
 
-for reason in "${reasons[@]}"; do
-  python src/llm_inference/run_qwen3.py \
-      --data dataset/sysml/dataset.json \
-      --reason "${reason}" \
-      --prompt_dir prompts \
-      --model_type general \
-      --model qwen3 \
-      --moda greedy \
-      --output_dir predict
-done
\ No newline at end of file
+# 所有推理模式在一次运行中并发生成；中断后重跑时已完成的模式直接跳过，未完成的从断点继续（--force 重新生成）
+python src/llm_inference/run_qwen3.py \
+    --data dataset/sysml/dataset.json \
+    --reason "${reasons[@]}" \
+    --prompt_dir prompts \
+    --model_type general \
+    --model qwen3 \
+    --moda greedy \
+    --output_dir predict
\ No newline at end of file
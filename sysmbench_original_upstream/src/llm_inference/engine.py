@@ -0,0 +1,297 @@
+import os
+import json
+import time
+import random
+import threading
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from lm_inference import FakeBackend, TransformersBackend, VllmBackend, batched_generate
+
+# 统一推理入口：取代各个 run_<model>.py 中重复的 get_prompt / 加载模型 / 逐条生成 / 最后保存。
+#   python src/llm_inference/engine.py --model CodeLlama-13b-Instruct-hf --reason direct few-shot cot grammar
+# 原来的 run_<model>.py 现在只是固定了预设名的入口，命令行参数与以前兼容。
+
+REASONS = ["direct", "few-shot", "cot", "grammar"]
+
+MAGICODER_TEMPLATE = """You are an exceptionally intelligent coding assistant that consistently delivers accurate and reliable responses to user instructions.
+
+    @@ Instruction
+    {instruction}
+
+    @@ Response
+    """
+
+def _vllm(model, stop_token_ids, tensor_parallel_size=1):
+    return {"backend": "vllm", "model": model, "stop_token_ids": stop_token_ids,
+            "tensor_parallel_size": tensor_parallel_size, "max_tokens": 256, "max_model_len": 1024}
+
+# 模型预设，键为 predict/ 下的目录名（即 scripts/*.sh 传入的 --model）
+MODEL_PRESETS = {
+    "Baichuan2-13B-Chat": _vllm("baichuan-inc/Baichuan2-13B-Chat", [2]),
+    "chatglm3-6b": _vllm("ZhipuAI/chatglm3-6b", [2], 4),
+    "CodeLlama-13b-Instruct-hf": _vllm("AI-ModelScope/CodeLlama-13b-Instruct-hf", [2], 2),
+    "Codestral-22B-v0.1": _vllm("LLM-Research/Codestral-22B-v0.1", [1], 2),
+    "DeepSeek-Coder-V2-Lite-Instruct": _vllm("deepseek-ai/DeepSeek-Coder-V2-Lite-Instruct", [2], 2),
+    "gemma-2-9b-it": _vllm("LLM-Research/gemma-2-9b-it", [1], 4),
+    "internlm3-8b-instruct": _vllm("Shanghai_AI_Laboratory/internlm3-8b-instruct", [2], 4),
+    "Meta-Llama-3.1-8B-Instruct": _vllm("LLM-Research/Meta-Llama-3.1-8B-Instruct", [128001], 4),
+    "Mistral-7B-Instruct-v0.2": _vllm("AI-ModelScope/Mistral-7B-Instruct-v0.2", [2], 8),
+    "Phind-CodeLlama-34B-v2": _vllm("TheBloke/Phind-CodeLlama-34B-v2-AWQ", [2], 4),
+    "starcoder2-7b": _vllm("AI-ModelScope/starcoder2-7b", [0], 2),
+    "WizardCoder-15B-V1.0": _vllm("AI-ModelScope/WizardCoder-15B-V1.0", [0], 2),
+    # transformers 预设的 batch_size 在 --batch_size 为 0 时生效，避免 151 条 prompt 填充成一批导致显存溢出
+    "codegen-350M-multi": {"backend": "transformers", "model": "Salesforce/codegen-350M-multi",
+                           "device": "cuda", "max_tokens": 256, "batch_size": 8},
+    "octocoder": {"backend": "transformers", "model": "bigcode/octocoder", "device": "auto", "max_tokens": 256,
+                  "batch_size": 8},
+    # 原脚本：pipeline(torch_dtype=bfloat16) + max_length=1024（prompt 与回答合计）
+    "Magicoder-S-CL-7B": {"backend": "transformers", "model": "ise-uiuc/Magicoder-S-CL-7B", "device": "auto",
+                          "max_tokens": 1024, "max_length": 1024, "torch_dtype": "bfloat16", "batch_size": 8,
+                          "prompt_wrapper": MAGICODER_TEMPLATE, "strip": True},
+    "gpt_4.1": {"backend": "openai", "model": "gpt-4.1-2025-04-14", "api_key_env": ["OPENAI_API_KEY"],
+                "base_url": os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")},
+    # 原脚本经 OpenAI 兼容代理调用 Claude；直连 Anthropic 用 --backend anthropic
+    "claude3": {"backend": "openai", "model": "claude-3-opus-20240229",
+                "api_key_env": ["OPENAI_API_KEY", "OPENAI_API_KEY_BACKUP", "OPENAI_API_KEY_CODEX52"], "rotate_keys": True,
+                "base_url": os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")},
+    "deepseek_r1": {"backend": "openai", "model": "deepseek-ai/DeepSeek-R1",
+                    "api_key_env": ["SILICONFLOW_API_KEY", "OPENAI_API_KEY"], "base_url": "https://api.siliconflow.cn/v1"},
+    "qwen3": {"backend": "openai", "model": "Qwen/Qwen3-32B",
+              "api_key_env": ["SILICONFLOW_API_KEY", "OPENAI_API_KEY"], "base_url": "https://api.siliconflow.cn/v1"},
+    "fake": {"backend": "fake"},
+}
+
+# 后端注册表：名称 -> 工厂函数(preset, args)。各后端的第三方库在工厂内部才导入。
+BACKENDS = {}
+
+def register_backend(name):
+    def register(factory):
+        BACKENDS[name] = factory
+        return factory
+    return register
+
+@register_backend("vllm")
+def make_vllm_backend(preset, args):
+    from vllm import LLM, SamplingParams
+    os.environ['VLLM_USE_MODELSCOPE'] = 'True'
+    sampling_params = SamplingParams(temperature=0.0, max_tokens=args.max_tokens or preset["max_tokens"],
+                                     stop_token_ids=preset["stop_token_ids"], n=1)
+    model = LLM(model=preset["model"], tokenizer=None, max_model_len=preset["max_model_len"], trust_remote_code=True,
+                gpu_memory_utilization=0.9, tensor_parallel_size=preset["tensor_parallel_size"])
+    return VllmBackend(model, sampling_params)
+
+@register_backend("transformers")
+def make_transformers_backend(preset, args):
+    os.environ.setdefault('HF_ENDPOINT', 'https://hf-mirror.com')
+    # 显式给出 --max_tokens 时按新生成 token 数限制，否则沿用预设的 max_length（总长度上限）
+    return TransformersBackend(preset["model"], max_tokens=args.max_tokens or preset["max_tokens"],
+                               device=args.device or preset.get("device", "cpu"),
+                               torch_dtype=preset.get("torch_dtype"),
+                               max_length=None if args.max_tokens else preset.get("max_length"))
+
+@register_backend("fake")
+def make_fake_backend(preset, args):
+    return FakeBackend()
+
+def api_keys_from_env(names, rotate=False):
+    """rotate=True 时返回所有已设置的 key（失败后轮换），否则只取第一个已设置的。"""
+    keys = [os.getenv(name) for name in names if os.getenv(name)]
+    if not keys:
+        raise RuntimeError(f"Set {' or '.join(names)} in environment")
+    return keys if rotate else keys[:1]
+
+def is_retryable(exc):
+    """连接错误、超时、限流和 5xx 重试；其余 4xx（鉴权、参数错误等）直接失败。"""
+    status = getattr(exc, "status_code", None)
+    return status is None or status in (408, 409, 429) or status >= 500
+
+class ConcurrentApiBackend:
+    """HTTP API 后端：客户端在所有线程间共用，同时进行的请求不超过 concurrency（多个推理模式并行时也一样），
+    失败后按封顶的指数退避（带抖动）重试，按完成顺序产出结果。"""
+    def __init__(self, concurrency=8, max_retries=8, retry_base=1.0, retry_cap=30.0):
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self.slots = threading.BoundedSemaphore(self.concurrency)
+
+    def complete(self, prompt, attempt):
+        raise NotImplementedError
+
+    def backoff(self, attempt):
+        return random.uniform(0, min(self.retry_cap, self.retry_base * (2 ** attempt)))
+
+    def complete_with_retry(self, prompt):
+        attempt = 0
+        while True:
+            try:
+                with self.slots:
+                    return self.complete(prompt, attempt)
+            except Exception as e:
+                if not is_retryable(e) or (self.max_retries and attempt >= self.max_retries):
+                    raise
+                delay = self.backoff(attempt)
+                print(f"{type(e).__name__}: {e} (retry {attempt + 1} in {delay:.1f}s)")
+                time.sleep(delay)
+                attempt += 1
+
+    def generate_iter(self, prompts):
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        futures = {executor.submit(self.complete_with_retry, prompt): i for i, prompt in enumerate(prompts)}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # 出错或中断时不再发起排队中的请求；已完成的结果都已写入断点
+            executor.shutdown(wait=True, cancel_futures=True)
+
+class OpenAIChatBackend(ConcurrentApiBackend):
+    def __init__(self, model, api_keys, base_url, **kwargs):
+        super().__init__(**kwargs)
+        from openai import OpenAI
+        # 每个 key 一个客户端，线程间共用其连接池；重试由上面的退避逻辑负责
+        self.clients = [OpenAI(api_key=api_key, base_url=base_url, max_retries=0) for api_key in api_keys]
+        self.model = model
+
+    def complete(self, prompt, attempt):
+        response = self.clients[attempt % len(self.clients)].chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=self.model,
+            temperature=0
+        )
+        return response.choices[0].message.content
+
+class AnthropicBackend(ConcurrentApiBackend):
+    def __init__(self, model, api_keys, max_tokens=4096, **kwargs):
+        super().__init__(**kwargs)
+        import anthropic
+        self.clients = [anthropic.Anthropic(api_key=api_key, max_retries=0) for api_key in api_keys]
+        self.model = model
+        self.max_tokens = max_tokens
+
+    def complete(self, prompt, attempt):
+        response = self.clients[attempt % len(self.clients)].messages.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=0,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return "".join(block.text for block in response.content if getattr(block, "type", "") == "text")
+
+def retry_options(args):
+    return {"concurrency": args.concurrency, "max_retries": args.max_retries,
+            "retry_base": args.retry_base, "retry_cap": args.retry_cap}
+
+@register_backend("openai")
+def make_openai_backend(preset, args):
+    api_keys = api_keys_from_env(preset["api_key_env"], preset.get("rotate_keys", False))
+    return OpenAIChatBackend(preset["model"], api_keys, args.base_url or preset["base_url"], **retry_options(args))
+
+@register_backend("anthropic")
+def make_anthropic_backend(preset, args):
+    return AnthropicBackend(preset["model"], api_keys_from_env(["ANTHROPIC_API_KEY"]),
+                            max_tokens=args.max_tokens or 4096, **retry_options(args))
+
+def engine_parser_args(default_preset=None):
+    parser = ArgumentParser()
+    parser.add_argument("--data",type=str,default="dataset/sysml/dataset.json")
+    parser.add_argument("--reason",type=str,nargs="+",default=["direct"],choices=REASONS)
+    parser.add_argument("--prompt_dir",type=str,default="prompts")
+    parser.add_argument("--model_type",type=str,default="general",choices=["general","code"]) # 保留以兼容旧脚本
+    parser.add_argument("--model",type=str,required=default_preset is None,default=default_preset,help="predict/ 下的输出目录名")
+    parser.add_argument("--preset",type=str,default=default_preset,choices=sorted(MODEL_PRESETS),help="默认与 --model 相同")
+    parser.add_argument("--moda",type=str,default="greedy") # 保留以兼容旧脚本
+    parser.add_argument("--output_dir",type=str,default="predict")
+    parser.add_argument("--backend",type=str,default=None,choices=sorted(BACKENDS),help="覆盖预设中的后端")
+    parser.add_argument("--batch_size",type=int,default=0,help="每次提交给后端的 prompt 数，0 表示用预设的 batch_size（没有则整个列表）")
+    parser.add_argument("--concurrency",type=int,default=8,help="HTTP API 后端同时进行的请求数上限")
+    parser.add_argument("--max_retries",type=int,default=8,help="单条请求的最大重试次数，0 表示不限")
+    parser.add_argument("--retry_base",type=float,default=1.0,help="指数退避的初始等待（秒）")
+    parser.add_argument("--retry_cap",type=float,default=30.0,help="单次退避等待的上限（秒）")
+    parser.add_argument("--max_tokens",type=int,default=None)
+    parser.add_argument("--device",type=str,default=None,help="transformers 后端的设备（cpu/cuda/auto）")
+    parser.add_argument("--base_url",type=str,default=None)
+    parser.add_argument("--force",action="store_true",help="重新生成已完成的推理模式（同时丢弃其断点）")
+    return parser.parse_args()
+
+def render_prompts(data_path, prompt_dir, reason):
+    """每种推理模式只读一次数据集、模板、example.json 和 sysml_bnf.txt。"""
+    with open(data_path, 'r', encoding='utf-8') as f:
+        dataset = json.load(f)
+    with open(os.path.join(prompt_dir, f"{reason}.txt"), 'r', encoding='utf-8') as f:
+        prompt_template = f.read()
+    fields = {}
+    if reason == "few-shot":
+        with open("example.json", 'r', encoding='utf-8') as f:
+            example = json.load(f)
+        fields = {"req": example["req"], "design": example["design"]}
+    elif reason == "grammar":
+        with open("sysml_bnf.txt", 'r', encoding='utf-8') as f:
+            fields = {"sysml_bnf": f.read()}
+    return [prompt_template.format(requirement=item["nl"], **fields) for item in dataset]
+
+def load_backend(args):
+    preset = dict(MODEL_PRESETS[args.preset or args.model])
+    backend_name = args.backend or preset["backend"]
+    if backend_name not in BACKENDS:
+        raise SystemExit(f"Unknown backend {backend_name}; registered: {', '.join(sorted(BACKENDS))}")
+    return preset, BACKENDS[backend_name](preset, args)
+
+def load_finished(output_path, expected):
+    """已完成的 <reason>.json（长度等于 prompt 数的字符串列表）返回其内容，否则返回 None。"""
+    try:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            answers = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if isinstance(answers, list) and len(answers) == expected:
+        return answers
+    return None
+
+def run_reason(args, preset, backend, reason, position=0):
+    prompt_list = render_prompts(args.data, args.prompt_dir, reason)
+    if preset.get("prompt_wrapper"):
+        prompt_list = [preset["prompt_wrapper"].format(instruction=prompt) for prompt in prompt_list]
+    output_dir = os.path.join(args.output_dir, args.model)
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{reason}.json")
+    checkpoint_path = os.path.join(output_dir, f"{reason}.partial.jsonl")
+    if getattr(args, "force", False):
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+    elif load_finished(output_path, len(prompt_list)) is not None:
+        # 中断的多模式运行重跑时，已经写完的模式不再请求（--force 强制重新生成）
+        print(f"Skip {output_path}: already has {len(prompt_list)} answers (use --force to regenerate)")
+        return
+    batch_size = args.batch_size or preset.get("batch_size", 0)
+    answer_list = batched_generate(prompt_list, backend, batch_size, checkpoint_path,
+                                   desc=f"{args.model}/{reason}", position=position)
+    if preset.get("strip"):
+        answer_list = [answer.strip() for answer in answer_list]
+    # 与原 run_<model>.py 相同的输出格式：字符串列表
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(answer_list, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, output_path)
+    os.remove(checkpoint_path)
+    print(f"Saved {len(answer_list)} answers to {output_path}")
+
+def main(default_preset=None):
+    args = engine_parser_args(default_preset)
+    if (args.preset or args.model) not in MODEL_PRESETS:
+        raise SystemExit(f"Unknown model preset {args.preset or args.model}; use --preset with one of: {', '.join(sorted(MODEL_PRESETS))}")
+    # 模型只加载一次，跑完所有推理模式
+    preset, backend = load_backend(args)
+    if hasattr(backend, "generate_iter") and len(args.reason) > 1:
+        # API 后端：各推理模式并行，共用同一个并发上限，避免每个模式结束时的长尾空等
+        with ThreadPoolExecutor(max_workers=len(args.reason)) as executor:
+            futures = [executor.submit(run_reason, args, preset, backend, reason, position)
+                       for position, reason in enumerate(args.reason)]
+            for future in futures:
+                future.result()
+    else:
+        for reason in args.reason:
+            run_reason(args, preset, backend, reason)
+
+if __name__=="__main__":
+    main()
@@ -1,7 +1,8 @@
 import os
 import json
+import hashlib
+import time
 from argparse import ArgumentParser
-from vllm import LLM, SamplingParams
 from tqdm import tqdm
 
 def llm_parser_args():
@@ -13,6 +14,10 @@ def llm_parser_args():
     parser.add_argument("--model",type=str,required=True)
     parser.add_argument("--moda",type=str,default="greedy")
     parser.add_argument("--output_dir",type=str,default="result")
+    parser.add_argument("--backend",type=str,default="vllm",choices=["vllm","transformers","fake"])
+    parser.add_argument("--batch_size",type=int,default=0,help="每次提交给引擎的 prompt 数，0 表示整个列表一次提交")
+    parser.add_argument("--checkpoint",type=str,default=None,help="默认 <output_dir>/<model>/<reason>.partial.jsonl")
+    parser.add_argument("--max_tokens",type=int,default=1024)
     return parser.parse_args()
 
 def get_prompt(args):
@@ -29,6 +34,7 @@ def get_prompt(args):
     return prompt_list
 
 def load_general_llms(model_name,moda,max_tokens=1024,max_model_len=4096):
+    from vllm import LLM, SamplingParams
     model_dir = ""
     stop_token_id = []
     if model_name == "mistral-small-3.1-24B-instruct": 
@@ -97,28 +103,155 @@ def load_general_llms(model_name,moda,max_tokens=1024,max_model_len=4096):
     #     print("Loading CodeGen2.5-7B-Instruct")
     #     model_dir = "../../LLMs/CodeGen2.5-7B-Instruct"
 
-def general_llm_inference(args,model,sample_params):
+class VllmBackend:
+    """vLLM 引擎：一次 generate 调用处理整批 prompt，由引擎内部做连续批处理。"""
+    def __init__(self, model, sample_params):
+        self.model = model
+        self.sample_params = sample_params
+
+    def generate(self, prompts):
+        outputs = self.model.generate(prompts, self.sample_params)
+        return [output.outputs[0].text for output in outputs]
+
+class TransformersBackend:
+    """HuggingFace transformers 贪心解码，可在 CPU 上用小模型（如 sshleifer/tiny-gpt2）验证流程。"""
+    def __init__(self, model_name, max_tokens=256, device="cpu", torch_dtype=None, max_length=None):
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, padding_side="left")
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        load_kwargs = {}
+        if torch_dtype: # 如 "bfloat16"；不指定时用 transformers 默认精度
+            import torch
+            load_kwargs["torch_dtype"] = getattr(torch, torch_dtype)
+        if device == "auto": # 多 GPU：按层切分到所有可见设备
+            self.model = AutoModelForCausalLM.from_pretrained(model_name, device_map="auto", low_cpu_mem_usage=True, **load_kwargs)
+        else:
+            self.model = AutoModelForCausalLM.from_pretrained(model_name, **load_kwargs).to(device)
+        self.max_tokens = max_tokens
+        # max_length：与原 pipeline(max_length=...) 相同，prompt 加生成的总 token 数上限（优先于 max_tokens）
+        self.max_length = max_length
+
+    def generate(self, prompts):
+        inputs = self.tokenizer(prompts, return_tensors="pt", padding=True).to(self.model.device)
+        prompt_lengths = inputs["attention_mask"].sum(dim=1).tolist()
+        if self.max_length:
+            # 左填充会占用 max_length，所以按最短 prompt 生成，再按各自的长度截断
+            budgets = [max(0, self.max_length - length) for length in prompt_lengths]
+        else:
+            budgets = [self.max_tokens] * len(prompts)
+        if max(budgets) == 0:
+            return [""] * len(prompts)
+        outputs = self.model.generate(**inputs, max_new_tokens=max(budgets), do_sample=False,
+                                      pad_token_id=self.tokenizer.pad_token_id)
+        new_tokens = outputs[:, inputs["input_ids"].shape[1]:]
+        return [self.tokenizer.decode(tokens[:budget], skip_special_tokens=True)
+                for tokens, budget in zip(new_tokens, budgets)]
+
+class FakeBackend:
+    """不加载模型的假引擎：返回确定性的文本，用于测试批处理和断点续跑。"""
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def generate(self, prompts):
+        self.calls += 1
+        time.sleep(self.delay)
+        return [f"package Fake_{prompt_digest(prompt)[:8]} {{ }}" for prompt in prompts]
+
+def prompt_digest(prompt):
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+def load_checkpoint(checkpoint_path, prompt_list):
+    """读取 JSONL 断点，只保留下标和 prompt 哈希都对得上的结果；写了一半的行直接忽略。"""
+    done = {}
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return done
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            index = row.get("index")
+            if isinstance(index, int) and 0 <= index < len(prompt_list) \
+                    and row.get("prompt_sha256") == prompt_digest(prompt_list[index]):
+                done[index] = row["predict"]
+    return done
+
+def batched_generate(prompt_list, backend, batch_size=0, checkpoint_path=None, desc="generating answer", position=0):
+    """按批（batch_size<=0 时整个列表一批）把 prompt 交给 backend，每条结果完成后追加写入 JSONL 断点。
+    backend 提供 generate(prompts) -> 文本列表，或 generate_iter(prompts) 逐条产出 (下标, 文本)。
+    再次运行时跳过断点里已有的结果。返回与 prompt_list 顺序一致的文本列表。"""
+    done = load_checkpoint(checkpoint_path, prompt_list)
+    todo = [i for i in range(len(prompt_list)) if i not in done]
+    if done:
+        print(f"Resuming from {checkpoint_path}: {len(done)} done, {len(todo)} to generate")
+    size = batch_size if batch_size and batch_size > 0 else max(1, len(todo))
+    checkpoint = None
+    if checkpoint_path:
+        os.makedirs(os.path.dirname(os.path.abspath(checkpoint_path)), exist_ok=True)
+        checkpoint = open(checkpoint_path, 'a', encoding='utf-8')
+        if checkpoint.tell() > 0:
+            # 上次中断可能留下没有换行的半行，先另起一行
+            with open(checkpoint_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    checkpoint.write("\n")
+    try:
+        with tqdm(total=len(prompt_list), initial=len(done), desc=desc, position=position) as bar:
+            for start in range(0, len(todo), size):
+                chunk = todo[start:start + size]
+                prompts = [prompt_list[i] for i in chunk]
+                if hasattr(backend, "generate_iter"):
+                    # 并发型引擎（HTTP API）按完成顺序逐条返回 (块内下标, 文本)
+                    completed = backend.generate_iter(prompts)
+                else:
+                    completed = enumerate(backend.generate(prompts))
+                for offset, text in completed:
+                    i = chunk[offset]
+                    done[i] = text
+                    if checkpoint is not None:
+                        checkpoint.write(json.dumps({"index": i, "prompt_sha256": prompt_digest(prompt_list[i]),
+                                                     "predict": text}, ensure_ascii=False) + "\n")
+                        checkpoint.flush()
+                    bar.update(1)
+                if checkpoint is not None:
+                    os.fsync(checkpoint.fileno())
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    return [done[i] for i in range(len(prompt_list))]
+
+def general_llm_inference(args,backend):
     prompt_list = get_prompt(args)
-    predict_list = []
-    for prompt in tqdm(prompt_list, desc="generating answer"):
-        predict = model.generate([prompt], sample_params)
-        predict_text = predict[0].outputs[0].text
-        predict_dict = {
-            "predict": predict_text
-        }
-        predict_list.append(predict_dict)
     output_dir = os.path.join(args.output_dir, args.model)
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     output_path = os.path.join(output_dir, f"{args.reason}.json")
-    with open(output_path, 'w', encoding='utf-8') as f:
+    checkpoint_path = args.checkpoint or os.path.join(output_dir, f"{args.reason}.partial.jsonl")
+    predict_texts = batched_generate(prompt_list, backend, args.batch_size, checkpoint_path)
+    predict_list = [{"predict": predict_text} for predict_text in predict_texts]
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(predict_list, f, ensure_ascii=False, indent=4)
-    
+    os.replace(tmp_path, output_path)
+    # 结果已完整写出，断点文件不再需要
+    os.remove(checkpoint_path)
+
+def load_backend(args):
+    if args.backend == "fake":
+        return FakeBackend()
+    if args.backend == "transformers":
+        return TransformersBackend(args.model, max_tokens=args.max_tokens)
+    model, sample_params = load_general_llms(args.model,args.moda,max_tokens=args.max_tokens)
+    return VllmBackend(model, sample_params)
+
 def evaluate_llm():
     args = llm_parser_args()
-    if args.model_type == "general": # 使用vllm库加载通用模型
-        model, sample_params = load_general_llms(args.model,args.moda)
-        general_llm_inference(args,model,sample_params)
+    if args.model_type == "general": # 使用vllm库（或 --backend 指定的引擎）加载通用模型
+        backend = load_backend(args)
+        general_llm_inference(args,backend)
     elif args.model_type == "code": # 使用vllm库加载代码模型
         pass
 
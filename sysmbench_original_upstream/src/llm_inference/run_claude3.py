@@ -1,100 +1,5 @@
-import os
-import json
-from argparse import ArgumentParser
-from openai import OpenAI
-from tqdm import tqdm
-import time
-
-def llm_parser_args():
-    parser = ArgumentParser()
-    parser.add_argument("--data",type=str,default="dataset/sysml/dataset.json")
-    parser.add_argument("--reason",type=str,default="direct",choices=["direct","few-shot","cot","rag","grammar"])
-    parser.add_argument("--prompt_dir",type=str,default="prompts")
-    parser.add_argument("--model_type",type=str,default="general",choices=["general","code"])
-    parser.add_argument("--model",type=str,required=True)
-    parser.add_argument("--moda",type=str,default="greedy")
-    parser.add_argument("--output_dir",type=str,default="result")
-    return parser.parse_args()
-
-def get_example():
-    with open("example.json", 'r', encoding='utf-8') as f:
-        example = json.load(f)
-    req = example["req"]
-    design = example["design"]
-    return req, design
-
-def get_sysml_bnf():
-    with open("sysml_bnf.txt", 'r', encoding='utf-8') as f:
-        sysml_bnf = f.read()
-    return sysml_bnf
-
-def get_prompt(args):
-    prompt_list = []
-    with open(args.data, 'r', encoding='utf-8') as f:
-        dataset = json.load(f)
-    prompt_template_path = os.path.join(args.prompt_dir, f"{args.reason}.txt")
-    with open(prompt_template_path, 'r', encoding='utf-8') as f:
-        prompt_template = f.read()
-    for item in dataset:
-        nl = item["nl"]
-        if args.reason == "few-shot":
-            req, design = get_example()
-            prompt = prompt_template.format(requirement=nl,req=req,design=design)
-        elif args.reason == "grammar":
-            sysml_bnf = get_sysml_bnf()
-            prompt = prompt_template.format(requirement=nl,sysml_bnf=sysml_bnf)
-        else:
-            prompt = prompt_template.format(requirement=nl)
-        prompt_list.append(prompt)
-    return prompt_list
-
-def claude_3_answer(prompt):
-    API_LIST = []
-    for key_name in ("OPENAI_API_KEY", "OPENAI_API_KEY_BACKUP", "OPENAI_API_KEY_CODEX52"):
-        key_value = os.getenv(key_name)
-        if key_value:
-            API_LIST.append(key_value)
-    if not API_LIST:
-        raise RuntimeError("Set OPENAI_API_KEY (and optional backups) in environment")
-    i = 0
-    api_key = API_LIST[0]
-    flag = False
-    while not flag:
-        client = OpenAI(
-            api_key=api_key,
-            base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
-        )
-        try:
-            response = client.chat.completions.create(
-                    messages=[{"role": "user", "content": prompt}],
-                    model="claude-3-opus-20240229",
-                    temperature=0   
-            )
-            flag=True
-        except Exception as e:
-            print(e)
-            i = (i + 1)%3
-            api_key = API_LIST[i]
-            time.sleep(0.5)
-    return response.choices[0].message.content
-
-def generate_all_answer(args):
-    prompt_list = get_prompt(args)
-    answer_list = []
-    for prompt in tqdm(prompt_list, desc="generating answer"):
-        answer = claude_3_answer(prompt)
-        answer_list.append(answer)
-    return answer_list
-
-def save_answer(args,answer_list):
-    output_dir = os.path.join(args.output_dir, args.model)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    output_path = os.path.join(output_dir, f"{args.reason}.json")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(answer_list, f, ensure_ascii=False, indent=4)
+# claude3 的推理入口，实际逻辑见 engine.py（模型预设 "claude3"）
+from engine import main
 
 if __name__=="__main__":
-    args = llm_parser_args()
-    answer_list = generate_all_answer(args)
-    save_answer(args,answer_list)
+    main(default_preset="claude3")
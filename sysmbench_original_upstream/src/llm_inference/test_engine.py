@@ -0,0 +1,61 @@
+import json
+import sys
+
+import pytest
+
+import engine
+from lm_inference import FakeBackend
+
+class FlakyBackend(FakeBackend):
+    """FakeBackend that fails on the `fail_at`-th generate call (1-based)."""
+    def __init__(self, fail_at=None):
+        super().__init__()
+        self.fail_at = fail_at
+
+    def generate(self, prompts):
+        if self.fail_at is not None and self.calls + 1 == self.fail_at:
+            self.calls += 1
+            raise RuntimeError("simulated 400")
+        return super().generate(prompts)
+
+def run_engine(monkeypatch, tmp_path, backend, *extra):
+    monkeypatch.setitem(engine.BACKENDS, "flaky", lambda preset, args: backend)
+    monkeypatch.setitem(engine.MODEL_PRESETS, "flaky", {"backend": "flaky"})
+    monkeypatch.setattr(sys, "argv", [
+        "engine.py", "--model", "flaky", "--reason", "direct", "cot", "--batch_size", "1",
+        "--data", str(tmp_path / "dataset.json"), "--prompt_dir", str(tmp_path / "prompts"),
+        "--output_dir", str(tmp_path / "predict"), *extra,
+    ])
+    engine.main()
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "prompts").mkdir()
+    for reason in ("direct", "cot"):
+        (tmp_path / "prompts" / f"{reason}.txt").write_text(f"{reason}: {{requirement}}", encoding="utf-8")
+    dataset = [{"nl": f"requirement {i}"} for i in range(5)]
+    (tmp_path / "dataset.json").write_text(json.dumps(dataset), encoding="utf-8")
+    return tmp_path
+
+def test_resume_skips_finished_reasons_and_checkpointed_items(monkeypatch, workspace):
+    # direct: calls 1-5; cot: calls 6-7 succeed, call 8 fails
+    with pytest.raises(RuntimeError):
+        run_engine(monkeypatch, workspace, FlakyBackend(fail_at=8))
+    output_dir = workspace / "predict" / "flaky"
+    assert len(json.loads((output_dir / "direct.json").read_text(encoding="utf-8"))) == 5
+    assert not (output_dir / "cot.json").exists()
+
+    backend = FlakyBackend()
+    run_engine(monkeypatch, workspace, backend)
+    assert backend.calls == 3  # only the three cot prompts missing from the checkpoint
+    cot = json.loads((output_dir / "cot.json").read_text(encoding="utf-8"))
+    assert len(cot) == 5 and all(cot)
+    assert not (output_dir / "cot.partial.jsonl").exists()
+
+    backend = FlakyBackend()
+    run_engine(monkeypatch, workspace, backend)
+    assert backend.calls == 0
+
+    backend = FlakyBackend()
+    run_engine(monkeypatch, workspace, backend, "--force")
+    assert backend.calls == 10
@@ -0,0 +1,34 @@
+import json
+
+from lm_inference import FakeBackend, batched_generate
+
+PROMPTS = [f"prompt {i}" for i in range(6)]
+
+def read_rows(checkpoint_path):
+    return [json.loads(line) for line in checkpoint_path.read_text(encoding="utf-8").splitlines() if line]
+
+def test_resume_after_torn_trailing_line(tmp_path):
+    checkpoint_path = tmp_path / "direct.partial.jsonl"
+    expected = batched_generate(PROMPTS, FakeBackend(), batch_size=2, checkpoint_path=str(checkpoint_path))
+    assert len(read_rows(checkpoint_path)) == 6
+
+    # 模拟写到一半被杀掉：最后一行只剩半行，且没有换行
+    lines = checkpoint_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    checkpoint_path.write_text("".join(lines[:4]) + lines[4][:20], encoding="utf-8")
+
+    backend = FakeBackend()
+    resumed = batched_generate(PROMPTS, backend, batch_size=1, checkpoint_path=str(checkpoint_path))
+    assert resumed == expected
+    assert backend.calls == 2  # 半行和缺失的最后一条
+    # 新结果另起一行写入，没有接在半行后面
+    torn, *rows = checkpoint_path.read_text(encoding="utf-8").splitlines()[4:]
+    assert [json.loads(row)["index"] for row in rows] == [4, 5]
+
+def test_checkpoint_for_other_prompts_is_ignored(tmp_path):
+    checkpoint_path = tmp_path / "direct.partial.jsonl"
+    batched_generate(PROMPTS, FakeBackend(), checkpoint_path=str(checkpoint_path))
+
+    backend = FakeBackend()
+    changed = [prompt + " (edited)" if i % 2 else prompt for i, prompt in enumerate(PROMPTS)]
+    batched_generate(changed, backend, batch_size=1, checkpoint_path=str(checkpoint_path))
+    assert backend.calls == 3
@@ -1,11 +1,24 @@
 import os
+import sys
 import json
 from argparse import ArgumentParser
+from pathlib import Path
 from openai import OpenAI
 from tqdm import tqdm
 import time
 import re
 
+# 与 evaluation_scripts 共用的评测缓存（仓库外单独使用时自动关闭）
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "evaluation_scripts"))
+try:
+    from judge_cache import DEFAULT_CACHE_ROOT, JudgeCache
+except ImportError:
+    DEFAULT_CACHE_ROOT, JudgeCache = None, None
+
+JUDGE_MODEL = "gpt-4.1-2025-04-14"
+JUDGE_TEMPERATURE = 0
+judge_cache = None
+
 def eval_parser_args():
     parser = ArgumentParser()
     parser.add_argument("--preference_path",type=str,default="dataset/sysml/dataset.json")
@@ -13,6 +26,8 @@ def eval_parser_args():
     parser.add_argument("--reason",type=str,default="direct",choices=["direct","few-shot","cot","grammar"])
     parser.add_argument("--model",type=str,required=True)
     parser.add_argument("--output_dir",type=str,default="result")
+    parser.add_argument("--cache_dir",type=str,default=str(DEFAULT_CACHE_ROOT) if DEFAULT_CACHE_ROOT else "")
+    parser.add_argument("--no_cache",action="store_true")
     return parser.parse_args()
 
 def parser_sysm_eval_p(text):
@@ -36,6 +51,15 @@ def parser_sysm_eval_r(text):
         print("Score not found.")
 
 def get_sysm_eval_p(candidate,reference):
+    with open("src/metrics/sysm-eval-p.txt","r", encoding="utf-8") as file:
+        prompt_template = file.read()
+    prompt = prompt_template.format(reference_model=reference, generated_model=candidate)
+    cache_key = None
+    if judge_cache is not None:
+        cache_key = judge_cache.make_key(JUDGE_MODEL, JUDGE_TEMPERATURE, prompt_template, reference, candidate)
+        cached = judge_cache.get(cache_key)
+        if cached is not None:
+            return cached["response_text"]
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
@@ -43,24 +67,33 @@ def get_sysm_eval_p(candidate,reference):
         api_key=api_key,
         base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
     )
-    with open("src/metrics/sysm-eval-p.txt","r", encoding="utf-8") as file:
-        prompt_template = file.read()
-    prompt = prompt_template.format(reference_model=reference, generated_model=candidate)
     flag = False
     while not flag:
         try:
             response = client.chat.completions.create(
                     messages=[{"role": "user", "content": prompt}],
-                    model="gpt-4.1-2025-04-14",
-                    temperature=0   
+                    model=JUDGE_MODEL,
+                    temperature=JUDGE_TEMPERATURE
             )
             flag=True
         except Exception as e:
             print(e)
             time.sleep(0.5)
-    return response.choices[0].message.content
+    content = response.choices[0].message.content
+    if cache_key is not None:
+        judge_cache.put(cache_key, {"response_text": content, "response": response.model_dump()})
+    return content
 
 def get_sysm_eval_r(candidate,reference):
+    with open("src/metrics/sysm-eval-r.txt","r", encoding="utf-8") as file:
+        prompt_template = file.read()
+    prompt = prompt_template.format(reference_model=reference, generated_model=candidate)
+    cache_key = None
+    if judge_cache is not None:
+        cache_key = judge_cache.make_key(JUDGE_MODEL, JUDGE_TEMPERATURE, prompt_template, reference, candidate)
+        cached = judge_cache.get(cache_key)
+        if cached is not None:
+            return cached["response_text"]
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
@@ -68,22 +101,22 @@ def get_sysm_eval_r(candidate,reference):
         api_key=api_key,
         base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
     )
-    with open("src/metrics/sysm-eval-r.txt","r", encoding="utf-8") as file:
-        prompt_template = file.read()
-    prompt = prompt_template.format(reference_model=reference, generated_model=candidate)
     flag = False
     while not flag:
         try:
             response = client.chat.completions.create(
                     messages=[{"role": "user", "content": prompt}],
-                    model="gpt-4.1-2025-04-14",
-                    temperature=0   
+                    model=JUDGE_MODEL,
+                    temperature=JUDGE_TEMPERATURE
             )
             flag=True
         except Exception as e:
             print(e)
             time.sleep(0.5)
-    return response.choices[0].message.content
+    content = response.choices[0].message.content
+    if cache_key is not None:
+        judge_cache.put(cache_key, {"response_text": content, "response": response.model_dump()})
+    return content
 
 def compute_metrics(args):
     preference_data = json.load(open(args.preference_path, 'r', encoding='utf-8'))
@@ -135,4 +168,8 @@ def compute_metrics(args):
 if __name__=="__main__":
     args = eval_parser_args()
     print(f"==={args.model}==={args.reason}===")
+    if JudgeCache is not None and args.cache_dir and not args.no_cache:
+        judge_cache = JudgeCache(Path(args.cache_dir))
     compute_metrics(args)
+    if judge_cache is not None:
+        print(judge_cache.summary())
@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+# 树编辑距离实现与 evaluation_scripts 共用（sysml_ted.py）
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "evaluation_scripts"))
+from sysml_ted import DEFAULT_TIME_CAP, score_pairs
+
+REASONS = ["direct", "few-shot", "cot", "grammar"]
+
+def eval_parser_args():
+    parser = ArgumentParser()
+    parser.add_argument("--preference_path",type=str,default="dataset/sysml/dataset.json")
+    parser.add_argument("--predict_dir", type=str, default="predict")
+    parser.add_argument("--reason",type=str,nargs="+",default=REASONS,choices=REASONS)
+    parser.add_argument("--model",type=str,nargs="*",default=None,help="默认 predict_dir 下的全部模型")
+    parser.add_argument("--output_dir",type=str,default="result")
+    parser.add_argument("--workers",type=int,default=os.cpu_count() or 1)
+    parser.add_argument("--time_cap",type=float,default=DEFAULT_TIME_CAP,help="单个样本的时间上限（秒，近似），0 表示不限")
+    return parser.parse_args()
+
+def summarize_ted(scores):
+    """每个样本的 tree_edit_similarity（超时为 None），未超时样本的平均值，以及超时数。"""
+    values = [s["ted_similarity"] for s in scores]
+    done = [v for v in values if v is not None]
+    avg = sum(done) / len(done) if done else None
+    return values, avg, len(values) - len(done)
+
+def merge_result(result_path, values, avg, timeouts):
+    """把新列写入 result/<model>/<reason>.json；文件不存在时只写该列。"""
+    if os.path.exists(result_path):
+        with open(result_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+    else:
+        result = [{} for _ in values] + [{}]
+    if len(result) != len(values) + 1:
+        raise SystemExit(f"{result_path}: expected {len(values) + 1} rows, found {len(result)}")
+    for row, value in zip(result, values):
+        row["tree_edit_similarity"] = value
+    result[-1]["tree_edit_similarity_avg"] = avg
+    result[-1]["tree_edit_timeouts"] = timeouts
+    os.makedirs(os.path.dirname(result_path), exist_ok=True)
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=4)
+
+def compute_ted_metrics(args):
+    preference_data = json.load(open(args.preference_path, "r", encoding="utf-8"))
+    references = [preference["design"] for preference in preference_data]
+    models = args.model or sorted(os.listdir(args.predict_dir))
+    # 所有预测集合并成一批，相同的 (reference, prediction) 只计算一次
+    jobs = []
+    pairs = []
+    for model in models:
+        for reason in args.reason:
+            predict_path = f"{args.predict_dir}/{model}/{reason}.json"
+            if not os.path.exists(predict_path):
+                print(f"Skip {predict_path}: not found")
+                continue
+            predict_data = json.load(open(predict_path, "r", encoding="utf-8"))
+            if len(predict_data) != len(references):
+                raise SystemExit(f"{predict_path}: expected {len(references)} predictions, found {len(predict_data)}")
+            jobs.append((model, reason, len(pairs)))
+            pairs.extend(zip(references, [p or "" for p in predict_data]))
+    started = time.perf_counter()
+    scores = score_pairs(pairs, workers=args.workers, time_cap=args.time_cap or None)
+    print(f"Scored {len(pairs)} pairs in {time.perf_counter() - started:.1f}s")
+    for model, reason, offset in jobs:
+        values, avg, timeouts = summarize_ted(scores[offset:offset + len(references)])
+        result_path = f"{args.output_dir}/{model}/{reason}.json"
+        merge_result(result_path, values, avg, timeouts)
+        avg_text = f"{avg:.4f}" if avg is not None else "n/a"
+        print(f"{model}/{reason}: tree_edit_similarity_avg={avg_text} timeouts={timeouts} -> {result_path}")
+
+if __name__=="__main__":
+    args = eval_parser_args()
+    compute_ted_metrics(args)
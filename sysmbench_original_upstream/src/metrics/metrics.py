@@ -6,6 +6,7 @@ import json
 import os
 from argparse import ArgumentParser
 from tqdm import tqdm
+from get_ted_metrics import DEFAULT_TIME_CAP, score_pairs, summarize_ted
 
 os.environ["HF_ENDPOINT"] = "https://hf-mirror.com"
 BERT_SCORE_MODEL = "google-bert/bert-base-uncased"
@@ -17,6 +18,8 @@ def eval_parser_args():
     parser.add_argument("--reason",type=str,default="direct",choices=["direct","few-shot","cot","grammar"])
     parser.add_argument("--model",type=str,required=True)
     parser.add_argument("--output_dir",type=str,default="result")
+    parser.add_argument("--workers",type=int,default=os.cpu_count() or 1)
+    parser.add_argument("--time_cap",type=float,default=DEFAULT_TIME_CAP)
     return parser.parse_args()
 
 def get_sentece_bleu_score(candidate,reference):
@@ -58,9 +61,14 @@ def compute_metrics(args):
     result = []
     all_references = []
     all_candidates = []
+    # 树编辑距离（进程池并行，先于逐样本循环整体计算）
+    # API 后端在 message.content 为空时会写入 None，按空输出计分
+    ted_scores = score_pairs([(p["design"], predict_data[i] or "") for i, p in enumerate(preference_data)],
+                             workers=args.workers, time_cap=args.time_cap or None)
+    ted_values, ted_avg, ted_timeouts = summarize_ted(ted_scores)
     for i,preference in tqdm(enumerate(preference_data),total=len(preference_data),desc="Computing metrics"):
         preference_answer = preference["design"]
-        predict_answer = predict_data[i]
+        predict_answer = predict_data[i] or ""
         # 分词
         reference_tokens = preference_answer.split()
         candidate_tokens = predict_answer.split()
@@ -77,6 +85,7 @@ def compute_metrics(args):
             "rouge2_f1":rouge2_f1,
             "rougeL_f1":rougeL_f1,
             "bertscore":bertscore,
+            "tree_edit_similarity":ted_values[i],
             # "meteorscore":meteor_score
         })
     # 统一计算corpus BLEU
@@ -97,6 +106,8 @@ def compute_metrics(args):
         "rouge2_f1_avg":rouge2_f1_avg,
         "rougeL_f1_avg":rougeL_f1_avg,
         "bertscore_avg":bertscore_avg,
+        "tree_edit_similarity_avg":ted_avg,
+        "tree_edit_timeouts":ted_timeouts,
         # "meteorscore":meteorscore
     })
     result_dir = f"{args.output_dir}/{args.model}"